@@ -0,0 +1,76 @@
+"""
+Benchmark of posting the report of many pull requests against the fake GitHub server: one
+`codecov` process per pull request, as a CI job looping over them would, against a single
+`codecov-batch` process.
+
+    uv run python -m benchmarks.batch --prs 20 --files 200 --latency 0.05 --workers 4
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import secrets
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.e2e import make_coverage, make_diff
+from tests.fake_github import FakeGithub
+
+REPOSITORY = 'example/benchmark'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--prs', type=int, default=20, help='number of pull requests')
+    parser.add_argument('--files', type=int, default=200, help='number of files in the report and the diffs')
+    parser.add_argument('--lines', type=int, default=40, help='number of lines per file')
+    parser.add_argument('--latency', type=float, default=0.05, help='latency of every fake GitHub answer (s)')
+    parser.add_argument('--workers', type=int, default=4, help='pull requests processed concurrently by the batch')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, FakeGithub(repository=REPOSITORY, latency=args.latency) as fake:
+        coverage = make_coverage(num_files=args.files, num_lines=args.lines)
+        coverage_path = pathlib.Path(tmp) / 'coverage.json'
+        coverage_path.write_text(json.dumps(coverage))
+        diff = make_diff(coverage, args.lines)
+        for number in range(1, args.prs + 1):
+            fake.add_pull_request(number=number, head_ref=f'feature/{number}', diff=diff)
+
+        environ = {
+            **os.environ,
+            'GITHUB_REPOSITORY': REPOSITORY,
+            'GITHUB_TOKEN': secrets.token_hex(16),
+            'GITHUB_API_URL': fake.url,
+            'COVERAGE_PATH': str(coverage_path),
+        }
+
+        start = time.perf_counter()
+        for number in range(1, args.prs + 1):
+            subprocess.run(  # noqa: S603
+                [sys.executable, '-c', 'from codecov.main import main; main()'],
+                env=environ | {'GITHUB_PR_NUMBER': str(number)},
+                capture_output=True,
+                check=True,
+            )
+        single = time.perf_counter() - start
+
+        jobs_path = pathlib.Path(tmp) / 'jobs.json'
+        jobs_path.write_text(json.dumps([{'GITHUB_PR_NUMBER': number} for number in range(1, args.prs + 1)]))
+        start = time.perf_counter()
+        subprocess.run(  # noqa: S603
+            [sys.executable, '-m', 'codecov.batch', str(jobs_path), '--workers', str(args.workers)],
+            env=environ,
+            capture_output=True,
+            check=True,
+        )
+        batch = time.perf_counter() - start
+
+        print(f'{args.prs} pull requests, one process each: {single * 1000:8.1f} ms')
+        print(f'{args.prs} pull requests, one batch:        {batch * 1000:8.1f} ms ({args.workers} workers)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+End-to-end benchmark of `Main.run` against the fake GitHub server, without any real network.
+
+    uv run python -m benchmarks.e2e --files 200 --latency 0.05 --comments 120
+
+Reports the wall time of every GitHub request (from the recorded cassette) and of the whole run.
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import secrets
+import tempfile
+import time
+from unittest.mock import patch
+
+from codecov.main import Main
+from codecov.replay import load_cassette
+from tests.fake_github import FakeGithub
+
+REPOSITORY = 'example/benchmark'
+PR_NUMBER = 1
+
+
+def make_coverage(num_files: int, num_lines: int) -> dict:
+    files = {}
+    for i in range(num_files):
+        # Two blocks of missing lines per file
+        missing = [line for line in range(1, num_lines + 1) if line % 20 in (5, 6, 7)]
+        executed = [line for line in range(1, num_lines + 1) if line not in missing]
+        files[f'src/package_{i % 10}/module_{i}.py'] = {
+            'executed_lines': executed,
+            'missing_lines': missing,
+            'excluded_lines': [],
+            'summary': {
+                'covered_lines': len(executed),
+                'num_statements': num_lines,
+                'percent_covered': 100 * len(executed) / num_lines,
+                'percent_covered_display': str(100 * len(executed) // num_lines),
+                'missing_lines': len(missing),
+                'excluded_lines': 0,
+            },
+        }
+    total_executed = sum(len(f['executed_lines']) for f in files.values())
+    total = num_files * num_lines
+    return {
+        'meta': {
+            'version': '7.0',
+            'timestamp': '2024-01-01T00:00:00',
+            'branch_coverage': False,
+            'show_contexts': False,
+        },
+        'files': files,
+        'totals': {
+            'covered_lines': total_executed,
+            'num_statements': total,
+            'percent_covered': 100 * total_executed / total,
+            'percent_covered_display': str(100 * total_executed // total),
+            'missing_lines': total - total_executed,
+            'excluded_lines': 0,
+        },
+    }
+
+
+def make_diff(coverage: dict, num_lines: int) -> str:
+    chunks = []
+    for path in coverage['files']:
+        added = ''.join('+line\n' for _ in range(num_lines))
+        chunks.append(f'diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n@@ -0,0 +1,{num_lines} @@\n{added}')
+    return ''.join(chunks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=100, help='number of files in the report and the diff')
+    parser.add_argument('--lines', type=int, default=40, help='number of lines per file')
+    parser.add_argument('--latency', type=float, default=0.05, help='latency of every fake GitHub answer (s)')
+    parser.add_argument('--comments', type=int, default=0, help='unrelated comments already on the pull request')
+    parser.add_argument('--max-files', type=int, default=25, help='MAX_FILES_IN_COMMENT')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, FakeGithub(repository=REPOSITORY, latency=args.latency) as fake:
+        coverage = make_coverage(num_files=args.files, num_lines=args.lines)
+        coverage_path = pathlib.Path(tmp) / 'coverage.json'
+        coverage_path.write_text(json.dumps(coverage))
+        fake.add_pull_request(number=PR_NUMBER, head_ref='benchmark', diff=make_diff(coverage, args.lines))
+        for i in range(args.comments):
+            fake.add_comment(pr_number=PR_NUMBER, body=f'comment {i}', login='someone')
+
+        for run in range(1, args.runs + 1):
+            cassette = pathlib.Path(tmp) / f'run-{run}.json'
+            environ = {
+                'GITHUB_REPOSITORY': REPOSITORY,
+                'GITHUB_TOKEN': secrets.token_hex(16),
+                'GITHUB_PR_NUMBER': str(PR_NUMBER),
+                'GITHUB_API_URL': fake.url,
+                'COVERAGE_PATH': str(coverage_path),
+                'MAX_FILES_IN_COMMENT': str(args.max_files),
+                'HTTP_RECORD_PATH': str(cassette),
+            }
+            with patch.dict(os.environ, environ, clear=True):
+                start = time.perf_counter()
+                Main().run()
+                total = time.perf_counter() - start
+
+            interactions = load_cassette(cassette)
+            network = sum(i.elapsed for i in interactions)
+            print(f'run {run}: {total * 1000:8.1f} ms total, {network * 1000:8.1f} ms in {len(interactions)} requests')
+            for interaction in interactions:
+                print(f'    {interaction.elapsed * 1000:8.1f} ms  {interaction.method:6} {interaction.target}')
+
+
+if __name__ == '__main__':
+    main()
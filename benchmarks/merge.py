@@ -0,0 +1,68 @@
+"""
+Benchmark of merging the coverage reports of the parallel jobs of a test suite: each report
+covers a different share of the lines, and they are read and merged in worker processes,
+against reading and merging them one after the other in the process.
+
+    uv run python -m benchmarks.merge --reports 50 --files 200 --lines 200
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import statistics
+import tempfile
+import time
+
+from benchmarks.e2e import make_coverage
+from codecov.coverage.partial import merge_reports
+from codecov.coverage.pytest import PytestCoverageHandler
+
+
+def make_shard(num_files: int, num_lines: int, index: int, num_reports: int) -> dict:
+    coverage = make_coverage(num_files=num_files, num_lines=num_lines)
+    for file in coverage['files'].values():
+        lines = file['executed_lines'] + file['missing_lines']
+        file['executed_lines'] = sorted(line for line in lines if line % num_reports == index)
+        file['missing_lines'] = sorted(line for line in lines if line % num_reports != index)
+    return coverage
+
+
+def measure(paths: list[pathlib.Path], workers: int, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        merge_reports(paths, test_framework='pytest', workers=workers)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reports', type=int, default=50, help='number of reports merged')
+    parser.add_argument('--files', type=int, default=200, help='number of files per report')
+    parser.add_argument('--lines', type=int, default=200, help='number of lines per file')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='worker processes')
+    parser.add_argument('--runs', type=int, default=3, help='merges measured')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for index in range(args.reports):
+            path = pathlib.Path(tmp) / f'coverage-{index}.json'
+            path.write_text(json.dumps(make_shard(args.files, args.lines, index, args.reports)))
+            paths.append(path)
+        size = sum(path.stat().st_size for path in paths)
+
+        coverage = PytestCoverageHandler().from_partial(merge_reports(paths, test_framework='pytest', workers=1))
+        sequential = measure(paths, workers=1, runs=args.runs)
+        parallel = measure(paths, workers=args.workers, runs=args.runs)
+
+    print(f'{args.reports} reports of {args.files} files of {args.lines} lines, {size / 1e6:.1f} MB')
+    print(f'  merged coverage: {coverage.info.percent_covered_display}%')
+    print(f'  one after the other, median: {sequential * 1000:8.1f} ms')
+    print(f'  {args.workers} worker process(es), median:{parallel * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
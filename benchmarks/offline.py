@@ -0,0 +1,58 @@
+"""
+Benchmark of the whole `Main.run` pipeline offline: the coverage report and the diff are
+read from files and the Markdown report is written to a file, without any GitHub client.
+
+    uv run python -m benchmarks.offline --files 1000 --runs 5
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import statistics
+import tempfile
+import time
+from unittest.mock import patch
+
+from benchmarks.e2e import make_coverage, make_diff
+from codecov.main import Main
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=100, help='number of files in the report and the diff')
+    parser.add_argument('--lines', type=int, default=40, help='number of lines per file')
+    parser.add_argument('--max-files', type=int, default=25, help='MAX_FILES_IN_COMMENT')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        coverage = make_coverage(num_files=args.files, num_lines=args.lines)
+        coverage_path = pathlib.Path(tmp) / 'coverage.json'
+        coverage_path.write_text(json.dumps(coverage))
+        diff_path = pathlib.Path(tmp) / 'pr.diff'
+        diff_path.write_text(make_diff(coverage, args.lines))
+        environ = {
+            'GITHUB_REPOSITORY': 'example/benchmark',
+            'GITHUB_PR_NUMBER': '1',
+            'COVERAGE_PATH': str(coverage_path),
+            'DIFF_PATH': str(diff_path),
+            'OUTPUTS': 'markdown',
+            'MARKDOWN_REPORT_PATH': str(pathlib.Path(tmp) / 'report.md'),
+            'MAX_FILES_IN_COMMENT': str(args.max_files),
+        }
+
+        timings = []
+        with patch.dict(os.environ, environ, clear=True):
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                Main().run()
+                timings.append(time.perf_counter() - start)
+
+        print(
+            f'{args.files} files: median {statistics.median(timings) * 1000:8.2f} ms, min {min(timings) * 1000:8.2f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark of the upload service against the fake GitHub server: the reports of many pull
+requests are uploaded at once, then the throughput and latency stats of the service are
+printed once they are all done.
+
+    uv run python -m benchmarks.service --prs 50 --files 200 --latency 0.05 --workers 4
+"""
+
+import argparse
+import json
+import secrets
+import threading
+import time
+
+import httpx
+
+from benchmarks.e2e import make_coverage, make_diff
+from codecov.service import Service, ServiceServer
+from tests.fake_github import FakeGithub
+
+REPOSITORY = 'example/benchmark'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--prs', type=int, default=50, help='number of pull requests')
+    parser.add_argument('--files', type=int, default=200, help='number of files in the report and the diffs')
+    parser.add_argument('--lines', type=int, default=40, help='number of lines per file')
+    parser.add_argument('--latency', type=float, default=0.05, help='latency of every fake GitHub answer (s)')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    with FakeGithub(repository=REPOSITORY, latency=args.latency) as fake:
+        coverage = make_coverage(num_files=args.files, num_lines=args.lines)
+        diff = make_diff(coverage, args.lines)
+        for number in range(1, args.prs + 1):
+            fake.add_pull_request(number=number, head_ref=f'feature/{number}', diff=diff)
+
+        environ = {'GITHUB_TOKEN': secrets.token_hex(16), 'GITHUB_API_URL': fake.url}
+        token = secrets.token_hex(16)
+        service = Service(
+            environ=environ, token=token, repositories=[REPOSITORY], workers=args.workers, queue_size=args.prs
+        ).start()
+        server = ServiceServer(('127.0.0.1', 0), service)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        report = json.dumps(coverage).encode()
+
+        start = time.perf_counter()
+        with httpx.Client(base_url=server.url, headers={'Authorization': f'Bearer {token}'}) as client:
+            for number in range(1, args.prs + 1):
+                params = {'GITHUB_REPOSITORY': REPOSITORY, 'GITHUB_PR_NUMBER': number}
+                client.post('/jobs', content=report, params=params).raise_for_status()
+            while (stats := client.get('/stats').json())['queued'] + stats['running']:
+                time.sleep(0.01)
+        total = time.perf_counter() - start
+
+        server.shutdown()
+        server.server_close()
+        service.stop()
+
+    print(f'{args.prs} pull requests in {total * 1000:8.1f} ms with {args.workers} workers')
+    print(f'  done {stats["done"]}, failed {stats["failed"]}')
+    for name in ('wait', 'elapsed'):
+        latency = stats[name]
+        print(
+            f'  {name:8} median {latency["median"] * 1000:8.1f} ms, p95 {latency["p95"] * 1000:8.1f} ms, '
+            f'max {latency["max"] * 1000:8.1f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
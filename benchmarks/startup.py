@@ -0,0 +1,67 @@
+"""
+Benchmark of the cold start of the CLI: the time `python -X importtime` reports for importing
+`codecov.main` in a fresh interpreter, and the modules that take the most of it. With a budget,
+exit with an error when the median goes over it.
+
+    uv run python -m benchmarks.startup --runs 10 --budget-ms 100
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULE = 'codecov.main'
+
+
+def import_times(module: str) -> dict[str, int]:
+    """
+    Cumulative import time in microseconds of `module` and of every module it imports, in a
+    fresh interpreter. Modules imported by the interpreter itself, such as `site`, are left out.
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # import time: self [us] | cumulative | imported package, nested modules are indented
+    # and listed before the module importing them
+    lines = [line.removeprefix('import time:').split('|') for line in result.stderr.splitlines()]
+    entries = [
+        (len(name) - len(name.lstrip()), name.strip(), int(cumulative))
+        for _, cumulative, name in lines[1:]
+        if cumulative.strip().isdigit()
+    ]
+    index = next(index for index, (_, name, _) in enumerate(entries) if name == module)
+    depth, _, total = entries[index]
+    times = {module: total}
+    for nested_depth, name, cumulative in reversed(entries[:index]):
+        if nested_depth <= depth:
+            break
+        times[name] = cumulative
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--top', type=int, default=10, help='number of slowest modules to list')
+    parser.add_argument('--budget-ms', type=float, default=None, help='largest accepted median import time')
+    args = parser.parse_args()
+
+    runs = [import_times(MODULE) for _ in range(args.runs)]
+    median = statistics.median(times[MODULE] for times in runs) / 1000
+    print(f'import {MODULE}: median {median:8.2f} ms, min {min(times[MODULE] for times in runs) / 1000:8.2f} ms')
+
+    last = runs[-1]
+    for name, cumulative in sorted(last.items(), key=lambda item: item[1], reverse=True)[1 : args.top + 1]:
+        print(f'  {name:40} {cumulative / 1000:8.2f} ms')
+
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f'Over the budget of {args.budget_ms:.2f} ms', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark of the comment rendering, with the templates compiled from scratch, loaded from the
+on-disk bytecode cache or from the precompiled modules (a new process), or already loaded in
+the environment (same process), and of the coverage tables rendered by the Jinja macros
+instead of `template.CoverageTable`. The `sandboxed` rows render the same templates in the
+sandboxed environment of the custom templates instead of the regular one.
+
+    uv run python -m benchmarks.templates --files 1000 --runs 5
+"""
+
+import argparse
+import decimal
+import pathlib
+import secrets
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+
+import jinja2
+
+from benchmarks.e2e import make_coverage, make_diff
+from codecov import template
+from codecov.config import Config
+from codecov.coverage.pytest import PytestCoverageHandler
+from codecov.github import GithubDiffParser
+
+
+def make_renderer(num_files: int, num_lines: int) -> Callable[..., str]:
+    data = make_coverage(num_files=num_files, num_lines=num_lines)
+    handler = PytestCoverageHandler()
+    coverage = handler.extract_info(data=data)
+    config = Config(
+        GITHUB_REPOSITORY='example/benchmark',
+        COVERAGE_PATH=pathlib.Path('coverage.json'),
+        GITHUB_TOKEN=secrets.token_hex(16),
+        GITHUB_PR_NUMBER=1,
+        COMPLETE_PROJECT_REPORT=True,
+    )
+    added_lines = GithubDiffParser(diff=make_diff(data, num_lines)).parse()
+    diff_coverage = handler.get_diff_coverage(added_lines=added_lines, coverage=coverage, config=config)
+    files, count_files = template.select_changed_files(
+        coverage=coverage, diff_coverage=diff_coverage, max_files=None, skip_covered_files_in_report=False
+    )
+    coverage_files, count_coverage_files = template.select_files(
+        coverage=coverage, max_files=None, skip_covered_files_in_report=False
+    )
+
+    def render(base_template: jinja2.Template, native_tables: bool = True) -> str:
+        return template.get_comment_markdown(
+            base_template,
+            coverage,
+            diff_coverage,
+            decimal.Decimal('100'),
+            decimal.Decimal('70'),
+            config.GITHUB_REPOSITORY,
+            config.GITHUB_PR_NUMBER,
+            'main',
+            template.MARKER,
+            native_tables=native_tables,
+            complete_project_report=True,
+            max_files=None,
+            files=files,
+            count_files=count_files,
+            coverage_files=coverage_files,
+            count_coverage_files=count_coverage_files,
+        )
+
+    return render
+
+
+def measure(runs: int, func: Callable[[], object]) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=100, help='number of files in each table of the report')
+    parser.add_argument('--lines', type=int, default=40, help='number of lines per file')
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    render = make_renderer(num_files=args.files, num_lines=args.lines)
+
+    def cold() -> None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env = template.create_environment(
+                bytecode_cache=jinja2.FileSystemBytecodeCache(cache_dir), precompiled=False
+            )
+            render(env.get_template('comment.md.j2'))
+
+    def precompiled() -> None:
+        render(template.create_environment().get_template('comment.md.j2'))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        bytecode_cache = jinja2.FileSystemBytecodeCache(cache_dir)
+        template.create_environment(bytecode_cache=bytecode_cache, precompiled=False).get_template('comment.md.j2')
+
+        def disk() -> None:
+            env = template.create_environment(bytecode_cache=bytecode_cache, precompiled=False)
+            render(env.get_template('comment.md.j2'))
+
+        env = template.create_environment()
+        env.get_template('comment.md.j2')
+
+        def warm() -> None:
+            render(env.get_template('comment.md.j2'))
+
+        def jinja_tables() -> None:
+            render(env.get_template('comment.md.j2'), native_tables=False)
+
+        sandboxed_env = template.create_environment(sandboxed=True)
+        sandboxed_env.get_template('comment.md.j2')
+
+        def sandboxed() -> None:
+            render(sandboxed_env.get_template('comment.md.j2'))
+
+        def jinja_tables_sandboxed() -> None:
+            render(sandboxed_env.get_template('comment.md.j2'), native_tables=False)
+
+        comment_template = env.get_template('comment.md.j2')
+        if render(comment_template) != render(comment_template, native_tables=False):
+            raise AssertionError('The native tables differ from the Jinja ones')
+        if render(sandboxed_env.get_template('comment.md.j2'), native_tables=False) != render(comment_template):
+            raise AssertionError('The sandboxed environment renders another comment')
+
+        benchmarks = [
+            ('cold', cold),
+            ('bytecode cache', disk),
+            ('precompiled', precompiled),
+            ('warm', warm),
+            ('jinja tables', jinja_tables),
+            ('sandboxed', sandboxed),
+            ('jinja sandboxed', jinja_tables_sandboxed),
+        ]
+        for name, func in benchmarks:
+            timings = measure(args.runs, func)
+            print(f'{name:16} median {statistics.median(timings) * 1000:8.2f} ms, min {min(timings) * 1000:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark of the watch mode: in a git repository with changes to some of the files of the
+report, the time to render the report again after one of them changed, against computing
+it in one go.
+
+    uv run python -m benchmarks.watch --files 1000 --changed 50 --lines 40
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import statistics
+import subprocess
+import tempfile
+import time
+
+from benchmarks.e2e import REPOSITORY, make_coverage
+from codecov.api import DEFAULTS, Reporter
+from codecov.config import Config
+from codecov.watch import Watcher
+
+
+def git(*args: str) -> None:
+    subprocess.run(  # noqa: S603
+        ['git', '-c', 'user.name=benchmark', '-c', 'user.email=benchmark@example.com', *args],  # noqa: S607
+        check=True,
+        capture_output=True,
+    )
+
+
+def write_file(path: pathlib.Path, num_lines: int, version: int) -> None:
+    path.write_text(''.join(f'line {line} {version if line % 2 else 0}\n' for line in range(1, num_lines + 1)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=1000, help='number of files in the report')
+    parser.add_argument('--changed', type=int, default=50, help='number of files changed in the working tree')
+    parser.add_argument('--lines', type=int, default=40, help='number of lines per file')
+    parser.add_argument('--runs', type=int, default=10, help='updates measured')
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            coverage = make_coverage(num_files=args.files, num_lines=args.lines)
+            paths = [pathlib.Path(path) for path in coverage['files']]
+            for path in paths:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                write_file(path, args.lines, version=0)
+            git('init', '--quiet')
+            git('add', '.')
+            git('commit', '--quiet', '--message', 'Initial commit')
+            for path in paths[: args.changed]:
+                write_file(path, args.lines, version=1)
+            pathlib.Path('coverage.json').write_text(json.dumps(coverage))
+
+            config = Config.from_environ(
+                environ={'GITHUB_REPOSITORY': REPOSITORY, 'COVERAGE_PATH': 'coverage.json', **DEFAULTS}
+            )
+            watcher = Watcher(config, output=pathlib.Path(tmp) / 'report.md')
+            start = time.perf_counter()
+            watcher.update()
+            first = time.perf_counter() - start
+
+            source, report = [], []
+            for run in range(args.runs):
+                write_file(paths[run % args.changed], args.lines, version=run + 2)
+                start = time.perf_counter()
+                watcher.update()
+                watcher.write()
+                source.append(time.perf_counter() - start)
+
+                entry = coverage['files'][str(paths[run])]
+                entry['executed_lines'], entry['missing_lines'] = entry['missing_lines'], entry['executed_lines']
+                pathlib.Path('coverage.json').write_text(json.dumps(coverage))
+                start = time.perf_counter()
+                watcher.update()
+                watcher.write()
+                report.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            Reporter().report(config, diff=watcher.get_diff())
+            full = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+
+    print(f'{args.files} files of {args.lines} lines, {args.changed} changed')
+    print(f'  first update:                    {first * 1000:8.1f} ms')
+    print(f'  one source file changed, median: {statistics.median(source) * 1000:8.1f} ms')
+    print(f'  one report entry changed, median:{statistics.median(report) * 1000:8.1f} ms')
+    print(f'  whole report in one go:          {full * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+from typing import TYPE_CHECKING, Any
+
+from codecov import diff_grouper
+
+if TYPE_CHECKING:
+    from codecov.coverage.base import DiffCoverage
+    from codecov.coverage.jest import JestCoverage
+    from codecov.coverage.pytest import PytestCoverage
+
+
+def get_annotations(
+    coverage: 'PytestCoverage | JestCoverage',
+    diff_coverage: 'DiffCoverage',
+) -> list[dict[str, Any]]:
+    """
+    One check run annotation per group of added lines missing coverage, so the cost
+    of reporting grows with the number of groups rather than with the report size.
+    """
+    annotations = []
+    for group in diff_grouper.get_diff_missing_groups(coverage=coverage, diff_coverage=diff_coverage):
+        if group.line_start == group.line_end:
+            message = f'Added line #L{group.line_start} is not covered by tests'
+        else:
+            message = f'Added lines #L{group.line_start} - L{group.line_end} are not covered by tests'
+        annotations.append(
+            {
+                'path': str(group.file),
+                'start_line': group.line_start,
+                'end_line': group.line_end,
+                'annotation_level': 'warning',
+                'title': 'Missing coverage',
+                'message': message,
+            }
+        )
+    return annotations
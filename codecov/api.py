@@ -0,0 +1,179 @@
+"""
+Run the report of `codecov` in-process, without environment variables, subprocesses or
+GitHub: the caller hands the configuration, the coverage report and the diff of the pull
+request, and gets the diff coverage and the comment back. A `Reporter` keeps what does not
+depend on the pull request between calls: the parsed reports and the compiled templates.
+
+    from codecov.api import Reporter
+
+    reporter = Reporter()
+    result = reporter.report(
+        {'GITHUB_REPOSITORY': 'org/repo', 'GITHUB_PR_NUMBER': '12'},
+        diff=diff,
+        coverage='coverage.json',
+    )
+    result.diff_coverage.total_percent_covered, result.text
+
+A `Reporter` may be shared by several threads.
+"""
+
+# pylint: disable=import-outside-toplevel
+import dataclasses
+import os
+import pathlib
+import threading
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+from codecov.batch import Batch, file_version
+from codecov.config import STDIO_PATH, Config, OutputType
+from codecov.coverage.base import DiffCoverage
+from codecov.exceptions import ConfigurationException
+from codecov.log import log
+from codecov.main import Main
+
+if TYPE_CHECKING:
+    import jinja2
+
+    from codecov.coverage.jest import JestCoverage
+    from codecov.coverage.pytest import PytestCoverage
+    from codecov.report import Report
+
+# Parsed reports kept in memory between calls
+MAX_REPORTS = 16
+# Settings of a configuration given as a mapping: the diff is given and nothing is posted to GitHub
+DEFAULTS = {'DIFF_PATH': str(STDIO_PATH), 'OUTPUTS': OutputType.MARKDOWN.value}
+
+
+@dataclasses.dataclass
+class Result:
+    coverage: 'PytestCoverage | JestCoverage'
+    diff_coverage: DiffCoverage
+    # View model of the report, for the writers of `codecov.writers`
+    report: 'Report'
+    # The comment as it would be posted, split in MAX_COMMENTS parts at most
+    comments: list[str]
+
+    @property
+    def text(self) -> str:
+        return '\n\n'.join(self.comments)
+
+
+class ReporterRun(Main):
+    """Report of a single call, with the diff and the coverage of the call and the caches of the reporter."""
+
+    def __init__(
+        self,
+        config: Config,
+        reporter: 'Reporter',
+        diff: str,
+        coverage: 'PytestCoverage | JestCoverage | None' = None,
+    ):
+        self.reporter = reporter
+        self.diff = diff
+        self.given_coverage = coverage
+        super().__init__(config)
+
+    def _init_log(self) -> None:
+        # Logging is set up by the application embedding the reporter
+        pass
+
+    def _init_lease(self) -> tuple[int, ...] | None:
+        return None
+
+    @property
+    def pr_number(self) -> int | None:
+        return self.config.GITHUB_PR_NUMBER
+
+    @property
+    def base_ref(self) -> str:
+        return self.config.GITHUB_REF or 'HEAD'
+
+    def _get_diff(self) -> str:
+        return self.diff
+
+    def _get_coverage(self) -> 'PytestCoverage | JestCoverage':
+        if self.given_coverage is not None:
+            return self.given_coverage
+        return self.reporter.batch.get_coverage(self.config, super()._get_coverage)
+
+    def _get_template(self) -> 'str | jinja2.Template':
+        if self.config.TEMPLATE_PATH:
+            return self.reporter.get_template(self.config.TEMPLATE_PATH)
+        return super()._get_template()
+
+
+class Reporter:
+    def __init__(self, max_reports: int | None = MAX_REPORTS):
+        self.batch = Batch(max_reports=max_reports)
+        self.lock = threading.Lock()
+        # Custom templates compiled so far, with the version of their file
+        self.templates: dict[pathlib.Path, tuple[tuple[int, int] | None, jinja2.Template]] = {}
+
+    def report(
+        self,
+        config: Config | Mapping[str, str],
+        diff: str,
+        coverage: 'PytestCoverage | JestCoverage | str | os.PathLike[str] | None' = None,
+    ) -> Result:
+        """
+        Diff coverage and comment of a pull request.
+
+        `config` is a `Config`, or a mapping of the environment variables `codecov` reads,
+        `GITHUB_REPOSITORY` and `GITHUB_PR_NUMBER` typically. `diff` is the unified diff of
+        the pull request. `coverage` is a report parsed by a coverage handler or the path
+        of a coverage file, or several as `COVERAGE_PATH` accepts them, `COVERAGE_PATH` of the
+        configuration when not given. A coverage file is parsed once for all the calls, until
+        it changes.
+
+        Raise a CoreBaseException when the configuration or the report is invalid.
+        """
+        if isinstance(coverage, str | os.PathLike):
+            run = ReporterRun(self._get_config(config, coverage_path=os.fspath(coverage)), reporter=self, diff=diff)
+        else:
+            run = ReporterRun(
+                self._get_config(config, parsed=coverage is not None), reporter=self, diff=diff, coverage=coverage
+            )
+
+        run.process_coverage()
+        return Result(
+            coverage=run.coverage,
+            diff_coverage=run.diff_coverage,
+            report=run.report,
+            comments=run.fit_comment(),
+        )
+
+    def get_template(self, path: pathlib.Path) -> 'jinja2.Template':
+        from codecov import template
+
+        version = file_version(path)
+        with self.lock:
+            cached = self.templates.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        try:
+            source = path.read_text()
+        except OSError as e:
+            log.error('Error reading the template %s: %s', path, str(e))
+            raise ConfigurationException from e
+        compiled = template.compile_template(source)
+        with self.lock:
+            self.templates[path] = (version, compiled)
+        return compiled
+
+    def _get_config(
+        self, config: Config | Mapping[str, str], coverage_path: str | None = None, parsed: bool = False
+    ) -> Config:
+        try:
+            if isinstance(config, Config):
+                if coverage_path is not None:
+                    config = dataclasses.replace(config, COVERAGE_PATH=Config.clean_coverage_path(coverage_path))
+                return config
+            environ = {**DEFAULTS, **config}
+            if coverage_path is not None:
+                environ['COVERAGE_PATH'] = coverage_path
+            # A report given parsed is not read from any file
+            return Config.from_environ(environ=environ, defaults={'COVERAGE_PATH': []} if parsed else None)
+        except ValueError as e:
+            log.error('Invalid configuration: %s', str(e))
+            raise ConfigurationException(str(e)) from e
@@ -0,0 +1,213 @@
+"""
+Post the coverage reports of many pull requests, of one or several repositories, from a
+single process. Every job runs the whole pipeline of `codecov`, but the jobs share what
+does not depend on the pull request: the modules and compiled templates, one HTTP
+session per GitHub API and token, and the report parsed once per coverage file.
+
+    codecov-batch jobs.json --workers 4
+
+The jobs file is a JSON list of objects holding the environment variables of each job,
+`GITHUB_REPOSITORY`, `GITHUB_PR_NUMBER` and `COVERAGE_PATH` typically. They override the
+environment of the process, which holds what the jobs have in common, `GITHUB_TOKEN` for
+instance.
+"""
+
+# pylint: disable=import-outside-toplevel
+import argparse
+import dataclasses
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from codecov.config import Config, str_to_bool
+from codecov.exceptions import ConfigurationException, CoreBaseException
+from codecov.log import log, setup as log_setup
+from codecov.main import Main
+
+if TYPE_CHECKING:
+    import httpx
+
+    from codecov.coverage.jest import JestCoverage
+    from codecov.coverage.pytest import PytestCoverage
+    from codecov.github_client import GitHubClient
+
+# Pull requests processed concurrently
+WORKERS = 4
+# Coverage files, test framework and version of the files, see `files_version`
+CoverageKey = tuple[tuple[pathlib.Path, ...], str, tuple[tuple[int, int] | None, ...]]
+
+
+@dataclasses.dataclass
+class JobResult:
+    repository: str
+    pr_number: int | None
+    elapsed: float
+    # Why the job failed, None when it succeeded
+    error: str | None = None
+
+
+class BatchJob(Main):
+    """Run of a single pull request of a batch, with the HTTP sessions and the reports of the batch."""
+
+    def __init__(self, config: Config, batch: 'Batch'):
+        self.batch = batch
+        super().__init__(config)
+
+    def _init_log(self) -> None:
+        # Set up once for the whole batch
+        pass
+
+    def _init_github_client(self) -> 'GitHubClient':
+        from codecov.github_client import GitHubClient
+
+        return GitHubClient(
+            token=self.config.GITHUB_TOKEN,
+            url=self.config.GITHUB_API_URL,
+            deadline=self.deadline,
+            session=self.batch.get_session(self.config, self._init_session),
+        )
+
+    def _init_session(self) -> 'httpx.Client':
+        # The first job of a session creates it as a single run would, with its transport
+        return super()._init_github_client().session
+
+    def _get_coverage(self) -> 'PytestCoverage | JestCoverage':
+        return self.batch.get_coverage(self.config, super()._get_coverage)
+
+
+class Batch:
+    def __init__(self, workers: int = WORKERS, max_reports: int | None = None):
+        self.workers = workers
+        # Parsed reports kept in memory, the least recently used are dropped past it
+        self.max_reports = max_reports
+        self.lock = threading.Lock()
+        self.sessions: dict[tuple[Any, ...], httpx.Client] = {}
+        self.coverages: dict[CoverageKey, PytestCoverage | JestCoverage] = {}
+        self.coverage_locks: dict[CoverageKey, threading.Lock] = {}
+
+    def get_session(self, config: Config, create: Callable[[], 'httpx.Client']) -> 'httpx.Client':
+        """HTTP session of the jobs talking to the same GitHub API, with the same token and transport."""
+        key = (config.GITHUB_API_URL, config.GITHUB_TOKEN, config.HTTP_RECORD_PATH, config.HTTP_REPLAY_PATH)
+        with self.lock:
+            if key not in self.sessions:
+                self.sessions[key] = create()
+            return self.sessions[key]
+
+    def get_coverage(
+        self, config: Config, parse: Callable[[], 'PytestCoverage | JestCoverage']
+    ) -> 'PytestCoverage | JestCoverage':
+        """Report of the coverage file of the job, the jobs sharing it wait for the first one to parse it."""
+        key = (tuple(config.coverage_paths), config.TEST_FRAMEWORK, files_version(config.coverage_paths))
+        with self.lock:
+            lock = self.coverage_locks.setdefault(key, threading.Lock())
+        with lock:
+            with self.lock:
+                coverage = self.coverages.pop(key, None)
+            if coverage is None:
+                coverage = parse()
+            with self.lock:
+                # Most recently used last
+                self.coverages[key] = coverage
+                while self.max_reports is not None and len(self.coverages) > self.max_reports:
+                    evicted = next(iter(self.coverages))
+                    del self.coverages[evicted]
+                    self.coverage_locks.pop(evicted, None)
+        return coverage
+
+    def run(self, configs: Iterable[Config]) -> list[JobResult]:
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job') as executor:
+                results = list(executor.map(self.run_job, configs))
+        finally:
+            self.close()
+        log.info(
+            'Batch of %d jobs done in %.0f ms, %d failed.',
+            len(results),
+            (time.perf_counter() - start) * 1000,
+            sum(1 for result in results if result.error),
+        )
+        return results
+
+    def close(self) -> None:
+        for session in self.sessions.values():
+            session.close()
+
+    def run_job(self, config: Config) -> JobResult:
+        start = time.perf_counter()
+        error = None
+        try:
+            BatchJob(config, batch=self).run()
+        except CoreBaseException as e:
+            error = str(e) or type(e).__name__
+            log.error('Job %s#%s failed: %s', config.GITHUB_REPOSITORY, config.GITHUB_PR_NUMBER, error)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # A transport error or a malformed report fails its job only, not the whole batch
+            error = str(e) or type(e).__name__
+            log.exception('Job %s#%s failed', config.GITHUB_REPOSITORY, config.GITHUB_PR_NUMBER)
+        return JobResult(
+            repository=config.GITHUB_REPOSITORY,
+            pr_number=config.GITHUB_PR_NUMBER,
+            elapsed=time.perf_counter() - start,
+            error=error,
+        )
+
+
+def file_version(path: pathlib.Path) -> tuple[int, int] | None:
+    """Modification time and size of a file, a report rewritten in place is parsed again."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def files_version(paths: Iterable[pathlib.Path]) -> tuple[tuple[int, int] | None, ...]:
+    return tuple(file_version(path) for path in paths)
+
+
+def load_jobs(path: pathlib.Path, environ: Mapping[str, str]) -> list[Config]:
+    """Configuration of every job of the jobs file, all checked before any job runs."""
+    try:
+        jobs = json.loads(path.read_text())
+    except (OSError, ValueError) as e:
+        log.error('Error reading the jobs file %s: %s', path, str(e))
+        raise ConfigurationException from e
+    if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+        log.error('The jobs file %s must hold a list of objects.', path)
+        raise ConfigurationException
+
+    configs = []
+    for index, job in enumerate(jobs):
+        try:
+            configs.append(Config.from_environ(environ={**environ, **{key: str(value) for key, value in job.items()}}))
+        except (ValueError, ConfigurationException) as e:
+            log.error('Invalid job %d of %s: %s', index, path, str(e))
+            raise ConfigurationException from e
+    return configs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('jobs', type=pathlib.Path, help='JSON file listing the environment variables of every job')
+    parser.add_argument('--workers', type=int, default=WORKERS, help='pull requests processed concurrently')
+    args = parser.parse_args()
+
+    log_setup(debug=str_to_bool(os.environ.get('DEBUG', '')))
+    try:
+        configs = load_jobs(args.jobs, environ=os.environ)
+    except ConfigurationException:
+        sys.exit(1)
+    results = Batch(workers=args.workers).run(configs)
+    if any(result.error for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,10 @@
 import dataclasses
 import decimal
+import glob
 import inspect
 import pathlib
-from collections.abc import Callable, MutableMapping
-from enum import Enum
+from collections.abc import Callable, Mapping, MutableMapping
+from enum import Enum, StrEnum
 from typing import Any, Self
 
 from codecov.exceptions import MissingEnvironmentVariable
@@ -23,38 +24,105 @@ def resolve_path(path_str: str | pathlib.Path) -> pathlib.Path:
     return path
 
 
+# Value of DIFF_PATH reading the diff from the standard input, and of MARKDOWN_REPORT_PATH
+# writing the report to the standard output
+STDIO_PATH = pathlib.Path('-')
+
+
 def str_to_bool(value: str) -> bool:
     return value.lower() in ('1', 'true', 'yes')
 
 
-class TestFramework(Enum):
+class TestFramework(StrEnum):
     PYTEST = 'pytest'
     JEST = 'jest'
+    # Merged partials of the shards of a test suite, see `codecov.coverage.partial`
+    PARTIAL = 'partial'
+
+
+class OutputType(Enum):
+    # Sticky comment on the pull request
+    COMMENT = 'comment'
+    # Check run with an annotation on every group of added lines missing coverage
+    CHECK_RUN = 'check-run'
+    # Markdown report appended to the job summary, the file named by GITHUB_STEP_SUMMARY
+    STEP_SUMMARY = 'step-summary'
+    # Every file of the report written to JSON_REPORT_PATH
+    JSON = 'json'
+    # Markdown report written to MARKDOWN_REPORT_PATH
+    MARKDOWN = 'markdown'
 
 
 # pylint: disable=invalid-name, too-many-instance-attributes
 @dataclasses.dataclass(kw_only=True)
 class Config:
     GITHUB_REPOSITORY: str
-    COVERAGE_PATH: pathlib.Path
-    GITHUB_TOKEN: str = dataclasses.field(repr=False)
+    # Several reports, of the parallel jobs of a test suite, are merged into one
+    COVERAGE_PATH: pathlib.Path | list[pathlib.Path]
+    # Only optional offline, see `offline`
+    GITHUB_TOKEN: str = dataclasses.field(default='', repr=False)
+    # Set by GitHub Actions, points at the API of the GitHub Enterprise Server instance when there is one
+    GITHUB_API_URL: str = 'https://api.github.com'
     GITHUB_PR_NUMBER: int | None = None
     # Branch to create the comment on (alternate to get PR number if not provided)
     # Example Organisation:branch-name (Company:sample-branch) or User:branch-name (user:sample-branch)
     GITHUB_REF: str | None = None
     MINIMUM_GREEN: decimal.Decimal = decimal.Decimal('100')
     MINIMUM_ORANGE: decimal.Decimal = decimal.Decimal('70')
-    TEST_FRAMEWORK: TestFramework = TestFramework.PYTEST
+    TEST_FRAMEWORK: str = TestFramework.PYTEST
     BRANCH_COVERAGE: bool = False
     MAX_FILES_IN_COMMENT: int = 25
+    # Number of comments a report too long for a single comment may be split into
+    MAX_COMMENTS: int = 1
+    # Write the links and badges of the comment as reference-style links, a URL used several times is written once
+    REFERENCE_LINKS: bool = False
+    # Only the newest of the runs posting on the same pull request at the same time posts its report
+    COALESCE_COMMENTS: bool = False
+    # Set by GitHub Actions, order the runs of a repository by the time they were triggered
+    GITHUB_RUN_ID: int | None = None
+    GITHUB_RUN_ATTEMPT: int | None = None
     SKIP_COVERED_FILES_IN_REPORT: bool = True
     COMPLETE_PROJECT_REPORT: bool = False
     LABEL: str | None = None
+    # Custom Jinja template of the comment, compiled at runtime, the built-in one is used when unset
+    TEMPLATE_PATH: pathlib.Path | None = None
+    OUTPUTS: list[OutputType] = dataclasses.field(default_factory=lambda: [OutputType.COMMENT])
+    # Set by GitHub Actions to the path of the job summary file
+    GITHUB_STEP_SUMMARY: pathlib.Path | None = None
+    JSON_REPORT_PATH: pathlib.Path | None = None
+    MARKDOWN_REPORT_PATH: pathlib.Path | None = None
+    # Unified diff of the pull request, read from this file instead of the GitHub API
+    DIFF_PATH: pathlib.Path | None = None
+    # Wall clock budget in seconds for the whole run, unbounded when unset
+    COMMENT_DEADLINE_SECONDS: float | None = None
+    # Record every GitHub API exchange to a cassette file, or answer them from one without any network
+    HTTP_RECORD_PATH: pathlib.Path | None = None
+    HTTP_REPLAY_PATH: pathlib.Path | None = None
+    HTTP_REPLAY_LATENCY: bool = False
+    # Write the summary of the GitHub API requests of the run to this JSON file
+    METRICS_PATH: pathlib.Path | None = None
     DEBUG: bool = False
 
     def __post_init__(self) -> None:
-        if self.GITHUB_PR_NUMBER is None and self.GITHUB_REF is None:
+        if not self.offline and not self.GITHUB_TOKEN:
+            raise ValueError('GITHUB_TOKEN must be provided unless DIFF_PATH is set and no output posts to GitHub')
+        if not self.offline and self.GITHUB_PR_NUMBER is None and self.GITHUB_REF is None:
             raise ValueError('Either GITHUB_PR_NUMBER or GITHUB_REF must be provided')
+        if not self.OUTPUTS:
+            raise ValueError('At least one output must be provided in OUTPUTS')
+        if self.MAX_COMMENTS < 1:
+            raise ValueError('MAX_COMMENTS must be at least 1')
+        if self.COMMENT_DEADLINE_SECONDS is not None and self.COMMENT_DEADLINE_SECONDS <= 0:
+            raise ValueError('COMMENT_DEADLINE_SECONDS must be greater than 0')
+
+    @property
+    def offline(self) -> bool:
+        """Whether the run needs no GitHub API call at all: the diff is local and no output posts to GitHub."""
+        return self.DIFF_PATH is not None and not {OutputType.COMMENT, OutputType.CHECK_RUN} & set(self.OUTPUTS)
+
+    @property
+    def coverage_paths(self) -> list[pathlib.Path]:
+        return self.COVERAGE_PATH if isinstance(self.COVERAGE_PATH, list) else [self.COVERAGE_PATH]
 
     # Clean methods
     @classmethod
@@ -73,6 +141,10 @@ class Config:
     def clean_complete_project_report(cls, value: str) -> bool:
         return str_to_bool(value)
 
+    @classmethod
+    def clean_reference_links(cls, value: str) -> bool:
+        return str_to_bool(value)
+
     @classmethod
     def clean_skip_covered_files_in_report(cls, value: str) -> bool:
         return str_to_bool(value)
@@ -90,17 +162,98 @@ class Config:
         return int(value)
 
     @classmethod
-    def clean_coverage_path(cls, value: str) -> pathlib.Path:
-        return resolve_path(value)
+    def clean_max_comments(cls, value: str) -> int:
+        return int(value)
+
+    @classmethod
+    def clean_coalesce_comments(cls, value: str) -> bool:
+        return str_to_bool(value)
+
+    @classmethod
+    def clean_github_run_id(cls, value: str) -> int:
+        return int(value)
+
+    @classmethod
+    def clean_github_run_attempt(cls, value: str) -> int:
+        return int(value)
+
+    @classmethod
+    def clean_comment_deadline_seconds(cls, value: str) -> float:
+        return float(value)
+
+    @classmethod
+    def clean_http_record_path(cls, value: str) -> pathlib.Path:
+        return pathlib.Path(value)
+
+    @classmethod
+    def clean_http_replay_path(cls, value: str) -> pathlib.Path:
+        return pathlib.Path(value).resolve()
+
+    @classmethod
+    def clean_http_replay_latency(cls, value: str) -> bool:
+        return str_to_bool(value)
+
+    @classmethod
+    def clean_github_step_summary(cls, value: str) -> pathlib.Path:
+        return pathlib.Path(value)
+
+    @classmethod
+    def clean_json_report_path(cls, value: str) -> pathlib.Path:
+        return pathlib.Path(value)
+
+    @classmethod
+    def clean_markdown_report_path(cls, value: str) -> pathlib.Path:
+        return pathlib.Path(value)
+
+    @classmethod
+    def clean_diff_path(cls, value: str) -> pathlib.Path:
+        if value == str(STDIO_PATH):
+            return STDIO_PATH
+        path = pathlib.Path(value).resolve()
+        if not path.is_file():
+            raise ValueError('Path does not exist')
+        return path
+
+    @classmethod
+    def clean_metrics_path(cls, value: str) -> pathlib.Path:
+        return pathlib.Path(value)
+
+    @classmethod
+    def clean_outputs(cls, value: str) -> list[OutputType]:
+        return [OutputType(output.strip()) for output in value.split(',') if output.strip()]
+
+    @classmethod
+    def clean_template_path(cls, value: str) -> pathlib.Path:
+        path = pathlib.Path(value).resolve()
+        if not path.is_file():
+            raise ValueError('Path does not exist')
+        return path
+
+    @classmethod
+    def clean_coverage_path(cls, value: str) -> pathlib.Path | list[pathlib.Path]:
+        """A path, or comma separated paths and glob patterns naming several reports."""
+        paths: list[pathlib.Path] = []
+        for item in (item.strip() for item in value.split(',')):
+            if not any(char in item for char in '*?['):
+                paths.append(resolve_path(item))
+                continue
+            matches = sorted(glob.glob(item, recursive=True))
+            if not matches:
+                raise ValueError(f'No file matches {item}')
+            paths.extend(resolve_path(match) for match in matches)
+        paths = list(dict.fromkeys(paths))
+        return paths[0] if len(paths) == 1 else paths
 
     @classmethod
-    def clean_test_framework(cls, value: str) -> TestFramework:
-        return TestFramework(value)
+    def clean_test_framework(cls, value: str) -> str:
+        # Any other test framework is looked up in the entry points of the installed packages
+        return value
 
     # We need to type environ as a MutableMapping because that's what
     # os.environ is, and `dict[str, str]` is not enough
     @classmethod
-    def from_environ(cls, environ: MutableMapping[str, str]) -> Self:
+    def from_environ(cls, environ: MutableMapping[str, str], defaults: Mapping[str, Any] | None = None) -> Self:
+        """`defaults` holds already clean values of the variables missing from `environ`."""
         possible_variables = list(inspect.signature(cls).parameters)
         config_dict: dict[str, Any] = {k: v for k, v in environ.items() if k in possible_variables}
         for key, value in config_dict.items():
@@ -114,12 +267,16 @@ class Config:
                 raise ValueError(f'{key}: {exc!s}') from exc
 
         try:
-            config_obj = cls(**config_dict)
+            config_obj = cls(**{**(defaults or {}), **config_dict})
         except TypeError as e:
-            missing = {
-                name
-                for name, param in inspect.signature(cls).parameters.items()
-                if param.default is inspect.Parameter.empty
-            } - set(environ)
+            missing = (
+                {
+                    name
+                    for name, param in inspect.signature(cls).parameters.items()
+                    if param.default is inspect.Parameter.empty
+                }
+                - set(environ)
+                - set(defaults or {})
+            )
             raise MissingEnvironmentVariable(f' missing environment variable(s): {", ".join(missing)}') from e
         return config_obj
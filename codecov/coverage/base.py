@@ -1,5 +1,6 @@
 import dataclasses
 import decimal
+import importlib.metadata
 import json
 import pathlib
 from abc import ABC, abstractmethod
@@ -11,8 +12,18 @@ from codecov.log import log
 
 if TYPE_CHECKING:
     from codecov.coverage.jest import JestCoverage
+    from codecov.coverage.partial import Partial
     from codecov.coverage.pytest import PytestCoverage
 
+# Entry point group of the coverage handlers, named after the TEST_FRAMEWORK selecting them
+HANDLERS_GROUP = 'codecov.coverage_handlers'
+# Built-in handlers, also declared in pyproject.toml, are found without scanning the installed packages
+BUILTIN_HANDLERS: dict[str, str] = {
+    TestFramework.PYTEST: 'codecov.coverage.pytest:PytestCoverageHandler',
+    TestFramework.JEST: 'codecov.coverage.jest:JestCoverageHandler',
+    TestFramework.PARTIAL: 'codecov.coverage.partial:PartialCoverageHandler',
+}
+
 
 @dataclasses.dataclass
 class FileDiffCoverage:
@@ -47,12 +58,8 @@ T = TypeVar('T', bound=BaseCoverage)
 
 
 class BaseCoverageHandler(ABC, Generic[T]):
-    TEST_FRAMEWORK: TestFramework
-    REGISTRY: ClassVar[dict[TestFramework, type['BaseCoverageHandler[Any]']]] = {}
-
-    def __init_subclass__(cls) -> None:
-        super().__init_subclass__()
-        BaseCoverageHandler.REGISTRY[cls.TEST_FRAMEWORK] = cls
+    # Handlers loaded so far, by test framework
+    REGISTRY: ClassVar[dict[str, type['BaseCoverageHandler[Any]']]] = {}
 
     def convert_to_decimal(self, value: float | decimal.Decimal, precision: int = 2) -> decimal.Decimal:
         if not isinstance(value, decimal.Decimal):
@@ -62,8 +69,52 @@ class BaseCoverageHandler(ABC, Generic[T]):
             rounding=decimal.ROUND_DOWN,
         )
 
+    def compute_coverage(
+        self,
+        num_covered: int,
+        num_total: int,
+        *,
+        num_branches_covered: int = 0,
+        num_branches_total: int = 0,
+    ) -> decimal.Decimal:
+        numerator = decimal.Decimal(num_covered + num_branches_covered)
+        denominator = decimal.Decimal(num_total + num_branches_total)
+        if denominator == 0:
+            return decimal.Decimal('1')
+        return numerator / denominator
+
+    def total_diff_coverage(self, files: dict[pathlib.Path, FileDiffCoverage], num_changed_lines: int) -> DiffCoverage:
+        """
+        Diff coverage of files computed separately, by `get_diff_coverage` on a part of the
+        diff each. The branches of the files only count when branch coverage is enabled.
+        """
+        total_num_lines = sum(len(file.added_statements) for file in files.values())
+        total_num_violations = sum(len(file.missing_statements) for file in files.values())
+        num_branches_covered = sum(len(file.covered_branches) for file in files.values())
+        num_branches = num_branches_covered + sum(len(file.missing_branches) for file in files.values())
+        return DiffCoverage(
+            total_num_lines=total_num_lines,
+            total_num_violations=total_num_violations,
+            total_percent_covered=self.compute_coverage(
+                num_covered=total_num_lines - total_num_violations,
+                num_total=total_num_lines,
+                num_branches_covered=num_branches_covered,
+                num_branches_total=num_branches,
+            ),
+            num_changed_lines=num_changed_lines,
+            files=files,
+        )
+
     def get_coverage(self, config: Config) -> T:
         coverage_path = config.COVERAGE_PATH
+        if isinstance(coverage_path, list):
+            from codecov.coverage.partial import merge_reports  # pylint: disable=import-outside-toplevel
+
+            return self.from_partial(merge_reports(coverage_path, test_framework=config.TEST_FRAMEWORK))
+        return self.load(coverage_path)
+
+    def load(self, coverage_path: pathlib.Path) -> T:
+        """Read and parse a single coverage report."""
         try:
             with coverage_path.open() as coverage_data:
                 json_coverage = json.loads(coverage_data.read())
@@ -80,6 +131,11 @@ class BaseCoverageHandler(ABC, Generic[T]):
             log.error('Unable to extract coverage info from coverage report file: %s', coverage_path)
             raise ConfigurationException from exc
 
+    def from_partial(self, partial: 'Partial') -> T:
+        """Coverage of the reports merged into a partial, when COVERAGE_PATH names several of them."""
+        log.error('Several coverage reports cannot be merged with the %s handler', type(self).__name__)
+        raise ConfigurationException
+
     @abstractmethod
     def extract_info(self, data: dict) -> T:
         raise NotImplementedError  # pragma: no cover
@@ -96,13 +152,38 @@ class BaseCoverageHandler(ABC, Generic[T]):
     @classmethod
     def get_coverage_handler(
         cls,
-        test_framework: TestFramework,
+        test_framework: str,
     ) -> 'BaseCoverageHandler[PytestCoverage | JestCoverage]':
-        try:
-            return cast(
-                'BaseCoverageHandler[PytestCoverage | JestCoverage]',
-                cls.REGISTRY[test_framework](),
+        if test_framework not in cls.REGISTRY:
+            cls.REGISTRY[test_framework] = cls.load_handler(test_framework)
+        return cast(
+            'BaseCoverageHandler[PytestCoverage | JestCoverage]',
+            cls.REGISTRY[test_framework](),
+        )
+
+    @staticmethod
+    def load_handler(test_framework: str) -> type['BaseCoverageHandler[Any]']:
+        """
+        Import the handler of `test_framework` only: a built-in one, or the one a plugin
+        package declares in the `codecov.coverage_handlers` entry point group.
+        """
+        entry_point: importlib.metadata.EntryPoint | None
+        if test_framework in BUILTIN_HANDLERS:
+            entry_point = importlib.metadata.EntryPoint(
+                name=test_framework, value=BUILTIN_HANDLERS[test_framework], group=HANDLERS_GROUP
             )
-        except KeyError as exc:
-            log.error('No coverage handler found for test framework: %s', test_framework.value)
+        else:
+            entry_point = next(iter(importlib.metadata.entry_points(group=HANDLERS_GROUP, name=test_framework)), None)
+        if entry_point is None:
+            log.error('No coverage handler found for test framework: %s', test_framework)
+            raise ConfigurationException
+
+        try:
+            handler = entry_point.load()
+        except (ImportError, AttributeError) as exc:
+            log.error('Error loading the coverage handler %s: %s', entry_point.value, str(exc))
             raise ConfigurationException from exc
+        if not (isinstance(handler, type) and issubclass(handler, BaseCoverageHandler)):
+            log.error('The coverage handler %s is not a subclass of BaseCoverageHandler', entry_point.value)
+            raise ConfigurationException
+        return handler
@@ -1,10 +1,14 @@
 import dataclasses
 import decimal
 import pathlib
+from typing import TYPE_CHECKING
 
-from codecov.config import Config, TestFramework
+from codecov.config import Config
 from codecov.coverage.base import BaseCoverage, BaseCoverageHandler, DiffCoverage, FileDiffCoverage
 
+if TYPE_CHECKING:
+    from codecov.coverage.partial import FilePartial, Partial
+
 
 @dataclasses.dataclass
 class JestCoverageInfo:  # pylint: disable=too-many-instance-attributes
@@ -35,8 +39,6 @@ class JestCoverage(BaseCoverage):
 
 
 class JestCoverageHandler(BaseCoverageHandler[JestCoverage]):
-    TEST_FRAMEWORK: TestFramework = TestFramework.JEST
-
     """
     {
         "/app/sample/index.ts": {
@@ -171,6 +173,46 @@ class JestCoverageHandler(BaseCoverageHandler[JestCoverage]):
             ),
         )
 
+    def get_info(self, covered_lines: int, missing_lines: int, excluded_lines: int) -> JestCoverageInfo:
+        percent_covered = self.compute_coverage(num_covered=covered_lines, num_total=covered_lines + missing_lines)
+        return JestCoverageInfo(
+            covered_lines=covered_lines,
+            num_statements=covered_lines + missing_lines,
+            missing_lines=missing_lines,
+            excluded_lines=excluded_lines,
+            num_functions=0,
+            covered_functions=0,
+            missing_functions=0,
+            percent_covered=percent_covered,
+            percent_covered_display=self._get_percentage_display(value=percent_covered),
+        )
+
+    def from_partial(self, partial: 'Partial') -> JestCoverage:
+        """Jest coverage of the merged lines, jest reports have no branch arcs to merge."""
+        files = {pathlib.Path(path): self.extract_file_partial(path, file) for path, file in partial.files.items()}
+        return JestCoverage(
+            files=files,
+            info=self.get_info(
+                covered_lines=sum(file.info.covered_lines for file in files.values()),
+                missing_lines=sum(file.info.missing_lines for file in files.values()),
+                excluded_lines=sum(file.info.excluded_lines for file in files.values()),
+            ),
+        )
+
+    def extract_file_partial(self, path: str, file: 'FilePartial') -> JestFileCoverage:
+        totals = file.get_totals()
+        return JestFileCoverage(
+            path=pathlib.Path(path),
+            covered_lines=sorted(file.covered_lines),
+            missing_lines=sorted(file.missing_lines),
+            excluded_lines=sorted(file.excluded_lines),
+            info=self.get_info(
+                covered_lines=totals.covered_lines,
+                missing_lines=totals.missing_lines,
+                excluded_lines=totals.excluded_lines,
+            ),
+        )
+
     def get_file_diff_coverage(self, file: JestFileCoverage, added_lines: list[int]) -> FileDiffCoverage:
         covered = set(file.covered_lines) & set(added_lines)
         missing = set(file.missing_lines) & set(added_lines)
@@ -0,0 +1,432 @@
+"""
+Partial coverage of the shards of a test suite. Each shard turns its coverage report into a
+partial, a compact document holding the line and branch sets of every file as ranges, and
+the partials are merged, in any order and any grouping, into the partial of the whole suite.
+The `partial` test framework then reads it like a coverage.py report.
+
+    codecov-partial create coverage.json --diff pr.diff --output shard-1.json
+    codecov-partial merge shard-*.json --output merged.json
+    TEST_FRAMEWORK=partial COVERAGE_PATH=merged.json codecov
+
+A line is covered when a shard covered it, missing when no shard did, and the same goes for
+branches. With `--diff`, a partial only holds the sets of the lines added by the diff, and
+the counts of every file beside them: the diff coverage of the merge is exact, but the file
+and project totals are a lower bound, a file being as covered as the shard covering it most.
+Without it, the partial holds the sets of every line, and the totals computed again from
+the merged sets are exact.
+"""
+
+import argparse
+import dataclasses
+import datetime
+import itertools
+import json
+import multiprocessing
+import os
+import pathlib
+import sys
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from codecov.coverage.base import BaseCoverageHandler
+from codecov.coverage.pytest import (
+    PytestCoverage,
+    PytestCoverageHandler,
+    PytestCoverageInfo,
+    PytestCoverageMetadata,
+    PytestFileCoverage,
+)
+from codecov.exceptions import ConfigurationException
+from codecov.github import GithubDiffParser
+from codecov.log import log, setup as log_setup
+
+FORMAT = 'codecov-partial'
+VERSION = 1
+# Reports smaller than this in total are read in the process, faster than starting the
+# worker processes: about 0.4 s, the time to parse 5 MB of coverage.py report
+PARALLEL_MIN_SIZE = 8 * 1024 * 1024
+
+
+@dataclasses.dataclass
+class Totals:
+    covered_lines: int = 0
+    missing_lines: int = 0
+    excluded_lines: int = 0
+    covered_branches: int = 0
+    missing_branches: int = 0
+
+    def merge(self, other: 'Totals') -> 'Totals':
+        # Without the sets, the lines covered by two shards can't be matched: a file is as
+        # covered as the shard covering it most, a lower bound of the union
+        num_statements = max(self.covered_lines + self.missing_lines, other.covered_lines + other.missing_lines)
+        num_branches = max(
+            self.covered_branches + self.missing_branches, other.covered_branches + other.missing_branches
+        )
+        covered_lines = max(self.covered_lines, other.covered_lines)
+        covered_branches = max(self.covered_branches, other.covered_branches)
+        return Totals(
+            covered_lines=covered_lines,
+            missing_lines=num_statements - covered_lines,
+            excluded_lines=max(self.excluded_lines, other.excluded_lines),
+            covered_branches=covered_branches,
+            missing_branches=num_branches - covered_branches,
+        )
+
+
+@dataclasses.dataclass
+class FilePartial:
+    covered_lines: set[int] = dataclasses.field(default_factory=set)
+    missing_lines: set[int] = dataclasses.field(default_factory=set)
+    excluded_lines: set[int] = dataclasses.field(default_factory=set)
+    executed_branches: set[tuple[int, int]] = dataclasses.field(default_factory=set)
+    missing_branches: set[tuple[int, int]] = dataclasses.field(default_factory=set)
+    # Counts of the whole file, when the sets only hold the lines of a diff
+    totals: Totals | None = None
+
+    def get_totals(self) -> Totals:
+        if self.totals is not None:
+            return self.totals
+        return Totals(
+            covered_lines=len(self.covered_lines),
+            missing_lines=len(self.missing_lines),
+            excluded_lines=len(self.excluded_lines),
+            covered_branches=len(self.executed_branches),
+            missing_branches=len(self.missing_branches),
+        )
+
+    def limit(self, lines: set[int]) -> 'FilePartial':
+        """The sets of `lines` only, a branch belonging to the line it starts from, and the totals of the file."""
+        return FilePartial(
+            covered_lines=self.covered_lines & lines,
+            missing_lines=self.missing_lines & lines,
+            excluded_lines=self.excluded_lines & lines,
+            executed_branches={branch for branch in self.executed_branches if branch[0] in lines},
+            missing_branches={branch for branch in self.missing_branches if branch[0] in lines},
+            totals=self.get_totals(),
+        )
+
+    def merge(self, other: 'FilePartial') -> 'FilePartial':
+        merged = FilePartial()
+        merged.update(self)
+        merged.update(other)
+        return merged
+
+    def update(self, other: 'FilePartial') -> None:
+        """Merge `other` in place, cheaper than `merge` when merging many partials."""
+        if self.totals is not None or other.totals is not None:
+            self.totals = self.get_totals().merge(other.get_totals())
+        self.covered_lines |= other.covered_lines
+        self.missing_lines |= other.missing_lines
+        self.missing_lines -= self.covered_lines
+        self.excluded_lines |= other.excluded_lines
+        self.executed_branches |= other.executed_branches
+        self.missing_branches |= other.missing_branches
+        self.missing_branches -= self.executed_branches
+
+
+@dataclasses.dataclass
+class Partial:
+    files: dict[str, FilePartial] = dataclasses.field(default_factory=dict)
+    branch_coverage: bool = False
+    # Time of the most recent of the merged reports
+    timestamp: datetime.datetime | None = None
+
+    def merge(self, other: 'Partial') -> 'Partial':
+        merged = Partial()
+        merged.update(self)
+        merged.update(other)
+        return merged
+
+    def update(self, other: 'Partial') -> None:
+        for path, file in other.files.items():
+            self.files.setdefault(path, FilePartial()).update(file)
+        self.branch_coverage = self.branch_coverage or other.branch_coverage
+        timestamps = [timestamp for timestamp in (self.timestamp, other.timestamp) if timestamp is not None]
+        self.timestamp = max(timestamps, default=None)
+
+    def limit(self, added_lines: Mapping[pathlib.Path, Iterable[int]]) -> 'Partial':
+        """Partial of the lines added by a diff, with the totals of every file."""
+        return dataclasses.replace(
+            self,
+            files={path: file.limit(set(added_lines.get(pathlib.Path(path), ()))) for path, file in self.files.items()},
+        )
+
+    @classmethod
+    def from_coverage(cls, coverage: Any) -> 'Partial':
+        """Partial of the report parsed by any coverage handler, the branches are only known to some."""
+        files = {}
+        for path, file in coverage.files.items():
+            files[str(path)] = FilePartial(
+                covered_lines=set(file.covered_lines),
+                missing_lines=set(file.missing_lines),
+                excluded_lines=set(file.excluded_lines),
+                executed_branches={
+                    (source, destination) for source, destination in getattr(file, 'executed_branches', None) or []
+                },
+                missing_branches={
+                    (source, destination) for source, destination in getattr(file, 'missing_branches', None) or []
+                },
+            )
+        meta = getattr(coverage, 'meta', None)
+        return cls(
+            files=files,
+            branch_coverage=bool(meta and meta.branch_coverage),
+            timestamp=meta.timestamp if meta else None,
+        )
+
+    def as_json(self) -> dict[str, Any]:
+        return {
+            'format': FORMAT,
+            'version': VERSION,
+            'branch_coverage': self.branch_coverage,
+            'timestamp': self.timestamp.isoformat() if self.timestamp else None,
+            'files': {
+                path: {
+                    'covered_lines': encode_lines(file.covered_lines),
+                    'missing_lines': encode_lines(file.missing_lines),
+                    'excluded_lines': encode_lines(file.excluded_lines),
+                    'executed_branches': encode_branches(file.executed_branches),
+                    'missing_branches': encode_branches(file.missing_branches),
+                    **({'totals': dataclasses.asdict(file.totals)} if file.totals is not None else {}),
+                }
+                for path, file in sorted(self.files.items())
+            },
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> 'Partial':
+        if data.get('format') != FORMAT or data.get('version') != VERSION:
+            raise ValueError(f'Not a {FORMAT} document of version {VERSION}')
+        return cls(
+            files={
+                path: FilePartial(
+                    covered_lines=decode_lines(file['covered_lines']),
+                    missing_lines=decode_lines(file['missing_lines']),
+                    excluded_lines=decode_lines(file['excluded_lines']),
+                    executed_branches=decode_branches(file['executed_branches']),
+                    missing_branches=decode_branches(file['missing_branches']),
+                    totals=Totals(**file['totals']) if 'totals' in file else None,
+                )
+                for path, file in data['files'].items()
+            },
+            branch_coverage=data['branch_coverage'],
+            timestamp=datetime.datetime.fromisoformat(data['timestamp']) if data['timestamp'] else None,
+        )
+
+
+def encode_lines(lines: Iterable[int]) -> str:
+    """Sorted lines as ranges: `1-3,5,8-9`."""
+    ranges: list[list[int]] = []
+    for line in sorted(lines):
+        if ranges and line == ranges[-1][1] + 1:
+            ranges[-1][1] = line
+        else:
+            ranges.append([line, line])
+    return ','.join(str(start) if start == end else f'{start}-{end}' for start, end in ranges)
+
+
+def decode_lines(text: str) -> set[int]:
+    lines: set[int] = set()
+    for item in filter(None, text.split(',')):
+        start, _, end = item.partition('-')
+        lines.update(range(int(start), int(end or start) + 1))
+    return lines
+
+
+def encode_branches(branches: Iterable[tuple[int, int]]) -> str:
+    """Sorted branch arcs: `2>3,5>-1`, a negative destination leaves the enclosing scope."""
+    return ','.join(f'{source}>{destination}' for source, destination in sorted(branches))
+
+
+def decode_branches(text: str) -> set[tuple[int, int]]:
+    branches = set()
+    for item in filter(None, text.split(',')):
+        source, _, destination = item.partition('>')
+        branches.add((int(source), int(destination)))
+    return branches
+
+
+def get_display(percent: float) -> str:
+    # As coverage.py does, only a fully covered or an uncovered report shows 100% or 0%
+    if 0 < percent < 1:
+        return '1'
+    if 99 < percent < 100:
+        return '99'
+    return str(round(percent))
+
+
+class PartialCoverageHandler(PytestCoverageHandler):
+    """Read a partial as a coverage.py report, the totals computed from the line and branch sets or carried along."""
+
+    def extract_info(self, data: dict) -> PytestCoverage:
+        try:
+            partial = Partial.from_json(data)
+        except (ValueError, TypeError) as exc:
+            raise KeyError(str(exc)) from exc
+        return self.from_partial(partial)
+
+    def from_partial(self, partial: Partial) -> PytestCoverage:
+        files = {
+            pathlib.Path(path): self.extract_file_partial(path, file, partial.branch_coverage)
+            for path, file in partial.files.items()
+        }
+        return PytestCoverage(
+            meta=PytestCoverageMetadata(
+                version=FORMAT,
+                timestamp=partial.timestamp or datetime.datetime.fromtimestamp(0),
+                branch_coverage=partial.branch_coverage,
+                show_contexts=False,
+            ),
+            files=files,
+            info=self.sum_info([file.info for file in files.values()], partial.branch_coverage),
+        )
+
+    def extract_file_partial(self, path: str, file: FilePartial, branch_coverage: bool) -> PytestFileCoverage:
+        totals = file.get_totals()
+        return PytestFileCoverage(
+            path=pathlib.Path(path),
+            covered_lines=sorted(file.covered_lines),
+            missing_lines=sorted(file.missing_lines),
+            excluded_lines=sorted(file.excluded_lines),
+            executed_branches=[list(branch) for branch in sorted(file.executed_branches)] if branch_coverage else None,
+            missing_branches=[list(branch) for branch in sorted(file.missing_branches)] if branch_coverage else None,
+            info=self.get_info(
+                covered_lines=totals.covered_lines,
+                missing_lines=totals.missing_lines,
+                excluded_lines=totals.excluded_lines,
+                covered_branches=totals.covered_branches if branch_coverage else None,
+                missing_branches=totals.missing_branches if branch_coverage else None,
+            ),
+        )
+
+    def sum_info(self, infos: list[PytestCoverageInfo], branch_coverage: bool) -> PytestCoverageInfo:
+        return self.get_info(
+            covered_lines=sum(info.covered_lines for info in infos),
+            missing_lines=sum(info.missing_lines for info in infos),
+            excluded_lines=sum(info.excluded_lines for info in infos),
+            covered_branches=sum(info.covered_branches or 0 for info in infos) if branch_coverage else None,
+            missing_branches=sum(info.missing_branches or 0 for info in infos) if branch_coverage else None,
+        )
+
+    def get_info(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        covered_lines: int,
+        missing_lines: int,
+        excluded_lines: int,
+        covered_branches: int | None,
+        missing_branches: int | None,
+    ) -> PytestCoverageInfo:
+        num_statements = covered_lines + missing_lines
+        num_branches = None if covered_branches is None else covered_branches + (missing_branches or 0)
+        percent = self.compute_coverage(
+            num_covered=covered_lines,
+            num_total=num_statements,
+            num_branches_covered=covered_branches or 0,
+            num_branches_total=num_branches or 0,
+        )
+        return PytestCoverageInfo(
+            covered_lines=covered_lines,
+            num_statements=num_statements,
+            missing_lines=missing_lines,
+            excluded_lines=excluded_lines,
+            num_branches=num_branches,
+            covered_branches=covered_branches,
+            missing_branches=missing_branches,
+            percent_covered=self.convert_to_decimal(percent),
+            percent_covered_display=get_display(float(percent * 100)),
+        )
+
+
+def read_partial(path: pathlib.Path) -> Partial:
+    try:
+        return Partial.from_json(json.loads(path.read_text()))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        log.error('Error reading the partial coverage %s: %s', path, str(e))
+        raise ConfigurationException from e
+
+
+def create(
+    coverage_path: pathlib.Path, test_framework: str, added_lines: Mapping[pathlib.Path, Iterable[int]] | None = None
+) -> Partial:
+    """Partial of a coverage report of any test framework, limited to the `added_lines` of a diff if given."""
+    handler = BaseCoverageHandler.get_coverage_handler(test_framework=test_framework)
+    partial = Partial.from_coverage(handler.load(coverage_path))
+    return partial if added_lines is None else partial.limit(added_lines)
+
+
+def read_diff(path: pathlib.Path) -> dict[pathlib.Path, list[int]]:
+    try:
+        return GithubDiffParser(diff=path.read_text()).parse()
+    except OSError as e:
+        log.error('Error reading the diff file %s: %s', path, str(e))
+        raise ConfigurationException from e
+
+
+def merge(partials: Iterable[Partial]) -> Partial:
+    merged = Partial()
+    for partial in partials:
+        merged.update(partial)
+    return merged
+
+
+def _get_mp_context() -> multiprocessing.context.BaseContext:
+    # Not forked from the run, whose other threads may hold locks, but from a server process
+    # started once, with this module already imported
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def _read_reports(paths: list[pathlib.Path], test_framework: str) -> Partial:
+    return merge(create(path, test_framework=test_framework) for path in paths)
+
+
+def merge_reports(paths: list[pathlib.Path], test_framework: str, workers: int | None = None) -> Partial:
+    """
+    Read the reports in worker processes, each one merging its share of them, and merge the
+    partials they send back. The handler of the test framework reads the merged partial.
+    """
+    workers = min(len(paths), workers or os.cpu_count() or 1)
+    if workers == 1 or sum(path.stat().st_size for path in paths) < PARALLEL_MIN_SIZE:
+        partial = _read_reports(paths, test_framework=test_framework)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_get_mp_context()) as executor:
+            chunks = [paths[index::workers] for index in range(workers)]
+            partial = merge(executor.map(_read_reports, chunks, itertools.repeat(test_framework)))
+    return partial
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    create_parser = subparsers.add_parser('create', help='partial of the coverage report of a shard')
+    create_parser.add_argument('coverage', type=pathlib.Path, help='coverage report')
+    create_parser.add_argument('--test-framework', default='pytest', help='format of the coverage report')
+    create_parser.add_argument(
+        '--diff', type=pathlib.Path, help='diff of the pull request, the partial only holds the lines it adds'
+    )
+    create_parser.add_argument('--output', type=pathlib.Path, required=True)
+    merge_parser = subparsers.add_parser('merge', help='merge partials into one')
+    merge_parser.add_argument('partials', type=pathlib.Path, nargs='+')
+    merge_parser.add_argument('--output', type=pathlib.Path, required=True)
+    args = parser.parse_args()
+
+    log_setup(debug=False)
+    try:
+        if args.command == 'create':
+            added_lines = read_diff(args.diff) if args.diff else None
+            partial = create(args.coverage, test_framework=args.test_framework, added_lines=added_lines)
+        else:
+            partial = merge(read_partial(path) for path in args.partials)
+    except ConfigurationException:
+        sys.exit(1)
+    args.output.write_text(json.dumps(partial.as_json(), separators=(',', ':')))
+    log.info('Partial coverage of %d files written to %s', len(partial.files), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,10 +2,14 @@ import dataclasses
 import datetime
 import decimal
 import pathlib
+from typing import TYPE_CHECKING
 
-from codecov.config import Config, TestFramework
+from codecov.config import Config
 from codecov.coverage.base import BaseCoverage, BaseCoverageHandler, DiffCoverage, FileDiffCoverage
 
+if TYPE_CHECKING:
+    from codecov.coverage.partial import Partial
+
 
 @dataclasses.dataclass
 class PytestCoverageInfo:  # pylint: disable=too-many-instance-attributes
@@ -47,21 +51,6 @@ class PytestCoverage(BaseCoverage):
 
 
 class PytestCoverageHandler(BaseCoverageHandler[PytestCoverage]):
-    TEST_FRAMEWORK: TestFramework = TestFramework.PYTEST
-
-    def compute_coverage(
-        self,
-        num_covered: int,
-        num_total: int,
-        num_branches_covered: int = 0,
-        num_branches_total: int = 0,
-    ) -> decimal.Decimal:
-        numerator = decimal.Decimal(num_covered + num_branches_covered)
-        denominator = decimal.Decimal(num_total + num_branches_total)
-        if denominator == 0:
-            return decimal.Decimal('1')
-        return numerator / denominator
-
     def extract_meta(self, data: dict) -> PytestCoverageMetadata:
         return PytestCoverageMetadata(
             version=data['meta']['version'],
@@ -139,12 +128,18 @@ class PytestCoverageHandler(BaseCoverageHandler[PytestCoverage]):
         return PytestCoverage(
             meta=self.extract_meta(data),
             files={
-                pathlib.Path(path): self.extract_file_coverage(path, file_data)
-                for path, file_data in data['files'].items()
+                file.path: file
+                for file in (self.extract_file_coverage(path, file_data) for path, file_data in data['files'].items())
             },
             info=self.extract_coverage_info(data['totals']),
         )
 
+    def from_partial(self, partial: 'Partial') -> PytestCoverage:
+        from codecov.coverage.partial import PartialCoverageHandler  # pylint: disable=import-outside-toplevel
+
+        # The totals of the merged lines and branches, as coverage.py computes them
+        return PartialCoverageHandler().from_partial(partial)
+
     @staticmethod
     def select_diff_branches(
         branches: list[list[int]] | None,
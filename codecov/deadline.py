@@ -0,0 +1,38 @@
+import time
+
+from codecov.exceptions import DeadlineExceeded
+from codecov.log import log
+
+# Mirrors the exit status of coreutils `timeout`, so CI can tell a blown budget from a failed run.
+DEADLINE_EXIT_CODE = 124
+
+
+class Deadline:
+    """
+    Wall clock budget of a whole run. A deadline without seconds never expires,
+    so every stage can take one unconditionally.
+    """
+
+    def __init__(self, seconds: float | None = None):
+        self.seconds = seconds
+        self.expires_at: float | None = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> float | None:
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def timeout(self, default: float) -> float:
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        return min(default, remaining)
+
+    def check(self, stage: str) -> None:
+        if self.expired():
+            log.error('The run exceeded its deadline of %s seconds while %s.', self.seconds, stage)
+            raise DeadlineExceeded(f'Deadline of {self.seconds} seconds exceeded while {stage}')
@@ -26,6 +26,10 @@ class CannotGetPullRequest(GithubBaseException):
     pass
 
 
+class CannotPostCheckRun(GithubBaseException):
+    pass
+
+
 class ApiError(GithubBaseException):
     pass
 
@@ -54,6 +58,10 @@ class MissingEnvironmentVariable(ConfigurationException):
     pass
 
 
+class RepositoryNotAllowed(ConfigurationException):
+    pass
+
+
 class TemplateBaseException(CoreBaseException):
     pass
 
@@ -64,3 +72,15 @@ class MissingMarker(TemplateBaseException):
 
 class TemplateException(TemplateBaseException):
     pass
+
+
+class CommentTooLong(TemplateBaseException):
+    pass
+
+
+class DeadlineExceeded(CoreBaseException):
+    pass
+
+
+class QueueFull(CoreBaseException):
+    pass
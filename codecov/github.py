@@ -1,19 +1,40 @@
 import dataclasses
+import functools
 import pathlib
 from collections import defaultdict, deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
+from codecov import shards
 from codecov.exceptions import (
     ApiError,
     CannotGetPullRequest,
     CannotGetUser,
+    CannotPostCheckRun,
     CannotPostComment,
     Forbidden,
     NotFound,
     Unauthorized,
 )
-from codecov.github_client import GitHubClient
 from codecov.log import log
 
+if TYPE_CHECKING:
+    from codecov.github_client import GitHubClient
+
+# Largest page size the GitHub API accepts
+PER_PAGE = 100
+# Largest number of annotations the GitHub API accepts in a single check run request
+ANNOTATIONS_PER_REQUEST = 50
+# Concurrent requests appending annotations to a check run
+CHECK_RUN_WORKERS = 4
+# Concurrent requests updating or deleting the comments of a report
+COMMENT_WORKERS = 4
+# First part of a report claimed by a run before it is rendered
+CLAIM_PLACEHOLDER = 'The coverage report is being computed.\n'
+# Times a run writes its lease again after an older run overwrote it
+CLAIM_ATTEMPTS = 3
+
 
 @dataclasses.dataclass
 class User:
@@ -23,13 +44,12 @@ class User:
 
 
 class Github:
-    def __init__(self, client: GitHubClient, repository: str, pr_number: int | None = None, ref: str | None = None):
+    def __init__(self, client: 'GitHubClient', repository: str, pr_number: int | None = None, ref: str | None = None):
         self.client = client
         self.repository: str = repository
 
         self.user: User = self._init_user()
         self.pr_number, self.base_ref = self._init_pr_number(pr_number=pr_number, ref=ref)
-        self.pr_diff: str = self._init_pr_diff()
 
     def _init_user(self) -> User:
         log.info('Getting user details.')
@@ -57,6 +77,7 @@ class Github:
                 log.debug('Pull request #%d is not in open state.', pr_number)
                 raise NotFound
 
+            self.head_sha = pull_request.head.sha
             return pull_request.number, pull_request.head.ref
         except Forbidden as exc:
             log.error(
@@ -79,6 +100,7 @@ class Github:
             pull_requests = self.client.repos(self.repository).pulls.get(state='open', per_page=100)
             for pull_request in pull_requests:
                 if pull_request.head.ref == ref:
+                    self.head_sha = pull_request.head.sha
                     return pull_request.number, pull_request.head.ref
             log.debug(
                 'No open pull request found for branch %s. Please ensure the branch has an active pull request.',
@@ -110,6 +132,11 @@ class Github:
         log.error('Pull request number or branch reference missing.')
         raise CannotGetPullRequest
 
+    @functools.cached_property
+    def pr_diff(self) -> str:
+        """Downloaded on first use only, the diff of DIFF_PATH is read instead when set."""
+        return self._init_pr_diff()
+
     def _init_pr_diff(self) -> str:
         log.debug('Getting the diff for pull request #%d.', self.pr_number)
         try:
@@ -133,9 +160,73 @@ class Github:
 
         return pull_request_diff
 
+    def _list_issue_comments(self) -> Iterator:
+        issue_comments_path = self.client.repos(self.repository).issues(self.pr_number).comments
+        page = 1
+        while True:
+            comments = issue_comments_path.get(per_page=PER_PAGE, page=page)
+            yield from comments
+            if len(comments) < PER_PAGE:
+                return
+            page += 1
+
     def post_comment(self, contents: str, marker: str) -> None:
-        log.info('Posting comment on pull request #%d.', self.pr_number)
-        if len(contents) > 65536:
+        self.post_comments(contents=[contents], marker=marker)
+
+    def _list_first_parts(self, marker: str) -> list[Any]:
+        return [
+            comment
+            for comment in self._list_issue_comments()
+            if comment.user.login == self.user.login and shards.get_comment_part(comment.body, marker) == 1
+        ]
+
+    def claim_comments(self, marker: str, lease: tuple[int, ...]) -> bool:
+        """
+        Write the lease of this run on the first part of the report, a placeholder when
+        there is no report yet, unless a newer run already did, in which case that run
+        posts the report and this one should not.
+
+        GitHub has no conditional write: runs listing the comments at the same time may
+        all create a first part, or overwrite each other's lease. So the first parts are
+        listed again once the lease is written. The newest lease wins, and its run deletes
+        the first parts of the older runs.
+        """
+        for _ in range(CLAIM_ATTEMPTS):
+            first_parts = self._list_first_parts(marker)
+            current = max((shards.get_lease(comment.body) or () for comment in first_parts), default=())
+            if current > lease:
+                return False
+            if current == lease:
+                # Duplicates of the first part are left by the runs that lost the race
+                winner = min(comment.id for comment in first_parts if shards.get_lease(comment.body) == lease)
+                for comment in first_parts:
+                    if comment.id != winner:
+                        self._delete_comment(comment.id)
+                return True
+            if first_parts:
+                comment = min(first_parts, key=lambda comment: comment.id)
+                self._update_comment(comment.id, shards.set_lease(comment.body, lease))
+            else:
+                self._create_comments([shards.set_lease(CLAIM_PLACEHOLDER + marker, lease)])
+        log.warning('Could not claim the comment on pull request #%d, posting it anyway.', self.pr_number)
+        return True
+
+    def post_comments(self, contents: list[str], marker: str, lease: tuple[int, ...] | None = None) -> bool:
+        """
+        Post a report split over several comments by `shards.split_comment`.
+
+        The comments of a previous run are matched by their part number, the parts that
+        already exist are updated in place and the ones not needed anymore are deleted,
+        concurrently. Missing parts are created one after the other so that they keep
+        their order on the pull request.
+
+        With a `lease`, nothing is posted when the report holds the lease of a newer run,
+        and False is returned.
+        """
+        if lease is not None:
+            contents = [shards.set_lease(contents[0], lease), *contents[1:]]
+        log.info('Posting %d comment(s) on pull request #%d.', len(contents), self.pr_number)
+        if any(len(part) > shards.MAX_COMMENT_LENGTH for part in contents):
             log.error(
                 'Comment exceeds the 65536 character limit (GitHub limitation). Reduce the number of files to be reported in the comment using "MAX_FILES_IN_COMMENT" and try again.'
             )
@@ -143,36 +234,138 @@ class Github:
 
         # Pull request review comments are comments made on a portion of the unified diff during a pull request review.
         # Issue comments are comments on the entire pull request. We need issue comments.
+        existing: dict[int, int] = {}
+        stale: list[int] = []
+        for comment in self._list_issue_comments():
+            if comment.user.login != self.user.login:
+                continue
+            part = shards.get_comment_part(comment.body, marker)
+            if part is None:
+                continue
+            if part == 1 and lease is not None and (shards.get_lease(comment.body) or lease) > lease:
+                log.info('A newer run posts the report on pull request #%d, leaving it as it is.', self.pr_number)
+                return False
+            if part in existing or part > len(contents):
+                stale.append(comment.id)
+            else:
+                existing[part] = comment.id
+
+        missing = [body for part, body in enumerate(contents, start=1) if part not in existing]
+        with ThreadPoolExecutor(max_workers=COMMENT_WORKERS) as executor:
+            futures = [executor.submit(self._create_comments, missing)] if missing else []
+            futures += [
+                executor.submit(self._update_comment, existing[part], body)
+                for part, body in enumerate(contents, start=1)
+                if part in existing
+            ]
+            futures += [executor.submit(self._delete_comment, comment_id) for comment_id in stale]
+            # Consume the results to raise the first error
+            for future in futures:
+                future.result()
+        return True
+
+    def _update_comment(self, comment_id: int, contents: str) -> None:
+        log.info('Updating existing comment on pull request')
+        try:
+            self.client.repos(self.repository).issues.comments(comment_id).patch(body=contents)
+        except Forbidden as exc:
+            log.error(
+                'Insufficient permissions to update the comment on pull request #%d. Please verify the token permissions and try again.',
+                self.pr_number,
+            )
+            raise CannotPostComment from exc
+        except ApiError as exc:
+            log.error(
+                'Error occurred while updating the comment on pull request #%d. Details: %s',
+                self.pr_number,
+                str(exc),
+            )
+            raise CannotPostComment from exc
+
+    def _create_comments(self, contents: list[str]) -> None:
         issue_comments_path = self.client.repos(self.repository).issues(self.pr_number).comments
-        comments_path = self.client.repos(self.repository).issues.comments
-        for comment in issue_comments_path.get():
-            if comment.user.login == self.user.login and marker in comment.body:
-                log.info('Updating existing comment on pull request')
-                try:
-                    comments_path(comment.id).patch(body=contents)
-                    return
-                except Forbidden as exc:
-                    log.error(
-                        'Insufficient permissions to update the comment on pull request #%d. Please verify the token permissions and try again.'
-                    )
-                    raise CannotPostComment from exc
-                except ApiError as exc:
-                    log.error(
-                        'Error occurred while updating the comment on pull request #%d. Details: %s',
-                        self.pr_number,
-                        str(exc),
-                    )
-                    raise CannotPostComment from exc
-
-        log.info('Adding new comment on pull request')
+        for body in contents:
+            log.info('Adding new comment on pull request')
+            try:
+                issue_comments_path.post(body=body)
+            except Forbidden as exc:
+                log.error(
+                    'Insufficient permissions to post a comment on pull request #%d. Please check the token permissions and try again.',
+                    self.pr_number,
+                )
+                raise CannotPostComment from exc
+
+    def _delete_comment(self, comment_id: int) -> None:
+        log.info('Deleting comment no longer needed on pull request')
         try:
-            issue_comments_path.post(body=contents)
+            self.client.repos(self.repository).issues.comments(comment_id).delete()
         except Forbidden as exc:
             log.error(
-                'Insufficient permissions to post a comment on pull request #%d. Please check the token permissions and try again.',
+                'Insufficient permissions to delete a comment on pull request #%d. Please check the token permissions and try again.',
                 self.pr_number,
             )
             raise CannotPostComment from exc
+        except ApiError as exc:
+            log.error(
+                'Error occurred while deleting a comment on pull request #%d. Details: %s',
+                self.pr_number,
+                str(exc),
+            )
+            raise CannotPostComment from exc
+
+    @functools.cached_property
+    def head_sha(self) -> str:
+        """Set when the pull request is looked up, fetched here only if it was not."""
+        log.debug('Getting the head commit of pull request #%d.', self.pr_number)
+        try:
+            return self.client.repos(self.repository).pulls(self.pr_number).get().head.sha
+        except (Forbidden, NotFound) as exc:
+            log.error(
+                'Unable to retrieve the head commit of pull request #%d. Please verify the token permissions and try again.',
+                self.pr_number,
+            )
+            raise CannotGetPullRequest from exc
+
+    def post_check_run(self, name: str, title: str, summary: str, annotations: list[dict[str, Any]]) -> None:
+        """
+        The check run is created with the first batch of annotations, every following
+        request appends another batch, so those are sent concurrently.
+        """
+        log.info('Posting check run with %d annotations on pull request #%d.', len(annotations), self.pr_number)
+        batches = [
+            annotations[i : i + ANNOTATIONS_PER_REQUEST] for i in range(0, len(annotations), ANNOTATIONS_PER_REQUEST)
+        ] or [[]]
+        check_runs_path = getattr(self.client.repos(self.repository), 'check-runs')
+        try:
+            check_run = check_runs_path.post(
+                name=name,
+                head_sha=self.head_sha,
+                status='completed',
+                conclusion='neutral',
+                output={'title': title, 'summary': summary, 'annotations': batches[0]},
+            )
+
+            def append(batch: list[dict[str, Any]]) -> None:
+                check_runs_path(check_run.id).patch(
+                    output={'title': title, 'summary': summary, 'annotations': batch},
+                )
+
+            with ThreadPoolExecutor(max_workers=CHECK_RUN_WORKERS) as executor:
+                # Consume the results to raise the first error
+                list(executor.map(append, batches[1:]))
+        except Forbidden as exc:
+            log.error(
+                'Insufficient permissions to create a check run on pull request #%d. The token needs the "checks: write" permission.',
+                self.pr_number,
+            )
+            raise CannotPostCheckRun from exc
+        except ApiError as exc:
+            log.error(
+                'Error occurred while creating the check run on pull request #%d. Details: %s',
+                self.pr_number,
+                str(exc),
+            )
+            raise CannotPostCheckRun from exc
 
 
 class GithubDiffParser:
@@ -1,17 +1,22 @@
+import time
+from collections.abc import Callable
 from typing import Any
 
 import httpx
 
+from codecov.deadline import Deadline
 from codecov.exceptions import (
     ApiError,
     ConfigurationException,
     Conflict,
+    DeadlineExceeded,
     Forbidden,
     NotFound,
     Unauthorized,
     ValidationFailed,
 )
 from codecov.log import log
+from codecov.metrics import RequestRecord
 
 TIMEOUT = 60
 BASE_URL = 'https://api.github.com'
@@ -31,31 +36,37 @@ class JsonObject(dict):
 
 
 class _Executable:
-    def __init__(self, _gh: 'GitHubClient', _method: str, _path: str):
+    def __init__(self, _gh: 'GitHubClient', _method: str, _path: str, _endpoint: str | None = None):
         self._gh = _gh
         self._method = _method
         self._path = _path
+        self._endpoint = _endpoint
 
     def __call__(self, **kw):
-        return self._gh._http(self._method, self._path, **kw)
+        return self._gh._http(self._method, self._path, endpoint=self._endpoint, **kw)
 
 
 class _Callable:
-    def __init__(self, _gh, _name):
+    def __init__(self, _gh, _name, _endpoint: str | None = None):
         self._gh = _gh
         self._name = _name
+        # The same path with every argument replaced by a placeholder named after the
+        # segment it follows: repos('a/b').pulls(1) is /repos/{repo}/pulls/{pull}
+        self._endpoint = _endpoint or _name
 
     def __call__(self, *args):
         if len(args) == 0:
             return self
         name = f'{self._name}/{"/".join([str(arg) for arg in args])}'
-        return _Callable(self._gh, name)
+        placeholder = '{' + self._endpoint.rsplit('/', maxsplit=1)[-1].removesuffix('s') + '}'
+        endpoint = f'{self._endpoint}/{"/".join([placeholder] * len(args))}'
+        return _Callable(self._gh, name, endpoint)
 
     def __getattr__(self, attr):
         if attr in ['get', 'put', 'post', 'patch', 'delete']:
-            return _Executable(self._gh, attr, self._name)
+            return _Executable(self._gh, attr, self._name, self._endpoint)
         name = f'{self._name}/{attr}'
-        return _Callable(self._gh, name)
+        return _Callable(self._gh, name, f'{self._endpoint}/{attr}')
 
 
 def _response_contents(response: httpx.Response) -> JsonObject | bytes:
@@ -65,11 +76,24 @@ def _response_contents(response: httpx.Response) -> JsonObject | bytes:
 
 
 class GitHubClient:
-    def __init__(self, token: str, url: str = BASE_URL, follow_redirects: bool = True):
+    def __init__(
+        self,
+        token: str,
+        url: str = BASE_URL,
+        follow_redirects: bool = True,
+        deadline: Deadline | None = None,
+        transport: httpx.BaseTransport | None = None,
+        session: httpx.Client | None = None,
+    ):
         self.token = token
         self.url = url
         self.follow_redirects = follow_redirects
-        self.session = self._init_session()
+        self.deadline = deadline or Deadline()
+        self.transport = transport
+        # Called with a RequestRecord after every request that got a response
+        self.hooks: list[Callable[[RequestRecord], None]] = []
+        # A session, and its connection pool, may be shared by clients with the same url and token
+        self.session = session if session is not None else self._init_session()
 
     def _init_session(self) -> httpx.Client:
         log.debug('Creating GitHub client session.')
@@ -77,6 +101,7 @@ class GitHubClient:
             base_url=self.url,
             follow_redirects=self.follow_redirects,
             headers={'Authorization': f'token {self.token}'},
+            transport=self.transport,
         )
         if not session:
             log.error(
@@ -88,7 +113,16 @@ class GitHubClient:
     def __getattr__(self, attr):
         return _Callable(self, f'/{attr}')
 
-    def _http(self, method: str, path: str, *, use_bytes: bool = False, use_text: bool = False, **kw):
+    def _http(  # pylint: disable=too-many-locals
+        self,
+        method: str,
+        path: str,
+        *,
+        endpoint: str | None = None,
+        use_bytes: bool = False,
+        use_text: bool = False,
+        **kw,
+    ):
         _method = method.lower()
         requests_kwargs: dict[Any, Any] = {}
         headers = kw.pop('headers', {})
@@ -98,13 +132,29 @@ class GitHubClient:
         elif _method in ['post', 'patch', 'put']:
             requests_kwargs = {'json': kw}
 
-        response = self.session.request(
-            _method.upper(),
-            path,
-            timeout=TIMEOUT,
-            headers=headers,
-            **requests_kwargs,
+        # A request never gets more time than what is left of the run
+        self.deadline.check(f'requesting {_method.upper()} {path}')
+        start = time.perf_counter()
+        try:
+            response = self.session.request(
+                _method.upper(),
+                path,
+                timeout=self.deadline.timeout(TIMEOUT),
+                headers=headers,
+                **requests_kwargs,
+            )
+        except httpx.TimeoutException as exc:
+            if self.deadline.expired():
+                log.error('Request %s %s was cancelled, the run is out of time.', _method.upper(), path)
+                raise DeadlineExceeded(f'Deadline exceeded while requesting {_method.upper()} {path}') from exc
+            raise
+        self._run_hooks(
+            method=_method.upper(),
+            endpoint=endpoint or path,
+            response=response,
+            elapsed=time.perf_counter() - start,
         )
+
         contents: str | bytes | JsonObject
         if use_bytes:
             contents = response.content
@@ -131,3 +181,21 @@ class GitHubClient:
             raise exc_cls(str(contents)) from exc
 
         return contents
+
+    def _run_hooks(self, method: str, endpoint: str, response: httpx.Response, elapsed: float) -> None:
+        if not self.hooks:
+            return
+        rate_limit_remaining = response.headers.get('X-RateLimit-Remaining')
+        rate_limit_reset = response.headers.get('X-RateLimit-Reset')
+        record = RequestRecord(
+            method=method,
+            endpoint=endpoint,
+            status_code=response.status_code,
+            elapsed=elapsed,
+            request_bytes=len(response.request.content),
+            response_bytes=len(response.content),
+            rate_limit_remaining=int(rate_limit_remaining) if rate_limit_remaining is not None else None,
+            rate_limit_reset=int(rate_limit_reset) if rate_limit_reset is not None else None,
+        )
+        for hook in self.hooks:
+            hook(record)
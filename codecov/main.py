@@ -1,23 +1,55 @@
+# httpx, Jinja and the coverage handlers are imported where they are used: a configuration
+# error is reported without loading them and an offline run never loads the GitHub client.
+# pylint: disable=import-outside-toplevel
+import functools
 import os
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 
-from codecov import template
-from codecov.config import Config
+from codecov import annotations, shards
+from codecov.config import STDIO_PATH, Config, OutputType
 from codecov.coverage.base import BaseCoverageHandler, DiffCoverage
-from codecov.coverage.jest import JestCoverage
-from codecov.coverage.pytest import PytestCoverage
-from codecov.exceptions import ConfigurationException, CoreProcessingException, MissingMarker, TemplateException
+from codecov.deadline import DEADLINE_EXIT_CODE, Deadline
+from codecov.exceptions import (
+    CommentTooLong,
+    ConfigurationException,
+    CoreBaseException,
+    CoreProcessingException,
+    DeadlineExceeded,
+    MissingMarker,
+    TemplateException,
+)
 from codecov.github import Github, GithubDiffParser
-from codecov.github_client import GitHubClient
 from codecov.log import log, setup as log_setup
+from codecov.metrics import RequestMetrics
+
+if TYPE_CHECKING:
+    import httpx
+    import jinja2
+
+    from codecov.coverage.jest import JestCoverage
+    from codecov.coverage.pytest import PytestCoverage
+    from codecov.github_client import GitHubClient
+    from codecov.report import Report
+    from codecov.writers import MarkdownWriter, ReportWriter
+
+CHECK_RUN_NAME = 'codecov'
 
 
 class Main:
-    def __init__(self):
-        self.config = self._init_config()
+    def __init__(self, config: Config | None = None):
+        self.config = config or self._init_config()
+        self.deadline = Deadline(self.config.COMMENT_DEADLINE_SECONDS)
+        self.metrics = RequestMetrics()
         self._init_log()
-        self.github = self._init_github()
         self.coverage_module = self._init_coverage_module()
-        self.marker: str = template.MARKER
+        self.marker: str = self._init_marker()
+        self.lease: tuple[int, ...] | None = self._init_lease()
+        # A newer run claimed the comment
+        self.superseded = False
         self.comment: str = ''
         self.coverage: PytestCoverage | JestCoverage
         self.diff_coverage: DiffCoverage
@@ -28,8 +60,58 @@ class Main:
     def _init_log(self) -> None:
         log_setup(debug=self.config.DEBUG)
 
+    def _init_marker(self) -> str:
+        from codecov.template import MARKER
+
+        return MARKER
+
+    def _init_lease(self) -> tuple[int, ...] | None:
+        if not self.config.COALESCE_COMMENTS:
+            return None
+        # Runs of the same workflow run, a matrix for instance, are ordered by the time they started
+        return (self.config.GITHUB_RUN_ID or 0, self.config.GITHUB_RUN_ATTEMPT or 0, time.time_ns())
+
+    def _init_transport(self) -> 'httpx.BaseTransport | None':
+        from codecov.replay import RecordingTransport, ReplayTransport
+
+        if self.config.HTTP_REPLAY_PATH:
+            log.info('Replaying GitHub API answers from %s', self.config.HTTP_REPLAY_PATH)
+            return ReplayTransport(path=self.config.HTTP_REPLAY_PATH, latency=self.config.HTTP_REPLAY_LATENCY)
+        if self.config.HTTP_RECORD_PATH:
+            log.info('Recording GitHub API exchanges to %s', self.config.HTTP_RECORD_PATH)
+            return RecordingTransport(path=self.config.HTTP_RECORD_PATH)
+        return None
+
+    @functools.cached_property
+    def github(self) -> Github:
+        """
+        The client only connects when an output or the diff needs GitHub, looking up the
+        user and the pull request as it does.
+        """
+        return self._init_github()
+
+    @property
+    def pr_number(self) -> int | None:
+        return self.config.GITHUB_PR_NUMBER if self.config.offline else self.github.pr_number
+
+    @property
+    def base_ref(self) -> str:
+        # Without the pull request, the links point at the branch being built or the default branch
+        return (self.config.GITHUB_REF or 'HEAD') if self.config.offline else self.github.base_ref
+
+    def _init_github_client(self) -> 'GitHubClient':
+        from codecov.github_client import GitHubClient
+
+        return GitHubClient(
+            token=self.config.GITHUB_TOKEN,
+            url=self.config.GITHUB_API_URL,
+            deadline=self.deadline,
+            transport=self._init_transport(),
+        )
+
     def _init_github(self) -> Github:
-        gh_client = GitHubClient(token=self.config.GITHUB_TOKEN)
+        gh_client = self._init_github_client()
+        gh_client.hooks.append(self.metrics)
         github = Github(
             client=gh_client,
             repository=self.config.GITHUB_REPOSITORY,
@@ -46,13 +128,39 @@ class Main:
             raise CoreProcessingException from e
 
     def run(self):
-        self._process_coverage()
-        self._create_comment()
+        try:
+            self.process_coverage()
+            if OutputType.COMMENT in self.config.OUTPUTS:
+                self._create_comment()
+            if OutputType.CHECK_RUN in self.config.OUTPUTS:
+                self._create_check_run()
+            if OutputType.STEP_SUMMARY in self.config.OUTPUTS:
+                self._write_step_summary()
+            if OutputType.JSON in self.config.OUTPUTS:
+                self._write_json()
+            if OutputType.MARKDOWN in self.config.OUTPUTS:
+                self._write_markdown()
+        finally:
+            self._report_metrics()
+
+    def _report_metrics(self) -> None:
+        self.metrics.log_summary()
+        if self.config.METRICS_PATH:
+            self.metrics.write(self.config.METRICS_PATH)
+            log.info('GitHub API metrics written to %s', self.config.METRICS_PATH)
 
-    def _process_coverage(self):
+    def process_coverage(self):
+        """Parse the coverage report and compute its coverage of the diff."""
         log.info('Processing coverage data')
-        coverage = self._get_coverage()
-        added_lines = GithubDiffParser(diff=self.github.pr_diff).parse()
+        self.deadline.check('processing coverage')
+        # The report is parsed while the pull request and its diff are fetched from GitHub
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='coverage') as executor:
+            coverage_future = executor.submit(self._get_coverage)
+            diff = self._get_diff()
+            self._claim_comment()
+            coverage = coverage_future.result()
+        self.deadline.check('processing coverage')
+        added_lines = GithubDiffParser(diff=diff).parse()
         diff_coverage = self.coverage_module.get_diff_coverage(
             added_lines=added_lines,
             coverage=coverage,
@@ -61,46 +169,129 @@ class Main:
         self.coverage = coverage
         self.diff_coverage = diff_coverage
 
-    def _get_coverage(self) -> PytestCoverage | JestCoverage:
+    def _get_diff(self) -> str:
+        if not self.config.DIFF_PATH:
+            return self.github.pr_diff
+        if self.config.DIFF_PATH == STDIO_PATH:
+            log.info('Reading the diff from the standard input')
+            return sys.stdin.read()
+        log.info('Reading the diff from %s', self.config.DIFF_PATH)
+        try:
+            return self.config.DIFF_PATH.read_text()
+        except OSError as e:
+            log.error('Error reading the diff file %s: %s', self.config.DIFF_PATH, str(e))
+            raise CoreProcessingException from e
+
+    def _get_coverage(self) -> 'PytestCoverage | JestCoverage':
         try:
             return self.coverage_module.get_coverage(config=self.config)
         except ConfigurationException as e:
             log.error('Error parsing the coverage file. Please check the file and try again.')
             raise CoreProcessingException from e
 
+    def _claim_comment(self) -> None:
+        """
+        Claim the comment as soon as the pull request is known, so that the older runs
+        still in flight leave it to this one.
+        """
+        if self.lease is None or OutputType.COMMENT not in self.config.OUTPUTS:
+            return
+        self.superseded = not self.github.claim_comments(marker=self.marker, lease=self.lease)
+
     def _create_comment(self) -> None:
+        if self.superseded:
+            log.info('A newer run posts the report on PR #%s, skipping the comment.', self.github.pr_number)
+            return
         log.info('Generating comment for PR #%s', self.github.pr_number)
-        diff_files_info, diff_count_files = template.select_changed_files(
+        self.deadline.check('rendering the comment')
+        parts = self.fit_comment()
+        self.deadline.check('posting the comment')
+        if self.github.post_comments(contents=parts, marker=self.marker, lease=self.lease):
+            log.info('Comment created on PR.')
+
+    def fit_comment(self) -> list[str]:
+        """
+        The comment lists up to MAX_FILES_IN_COMMENT files with all their groups of missing
+        lines when that fits in MAX_COMMENTS comments. Otherwise the largest number of files
+        that fits without any group of missing lines is searched by bisection, then the
+        largest number of groups of missing lines per file for that many files. Each render
+        is aborted as soon as it goes over the budget.
+        """
+        try:
+            return self._render_comment(max_files=self.config.MAX_FILES_IN_COMMENT)
+        except CommentTooLong:
+            log.warning('The report does not fit in %d comment(s), truncating it.', self.config.MAX_COMMENTS)
+
+        max_files = _bisect_largest(
+            lambda n: self._render_comment(max_files=n, max_line_groups=0),
+            low=1,
+            high=self.config.MAX_FILES_IN_COMMENT,
+        )
+        if max_files is None:
+            log.error(
+                'The report does not fit in %d comment(s) of 65536 characters (GitHub limitation), even with a single file. Increase "MAX_COMMENTS" and try again.',
+                self.config.MAX_COMMENTS,
+            )
+            raise CoreProcessingException
+
+        # Groups of missing lines of a file are at most as many as its missing lines
+        most_missing_lines = max((len(file.missing_lines) for file in self.coverage.files.values()), default=0)
+        max_line_groups = _bisect_largest(
+            lambda n: self._render_comment(max_files=max_files, max_line_groups=n),
+            low=0,
+            high=most_missing_lines,
+        )
+        log.info('Report truncated to %d files and %s groups of missing lines per file.', max_files, max_line_groups)
+        return self._render_comment(max_files=max_files, max_line_groups=max_line_groups)
+
+    @functools.cached_property
+    def report(self) -> 'Report':
+        """View model of the report, computed once for every output."""
+        from codecov.report import build_report
+
+        return build_report(
             coverage=self.coverage,
             diff_coverage=self.diff_coverage,
-            max_files=self.config.MAX_FILES_IN_COMMENT,
             skip_covered_files_in_report=self.config.SKIP_COVERED_FILES_IN_REPORT,
         )
-        remaining_files = self.config.MAX_FILES_IN_COMMENT - diff_count_files
-        coverage_files_info, count_coverage_files = template.select_files(
-            coverage=self.coverage,
-            max_files=remaining_files,  # Truncate the report to MAX_FILES_IN_COMMENT
-            skip_covered_files_in_report=self.config.SKIP_COVERED_FILES_IN_REPORT,
+
+    @functools.cached_property
+    def markdown(self) -> 'MarkdownWriter':
+        from codecov.writers import MarkdownWriter
+
+        return MarkdownWriter(
+            self._get_template(),
+            repo_name=self.config.GITHUB_REPOSITORY,
+            pr_number=self.pr_number,
+            base_ref=self.base_ref,
+            minimum_green=self.config.MINIMUM_GREEN,
+            minimum_orange=self.config.MINIMUM_ORANGE,
+            marker=self.marker,
+            # The tables of a custom template are rendered by the Jinja macros
+            native_tables=self.config.TEMPLATE_PATH is None,
+            reference_links=self.config.REFERENCE_LINKS,
+            branch_coverage=self.config.BRANCH_COVERAGE,
+            complete_project_report=self.config.COMPLETE_PROJECT_REPORT,
+            label=self.config.LABEL,
         )
+
+    def _get_template(self) -> 'str | jinja2.Template':
+        from codecov import template
+
+        # The built-in template is precompiled, a custom one is compiled for this run only
+        if self.config.TEMPLATE_PATH:
+            return self.config.TEMPLATE_PATH.read_text()
+        return template.get_template('comment.md.j2')
+
+    def _render_comment(self, max_files: int, max_line_groups: int | None = None) -> list[str]:
+        """
+        Render the comment split in the parts to post, raising CommentTooLong when it does
+        not fit in MAX_COMMENTS comments.
+        """
         try:
-            comment = template.get_comment_markdown(
-                template.read_template_file('comment.md.j2'),
-                self.coverage,
-                self.diff_coverage,
-                self.config.MINIMUM_GREEN,
-                self.config.MINIMUM_ORANGE,
-                self.config.GITHUB_REPOSITORY,
-                self.github.pr_number,
-                self.github.base_ref,
-                self.marker,
-                branch_coverage=self.config.BRANCH_COVERAGE,
-                complete_project_report=self.config.COMPLETE_PROJECT_REPORT,
-                max_files=self.config.MAX_FILES_IN_COMMENT,
-                files=diff_files_info,
-                count_files=diff_count_files,
-                coverage_files=coverage_files_info,
-                count_coverage_files=count_coverage_files,
-                label=self.config.LABEL,
+            comment = self.markdown.render(
+                self.report.truncate(max_files=max_files, max_line_groups=max_line_groups),
+                max_length=self.config.MAX_COMMENTS * shards.MAX_COMMENT_LENGTH,
             )
         except MissingMarker as e:
             log.error(
@@ -119,5 +310,94 @@ class Main:
             log.error('Failed to generate comment, rendered template is empty.')
             raise CoreProcessingException
 
-        self.github.post_comment(contents=comment, marker=self.marker)
-        log.info('Comment created on PR.')
+        # The first part keeps room for the lease of the run
+        max_length = shards.MAX_COMMENT_LENGTH - (shards.LEASE_LENGTH if self.lease else 0)
+        parts = shards.split_comment(comment, marker=self.marker, max_length=max_length)
+        if len(parts) > self.config.MAX_COMMENTS:
+            raise CommentTooLong(f'The report needs {len(parts)} comments')
+        return parts
+
+    def _write_step_summary(self) -> None:
+        if not self.config.GITHUB_STEP_SUMMARY:
+            log.error('GITHUB_STEP_SUMMARY is not set, the step summary output only works in GitHub Actions.')
+            raise CoreProcessingException
+        from codecov.writers import StepSummaryWriter
+
+        writer = StepSummaryWriter(
+            self.config.GITHUB_STEP_SUMMARY, markdown=self.markdown, max_files=self.config.MAX_FILES_IN_COMMENT
+        )
+        self._write(writer)
+
+    def _write_markdown(self) -> None:
+        if not self.config.MARKDOWN_REPORT_PATH:
+            log.error('MARKDOWN_REPORT_PATH is required by the markdown output.')
+            raise CoreProcessingException
+        from codecov.writers import MarkdownFileWriter
+
+        writer = MarkdownFileWriter(
+            self.config.MARKDOWN_REPORT_PATH, markdown=self.markdown, max_files=self.config.MAX_FILES_IN_COMMENT
+        )
+        self._write(writer)
+
+    def _write_json(self) -> None:
+        if not self.config.JSON_REPORT_PATH:
+            log.error('JSON_REPORT_PATH is required by the json output.')
+            raise CoreProcessingException
+        from codecov.writers import JsonWriter
+
+        self._write(JsonWriter(self.config.JSON_REPORT_PATH))
+
+    def _write(self, writer: 'ReportWriter') -> None:
+        try:
+            writer.write(self.report)
+        except OSError as e:
+            log.error('Error writing the report to %s: %s', writer.path, str(e))
+            raise CoreProcessingException from e
+
+    def _create_check_run(self) -> None:
+        from codecov import template
+
+        log.info('Generating check run annotations for PR #%s', self.github.pr_number)
+        self.deadline.check('posting the check run')
+        check_run_annotations = annotations.get_annotations(coverage=self.coverage, diff_coverage=self.diff_coverage)
+        diff_percent = template.pct(self.diff_coverage.total_percent_covered)
+        self.github.post_check_run(
+            name=CHECK_RUN_NAME,
+            title=f'PR coverage {diff_percent}',
+            summary=(
+                f'Coverage of the pull request: {diff_percent}, coverage of the project: '
+                f'{template.pct(self.coverage.info.percent_covered)}. '
+                f'{len(check_run_annotations)} group{template.pluralize(len(check_run_annotations))} '
+                'of added lines missing coverage.'
+            ),
+            annotations=check_run_annotations,
+        )
+        log.info('Check run created on PR.')
+
+
+def _bisect_largest(render: Callable[[int], object], low: int, high: int) -> int | None:
+    """
+    Largest number between `low` and `high` for which `render` does not raise
+    CommentTooLong, assuming that a larger number never makes the comment shorter.
+    """
+    largest = None
+    while low <= high:
+        middle = (low + high) // 2
+        try:
+            render(middle)
+        except CommentTooLong:
+            high = middle - 1
+        else:
+            largest, low = middle, middle + 1
+    return largest
+
+
+def main() -> None:
+    try:
+        Main().run()
+    except DeadlineExceeded as e:
+        log.error(f'Error: {str(e)}')
+        sys.exit(DEADLINE_EXIT_CODE)
+    except CoreBaseException as e:
+        log.error(f'Error: {str(e)}')
+        sys.exit(1)
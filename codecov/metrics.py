@@ -0,0 +1,115 @@
+import dataclasses
+import json
+import pathlib
+import threading
+from typing import Any
+
+from codecov.log import log
+
+
+@dataclasses.dataclass(frozen=True)
+class RequestRecord:
+    method: str
+    # Path with its parameters replaced by placeholders, e.g. /repos/{repo}/pulls/{pull}
+    endpoint: str
+    status_code: int
+    elapsed: float
+    request_bytes: int
+    response_bytes: int
+    rate_limit_remaining: int | None
+    # Time the rate limit window of the request ends, in seconds since the epoch
+    rate_limit_reset: int | None = None
+
+
+@dataclasses.dataclass
+class EndpointStats:
+    method: str
+    endpoint: str
+    count: int = 0
+    total_elapsed: float = 0.0
+    max_elapsed: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    status_codes: dict[int, int] = dataclasses.field(default_factory=dict)
+
+    def add(self, record: RequestRecord) -> None:
+        self.count += 1
+        self.total_elapsed += record.elapsed
+        self.max_elapsed = max(self.max_elapsed, record.elapsed)
+        self.request_bytes += record.request_bytes
+        self.response_bytes += record.response_bytes
+        self.status_codes[record.status_code] = self.status_codes.get(record.status_code, 0) + 1
+
+
+class RequestMetrics:
+    """
+    Request hook of `GitHubClient` aggregating every request of a run per endpoint,
+    so that slow endpoints and repeated requests stand out in the summary.
+    """
+
+    def __init__(self):
+        self.records: list[RequestRecord] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, record: RequestRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def endpoints(self) -> list[EndpointStats]:
+        stats: dict[tuple[str, str], EndpointStats] = {}
+        for record in self.records:
+            key = (record.method, record.endpoint)
+            stats.setdefault(key, EndpointStats(method=record.method, endpoint=record.endpoint)).add(record)
+        return list(stats.values())
+
+    def rate_limit_used(self) -> int | None:
+        """Calls used in every rate limit window the run spanned, the remaining calls start over in a new one."""
+        windows: dict[int | None, list[int]] = {}
+        for record in self.records:
+            if record.rate_limit_remaining is not None:
+                windows.setdefault(record.rate_limit_reset, []).append(record.rate_limit_remaining)
+        if not windows:
+            return None
+        # The first request of a window already consumed one call out of what was remaining before it,
+        # and the answers of concurrent requests may arrive in any order
+        return sum(max(remaining) - min(remaining) + 1 for remaining in windows.values())
+
+    def summary(self) -> dict[str, Any]:
+        remaining = [r.rate_limit_remaining for r in self.records if r.rate_limit_remaining is not None]
+        return {
+            'requests': len(self.records),
+            'total_elapsed': sum(r.elapsed for r in self.records),
+            'request_bytes': sum(r.request_bytes for r in self.records),
+            'response_bytes': sum(r.response_bytes for r in self.records),
+            'rate_limit_used': self.rate_limit_used(),
+            'rate_limit_remaining': remaining[-1] if remaining else None,
+            'endpoints': [dataclasses.asdict(stats) for stats in self.endpoints()],
+        }
+
+    def log_summary(self) -> None:
+        summary = self.summary()
+        log.info(
+            'GitHub API: %d requests in %.0f ms, %d B sent, %d B received, rate limit used %s, remaining %s.',
+            summary['requests'],
+            summary['total_elapsed'] * 1000,
+            summary['request_bytes'],
+            summary['response_bytes'],
+            summary['rate_limit_used'],
+            summary['rate_limit_remaining'],
+        )
+        for stats in self.endpoints():
+            log.info(
+                '    %s %s: %d requests, %.0f ms total, %.0f ms max, %d B sent, %d B received, status %s',
+                stats.method,
+                stats.endpoint,
+                stats.count,
+                stats.total_elapsed * 1000,
+                stats.max_elapsed * 1000,
+                stats.request_bytes,
+                stats.response_bytes,
+                ', '.join(f'{code} x{count}' for code, count in sorted(stats.status_codes.items())),
+            )
+
+    def write(self, path: pathlib.Path) -> None:
+        with path.open('w') as metrics_file:
+            json.dump(self.summary(), metrics_file, indent=2)
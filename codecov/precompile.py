@@ -0,0 +1,46 @@
+"""
+Compile the built-in comment templates ahead of time into Python modules shipped in
+the package, so that a fresh install renders the comment without compiling them:
+
+    python -m codecov.precompile
+
+`make build` runs it first. The manifest records the Jinja version and the filters the
+modules were generated with, and a checksum of every template they were generated from.
+"""
+
+import hashlib
+import json
+import pathlib
+
+import jinja2
+
+from codecov import template
+
+
+def get_template_checksums() -> dict[str, str]:
+    loader = jinja2.PackageLoader(template.__package__, 'template_files')
+    return {
+        name: hashlib.sha256(template.read_template_file(name).encode()).hexdigest()
+        for name in loader.list_templates()
+        if name.endswith('.j2')
+    }
+
+
+def compile_templates(target: pathlib.Path = template.PRECOMPILED_PATH) -> None:
+    target.mkdir(parents=True, exist_ok=True)
+    for module in target.glob('tmpl_*.py'):
+        module.unlink()
+
+    env = template.create_environment(precompiled=False)
+    env.compile_templates(str(target), extensions=['j2'], zip=None, ignore_errors=False)
+    manifest = {
+        'jinja2': jinja2.__version__,
+        'filters': template.get_filters_fingerprint(env),
+        'templates': get_template_checksums(),
+    }
+    (target / template.PRECOMPILED_MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+
+
+if __name__ == '__main__':
+    compile_templates()
+    print(f'Templates compiled to {template.PRECOMPILED_PATH}')
@@ -0,0 +1,62 @@
+import re
+from collections.abc import Iterable, Iterator
+
+# Destination, and optional title, of an inline link or image as written by the templates
+INLINE_LINK_RE = re.compile(r'\]\((?P<url>[^\s()]+)(?: "(?P<title>[^"]*)")?\)')
+# Label of a full reference link or image
+REFERENCE_RE = re.compile(r'\]\[(?P<label>\d+)\]')
+DEFINITION_RE = re.compile(r'^\[(?P<label>\d+)\]: ')
+
+
+class ReferenceLinks:
+    """
+    Rewrite the inline links and images of a rendered comment as reference-style ones,
+    `[text][3]` with a single `[3]: url` definition per distinct URL and title. Every
+    cell of a file row links to the same diff and badges repeat across rows, so the
+    definitions block is much shorter than the URLs it replaces.
+
+    Labels are plain numbers: a shorter label made of letters could turn an unrelated
+    `[x]` of a custom template, a task list item for instance, into a link.
+    """
+
+    def __init__(self):
+        self.labels: dict[tuple[str, str | None], str] = {}
+
+    def get_label(self, url: str, title: str | None = None) -> str:
+        return self.labels.setdefault((url, title), str(len(self.labels)))
+
+    def rewrite_line(self, line: str) -> str:
+        return INLINE_LINK_RE.sub(lambda match: f'][{self.get_label(match["url"], match["title"])}]', line)
+
+    def definitions(self) -> str:
+        lines = []
+        for (url, title), label in self.labels.items():
+            title_part = f' "{title}"' if title else ''
+            lines.append(f'[{label}]: {url}{title_part}\n')
+        return ''.join(lines)
+
+    def rewrite(self, chunks: Iterable[str], marker: str) -> Iterator[str]:
+        """
+        Rewrite streamed chunks line by line, since a link never spans lines but may span
+        chunks. The definitions block goes at the end, before the marker when the comment
+        ends with it.
+        """
+        pending: list[str] = []
+        for chunk in chunks:
+            *lines, rest = chunk.split('\n')
+            if lines:
+                lines[0] = ''.join(pending) + lines[0]
+                pending = []
+                yield ''.join(self.rewrite_line(line) + '\n' for line in lines)
+            pending.append(rest)
+
+        last_line = ''.join(pending)
+        ends_with_marker = last_line.endswith(marker)
+        if ends_with_marker:
+            last_line = last_line[: -len(marker)]
+        yield self.rewrite_line(last_line)
+        if self.labels:
+            # A definition cannot interrupt a paragraph
+            yield '\n\n' + self.definitions()
+        if ends_with_marker:
+            yield '\n' + marker if self.labels else marker
@@ -0,0 +1,131 @@
+import dataclasses
+import json
+import pathlib
+import threading
+import time
+from collections import defaultdict, deque
+
+import httpx
+
+from codecov.exceptions import ConfigurationException
+from codecov.log import log
+
+# Set by httpx on the decoded content, they would not describe the recorded body
+SKIPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+@dataclasses.dataclass
+class Interaction:
+    method: str
+    # Path and query only, so a cassette replays against any base URL
+    target: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: str
+    elapsed: float
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Interaction':
+        return cls(
+            method=data['method'],
+            target=data['target'],
+            status_code=data['status_code'],
+            headers=[(key, value) for key, value in data['headers']],
+            content=data['content'],
+            elapsed=data['elapsed'],
+        )
+
+
+def _request_target(request: httpx.Request) -> str:
+    return request.url.raw_path.decode('ascii')
+
+
+def load_cassette(path: pathlib.Path) -> list[Interaction]:
+    """Interactions of a cassette, one JSON object per line."""
+    try:
+        with path.open() as cassette:
+            return [Interaction.from_dict(json.loads(line)) for line in cassette if line.strip()]
+    except FileNotFoundError as exc:
+        log.error('HTTP cassette not found at the specified location: %s', path)
+        raise ConfigurationException from exc
+    except (json.JSONDecodeError, KeyError, TypeError) as exc:
+        log.error('Invalid HTTP cassette: %s', path)
+        raise ConfigurationException from exc
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """
+    Forwards requests to the network and appends every exchange to a cassette file, as a
+    JSON line, so that a failed run still leaves the exchanges it made behind.
+    Request headers are not recorded, so the token never ends up in the cassette.
+    """
+
+    def __init__(self, path: pathlib.Path, transport: httpx.BaseTransport | None = None):
+        self.path = path
+        self.transport = transport or httpx.HTTPTransport()
+        self._lock = threading.Lock()
+        # The first exchange replaces a cassette left by an earlier recording
+        self._recorded = False
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = self.transport.handle_request(request)
+        try:
+            content = response.read()
+        finally:
+            response.close()
+        interaction = Interaction(
+            method=request.method,
+            target=_request_target(request),
+            status_code=response.status_code,
+            headers=[(key, value) for key, value in response.headers.items() if key.lower() not in SKIPPED_HEADERS],
+            content=content.decode('utf-8'),
+            elapsed=time.perf_counter() - start,
+        )
+        line = json.dumps(dataclasses.asdict(interaction)) + '\n'
+        with self._lock, self.path.open('a' if self._recorded else 'w') as cassette:
+            cassette.write(line)
+            self._recorded = True
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=interaction.headers,
+            content=content,
+            request=request,
+        )
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """
+    Answers requests from a cassette written by `RecordingTransport`, without any network.
+    Requests are matched on method, path and query, in the order they were recorded.
+    With `latency`, each answer waits as long as the recorded request took.
+    """
+
+    def __init__(self, path: pathlib.Path, latency: bool = False):
+        self.path = path
+        self.latency = latency
+        self.interactions: dict[tuple[str, str], deque[Interaction]] = defaultdict(deque)
+        for interaction in load_cassette(path):
+            self.interactions[(interaction.method, interaction.target)].append(interaction)
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = (request.method, _request_target(request))
+        with self._lock:
+            recorded = self.interactions.get(key)
+            if not recorded:
+                log.error('No recorded answer left in %s for %s %s', self.path, *key)
+                raise ConfigurationException(f'No recorded answer for {key[0]} {key[1]}')
+            interaction = recorded.popleft()
+
+        if self.latency:
+            time.sleep(interaction.elapsed)
+        return httpx.Response(
+            status_code=interaction.status_code,
+            headers=interaction.headers,
+            content=interaction.content.encode('utf-8'),
+            request=request,
+        )
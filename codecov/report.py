@@ -0,0 +1,119 @@
+import dataclasses
+import pathlib
+from typing import Any
+
+from codecov import diff_grouper, groups, template
+from codecov.coverage.base import DiffCoverage
+from codecov.coverage.jest import JestCoverage
+from codecov.coverage.pytest import PytestCoverage
+
+
+@dataclasses.dataclass(kw_only=True)
+class Report:
+    """
+    View model of a coverage report: the files of the pull request table and of the whole
+    project table, and their groups of missing lines. It is computed once from the coverage
+    and rendered by every writer, a truncated copy only slices it.
+    """
+
+    coverage: PytestCoverage | JestCoverage
+    diff_coverage: DiffCoverage
+    files: list[template.FileInfo]
+    count_files: int
+    coverage_files: list[template.FileInfo]
+    count_coverage_files: int
+    missing_diff_lines: dict[pathlib.Path, list[groups.Group]]
+    missing_lines_for_whole_project: dict[pathlib.Path, list[groups.Group]]
+    max_files: int | None = None
+    max_line_groups: int | None = None
+    diff_line_groups_truncated: bool = False
+    project_line_groups_truncated: bool = False
+
+    def truncate(self, max_files: int | None, max_line_groups: int | None = None) -> 'Report':
+        """
+        Keep the `max_files` files with the most new missing lines, the files of the pull
+        request first, and at most `max_line_groups` groups of missing lines per file. Each
+        table records whether one of its files actually lost groups, for the notice of the comment.
+        """
+        # Sorted back in the order of the coverage report, which breaks the ties between files
+        order = {path: index for index, path in enumerate(self.coverage.files)}
+        files = template.sort_and_trucate_files(
+            files=sorted(self.files, key=lambda file: order[file.path]), max_files=max_files
+        )
+        coverage_files = template.sort_and_trucate_files(
+            files=sorted(self.coverage_files, key=lambda file: order[file.path]),
+            # Not negative when the files of the pull request already fill `max_files`
+            max_files=None if max_files is None else max(max_files - self.count_files, 0),
+        )
+        missing_diff_lines = self.missing_diff_lines
+        missing_lines_for_whole_project = self.missing_lines_for_whole_project
+        diff_line_groups_truncated = project_line_groups_truncated = False
+        if max_line_groups is not None:
+            diff_line_groups_truncated = template.groups_truncated(missing_diff_lines, max_line_groups, files)
+            project_line_groups_truncated = template.groups_truncated(
+                missing_lines_for_whole_project, max_line_groups, coverage_files
+            )
+            missing_diff_lines = template.truncate_groups(missing_diff_lines, max_line_groups)
+            missing_lines_for_whole_project = template.truncate_groups(missing_lines_for_whole_project, max_line_groups)
+        return dataclasses.replace(
+            self,
+            files=files,
+            coverage_files=coverage_files,
+            missing_diff_lines=missing_diff_lines,
+            missing_lines_for_whole_project=missing_lines_for_whole_project,
+            max_files=max_files,
+            max_line_groups=max_line_groups,
+            diff_line_groups_truncated=diff_line_groups_truncated,
+            project_line_groups_truncated=project_line_groups_truncated,
+        )
+
+    def get_template_context(self) -> dict[str, Any]:
+        return {
+            'files': self.files,
+            'count_files': self.count_files,
+            'coverage_files': self.coverage_files,
+            'count_coverage_files': self.count_coverage_files,
+            'missing_diff_lines': self.missing_diff_lines,
+            'missing_lines_for_whole_project': self.missing_lines_for_whole_project,
+            'max_files': self.max_files,
+            'max_line_groups': self.max_line_groups,
+            'diff_line_groups_truncated': self.diff_line_groups_truncated,
+            'project_line_groups_truncated': self.project_line_groups_truncated,
+        }
+
+
+def build_report(
+    coverage: PytestCoverage | JestCoverage,
+    diff_coverage: DiffCoverage,
+    skip_covered_files_in_report: bool,
+    missing_diff_lines: dict[pathlib.Path, list[groups.Group]] | None = None,
+    missing_lines_for_whole_project: dict[pathlib.Path, list[groups.Group]] | None = None,
+) -> Report:
+    """The groups of missing lines are computed unless given, by the watch mode for instance."""
+    if missing_diff_lines is None:
+        missing_diff_lines = template.group_by_file(
+            diff_grouper.get_diff_missing_groups(coverage=coverage, diff_coverage=diff_coverage)
+        )
+    if missing_lines_for_whole_project is None:
+        missing_lines_for_whole_project = template.group_by_file(diff_grouper.get_missing_groups(coverage=coverage))
+    files, count_files = template.select_changed_files(
+        coverage=coverage,
+        diff_coverage=diff_coverage,
+        max_files=None,
+        skip_covered_files_in_report=skip_covered_files_in_report,
+    )
+    coverage_files, count_coverage_files = template.select_files(
+        coverage=coverage,
+        max_files=None,
+        skip_covered_files_in_report=skip_covered_files_in_report,
+    )
+    return Report(
+        coverage=coverage,
+        diff_coverage=diff_coverage,
+        files=files,
+        count_files=count_files,
+        coverage_files=coverage_files,
+        count_coverage_files=count_coverage_files,
+        missing_diff_lines=missing_diff_lines,
+        missing_lines_for_whole_project=missing_lines_for_whole_project,
+    )
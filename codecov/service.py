@@ -0,0 +1,384 @@
+"""
+Long-running service running `codecov` for the coverage reports CI uploads over HTTP. A
+pool of workers runs the jobs from a bounded queue and keeps warm what a single run would
+set up again: the modules and compiled templates, the HTTP sessions and the parsed reports.
+
+    SERVICE_TOKEN=<secret> SERVICE_REPOSITORIES=org/repo codecov-service --port 8080 --workers 4
+
+    curl --header "Authorization: Bearer <secret>" --data-binary @coverage.json \\
+        'http://localhost:8080/jobs?GITHUB_REPOSITORY=org/repo&GITHUB_PR_NUMBER=12'
+
+The body of `POST /jobs` is the coverage report, the query string holds the environment
+variables of the job among JOB_VARIABLES, the environment of the service holds the rest,
+`GITHUB_TOKEN` for instance. `GET /jobs/<id>` tells the status of a job, `GET /stats` the
+throughput and latency of the service.
+
+Every request carries the `SERVICE_TOKEN` of the service as a bearer token, and a job only
+posts on the repositories of `SERVICE_REPOSITORIES`, comma separated, or on the
+`GITHUB_REPOSITORY` of the service.
+"""
+
+import argparse
+import collections
+import dataclasses
+import hashlib
+import hmac
+import http.server
+import json
+import os
+import pathlib
+import queue
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import uuid
+from collections.abc import Collection, Mapping
+from typing import Any
+
+from codecov.batch import Batch
+from codecov.config import Config, str_to_bool
+from codecov.exceptions import ConfigurationException, QueueFull, RepositoryNotAllowed
+from codecov.log import log, setup as log_setup
+
+# Environment variables a job may set, the others, paths of the host or the token, come from the service
+JOB_VARIABLES = frozenset(
+    {
+        'GITHUB_REPOSITORY',
+        'GITHUB_PR_NUMBER',
+        'GITHUB_REF',
+        'TEST_FRAMEWORK',
+        'MINIMUM_GREEN',
+        'MINIMUM_ORANGE',
+        'BRANCH_COVERAGE',
+        'MAX_FILES_IN_COMMENT',
+        'MAX_COMMENTS',
+        'REFERENCE_LINKS',
+        'SKIP_COVERED_FILES_IN_REPORT',
+        'COMPLETE_PROJECT_REPORT',
+        'LABEL',
+        'OUTPUTS',
+    }
+)
+WORKERS = 4
+QUEUE_SIZE = 100
+# Parsed reports kept in memory between jobs
+MAX_REPORTS = 16
+# Finished jobs whose status can still be looked up, and whose latency counts in the stats
+MAX_FINISHED_JOBS = 1000
+# Largest uploaded report, in bytes
+MAX_UPLOAD_SIZE = 64 * 1024 * 1024
+
+
+@dataclasses.dataclass
+class Job:
+    id: str
+    config: Config
+    # Name of the uploaded report in the spool directory
+    report: str
+    status: str = 'queued'
+    error: str | None = None
+    queued_at: float = dataclasses.field(default_factory=time.monotonic)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    def as_json(self) -> dict[str, Any]:
+        started_at, finished_at = self.started_at, self.finished_at
+        return {
+            'id': self.id,
+            'repository': self.config.GITHUB_REPOSITORY,
+            'pr_number': self.config.GITHUB_PR_NUMBER,
+            'status': self.status,
+            'error': self.error,
+            'wait': None if started_at is None else started_at - self.queued_at,
+            'elapsed': None if started_at is None or finished_at is None else finished_at - started_at,
+        }
+
+
+class Service:
+    """
+    Queue and run the uploaded jobs. An uploaded report is stored in the spool directory
+    under the hash of its contents while a job needs it, so a report uploaded for several
+    pull requests is written once and parsed once.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        environ: Mapping[str, str],
+        token: str,
+        repositories: Collection[str] = (),
+        workers: int = WORKERS,
+        queue_size: int = QUEUE_SIZE,
+        max_reports: int = MAX_REPORTS,
+        max_upload_size: int = MAX_UPLOAD_SIZE,
+    ):
+        self.environ = environ
+        self.token = token
+        # Repositories the jobs may post on, the one of the service besides
+        self.repositories = frozenset(repositories) | (
+            {environ['GITHUB_REPOSITORY']} if environ.get('GITHUB_REPOSITORY') else set()
+        )
+        self.max_upload_size = max_upload_size
+        self.workers = workers
+        self.batch = Batch(max_reports=max_reports)
+        self.queue: queue.Queue[Job | None] = queue.Queue(maxsize=queue_size)
+        self.jobs: dict[str, Job] = {}
+        self.finished: collections.deque[Job] = collections.deque(maxlen=MAX_FINISHED_JOBS)
+        self.counts: collections.Counter[str] = collections.Counter()
+        self.lock = threading.Lock()
+        # Jobs queued or running per uploaded report, the report is deleted when none is left
+        self.report_users: collections.Counter[str] = collections.Counter()
+        self.spool = tempfile.TemporaryDirectory(prefix='codecov-service-')
+        self.spool_path = pathlib.Path(self.spool.name)
+        self.started_at = time.monotonic()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> 'Service':
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'worker-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        """Run the jobs already queued, then stop the workers."""
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.batch.close()
+        self.spool.cleanup()
+
+    def submit(self, report: bytes, variables: Mapping[str, str]) -> Job:
+        forbidden = set(variables) - JOB_VARIABLES
+        if forbidden:
+            message = f'Variables not allowed in a job: {", ".join(sorted(forbidden))}'
+            log.error(message)
+            raise ConfigurationException(message)
+        repository = variables.get('GITHUB_REPOSITORY', self.environ.get('GITHUB_REPOSITORY'))
+        if repository is not None and repository not in self.repositories:
+            log.error('Job on repository %s refused, not in SERVICE_REPOSITORIES', repository)
+            raise RepositoryNotAllowed(f'Repository not allowed: {repository}')
+        name = hashlib.sha256(report).hexdigest() + '.json'
+        path = self.spool_path / name
+        with self.lock:
+            if not self.report_users[name]:
+                path.write_bytes(report)
+            self.report_users[name] += 1
+        try:
+            config = Config.from_environ(environ={**self.environ, **variables, 'COVERAGE_PATH': str(path)})
+            job = Job(id=uuid.uuid4().hex, config=config, report=name)
+            with self.lock:
+                self.queue.put_nowait(job)
+                self.jobs[job.id] = job
+        except (ValueError, ConfigurationException) as e:
+            self._release(name)
+            log.error('Invalid job: %s', str(e))
+            raise ConfigurationException(str(e)) from e
+        except queue.Full as e:
+            self._release(name)
+            raise QueueFull(f'{self.queue.maxsize} jobs are already queued') from e
+        log.info('Job %s queued for %s#%s', job.id, config.GITHUB_REPOSITORY, config.GITHUB_PR_NUMBER)
+        return job
+
+    def _release(self, name: str) -> None:
+        with self.lock:
+            self.report_users[name] -= 1
+            if not self.report_users[name]:
+                del self.report_users[name]
+                (self.spool_path / name).unlink()
+
+    def _work(self) -> None:
+        while (job := self.queue.get()) is not None:
+            job.status, job.started_at = 'running', time.monotonic()
+            try:
+                job.error = self.batch.run_job(job.config).error
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # Whatever goes wrong, the worker lives on to run the next jobs
+                log.exception('Job %s failed', job.id)
+                job.error = str(e) or type(e).__name__
+            finally:
+                job.status, job.finished_at = ('failed' if job.error else 'done'), time.monotonic()
+                self._release(job.report)
+                with self.lock:
+                    if len(self.finished) == self.finished.maxlen:
+                        self.jobs.pop(self.finished[0].id, None)
+                    self.finished.append(job)
+                    self.counts[job.status] += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Jobs per status, finished jobs per second and latency of the last finished jobs, in seconds."""
+        with self.lock:
+            statuses = collections.Counter(job.status for job in self.jobs.values())
+            counts = self.counts.copy()
+            finished = list(self.finished)
+        uptime = time.monotonic() - self.started_at
+        return {
+            'uptime': uptime,
+            'queued': statuses['queued'],
+            'running': statuses['running'],
+            'done': counts['done'],
+            'failed': counts['failed'],
+            'throughput': (counts['done'] + counts['failed']) / uptime,
+            'wait': _latency([job.started_at - job.queued_at for job in finished if job.started_at is not None]),
+            'elapsed': _latency(
+                [
+                    job.finished_at - job.started_at
+                    for job in finished
+                    if job.finished_at is not None and job.started_at is not None
+                ]
+            ),
+        }
+
+
+def _latency(durations: list[float]) -> dict[str, float | None]:
+    if not durations:
+        return {'median': None, 'p95': None, 'max': None}
+    ordered = sorted(durations)
+    return {
+        'median': statistics.median(ordered),
+        'p95': ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)],
+        'max': ordered[-1],
+    }
+
+
+class ServiceServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address, service: Service):
+        super().__init__(server_address, ServiceHandler)
+        self.service = service
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host!s}:{port}'
+
+
+class ServiceHandler(http.server.BaseHTTPRequestHandler):
+    server: ServiceServer
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    JOB_RE = re.compile(r'^/jobs/(?P<job_id>[0-9a-f]+)$')
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        log.debug('Service: ' + format, *args)
+
+    def _authorize(self) -> bool:
+        """Answer 401 unless the request carries the token of the service."""
+        scheme, _, token = self.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() == 'bearer' and hmac.compare_digest(token.encode(), self.server.service.token.encode()):
+            return True
+        # The body, if any, is left unread: the connection can't serve another request
+        self.close_connection = True
+        self._send_json({'message': 'Unauthorized'}, status=401, headers={'WWW-Authenticate': 'Bearer'})
+        return False
+
+    def _read_body(self) -> bytes | None:
+        """The body of the request, None once an error has been answered."""
+        length = self.headers.get('Content-Length')
+        status, message = None, ''
+        if length is None:
+            status, message = 411, 'Content-Length required'
+        elif not length.isdigit():
+            status, message = 400, 'Invalid Content-Length'
+        elif int(length) > self.server.service.max_upload_size:
+            status, message = 413, f'Report larger than {self.server.service.max_upload_size} bytes'
+        if status is not None:
+            self.close_connection = True
+            self._send_json({'message': message}, status=status)
+            return None
+        return self.rfile.read(int(length or 0))
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        if not self._authorize():
+            return
+        path = urllib.parse.urlsplit(self.path).path
+        service = self.server.service
+        if path == '/stats':
+            self._send_json(service.stats())
+            return
+        match = self.JOB_RE.match(path)
+        job = service.jobs.get(match['job_id']) if match else None
+        if job is None:
+            self._send_json({'message': 'Not Found'}, status=404)
+            return
+        self._send_json(job.as_json())
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        if not self._authorize():
+            return
+        url = urllib.parse.urlsplit(self.path)
+        report = self._read_body()
+        if report is None:
+            return
+        if url.path != '/jobs':
+            self._send_json({'message': 'Not Found'}, status=404)
+            return
+        try:
+            job = self.server.service.submit(report, variables=dict(urllib.parse.parse_qsl(url.query)))
+        except RepositoryNotAllowed as e:
+            self._send_json({'message': str(e)}, status=403)
+            return
+        except ConfigurationException as e:
+            self._send_json({'message': str(e) or 'Invalid job'}, status=400)
+            return
+        except QueueFull as e:
+            self._send_json({'message': str(e)}, status=503, headers={'Retry-After': '1'})
+            return
+        self._send_json(job.as_json(), status=202, headers={'Location': f'/jobs/{job.id}'})
+
+    def _send_json(self, data: Any, status: int = 200, headers: dict[str, str] | None = None) -> None:
+        content = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=WORKERS, help='jobs run concurrently')
+    parser.add_argument('--queue-size', type=int, default=QUEUE_SIZE, help='jobs waiting for a worker')
+    parser.add_argument('--max-upload-size', type=int, default=MAX_UPLOAD_SIZE, help='largest report, in bytes')
+    args = parser.parse_args()
+
+    log_setup(debug=str_to_bool(os.environ.get('DEBUG', '')))
+    token = os.environ.get('SERVICE_TOKEN')
+    if not token:
+        log.error('SERVICE_TOKEN is required, the clients send it as a bearer token.')
+        sys.exit(1)
+    repositories = [repository.strip() for repository in os.environ.get('SERVICE_REPOSITORIES', '').split(',')]
+    service = Service(
+        environ=os.environ,
+        token=token,
+        repositories=[repository for repository in repositories if repository],
+        workers=args.workers,
+        queue_size=args.queue_size,
+        max_upload_size=args.max_upload_size,
+    ).start()
+    server = ServiceServer((args.host, args.port), service)
+    log.info('Listening on %s with %d workers', server.url, args.workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+import re
+
+from codecov.references import DEFINITION_RE, REFERENCE_RE
+
+# GitHub rejects comment bodies longer than this
+MAX_COMMENT_LENGTH = 65536
+PART_MARKER = '<!-- codecov part {part} -->'
+PART_MARKER_RE = re.compile(r'<!-- codecov part (\d+) -->')
+# Room left in every part for its markers and for closing an open <details> block
+RESERVED_LENGTH = len(PART_MARKER.format(part=999)) + len('\n</details>\n')
+# Run that posted, or is about to post, the report, on the first line of its first part
+LEASE = '<!-- codecov run {lease} -->'
+LEASE_RE = re.compile(r'^<!-- codecov run (?P<lease>\d+(?:\.\d+)*) -->\n')
+# Room left in the first part for the lease of a run
+LEASE_LENGTH = len(LEASE.format(lease='.'.join(['9' * 20] * 3))) + 1
+
+
+def get_part_marker(marker: str, part: int) -> str:
+    """
+    The first part of a report keeps the plain marker, so that a report that fits in
+    a single comment is identified exactly as before reports could be split.
+    """
+    if part == 1:
+        return marker
+    return marker + PART_MARKER.format(part=part)
+
+
+def get_comment_part(body: str, marker: str) -> int | None:
+    if marker not in body:
+        return None
+    match = PART_MARKER_RE.search(body)
+    return int(match.group(1)) if match else 1
+
+
+def get_lease(body: str) -> tuple[int, ...] | None:
+    """
+    Lease of the run that posted the report: the newest run has the largest one,
+    compared as a tuple.
+    """
+    match = LEASE_RE.match(body)
+    return tuple(int(value) for value in match['lease'].split('.')) if match else None
+
+
+def set_lease(body: str, lease: tuple[int, ...]) -> str:
+    return LEASE.format(lease='.'.join(str(value) for value in lease)) + '\n' + LEASE_RE.sub('', body, count=1)
+
+
+def split_comment(comment: str, marker: str, max_length: int = MAX_COMMENT_LENGTH) -> list[str]:
+    """
+    Split a rendered report on line boundaries into parts shorter than `max_length`,
+    each ending with its own numbered marker.
+
+    A part that stops inside a <details> block closes it, and the next part opens it
+    again with the same summary. A part that stops inside a table starts with the
+    header and delimiter rows of that table again, so every part renders on its own.
+    A single line longer than a part is kept whole.
+
+    The definitions of a comment with reference-style links are moved to the parts
+    using them, and count towards the length of each of those parts.
+    """
+    if len(comment) <= max_length:
+        return [comment]
+
+    budget = max_length - len(marker) - RESERVED_LENGTH
+    lines = comment.replace(marker, '').splitlines(keepends=True)
+    definitions = {match['label']: line for line in lines if (match := DEFINITION_RE.match(line))}
+    if definitions:
+        lines = [line for line in lines if not DEFINITION_RE.match(line)]
+        # Blank line before the definitions of every part
+        budget -= 1
+    parts: list[str] = []
+    current: list[str] = []
+    current_length = 0
+    used: set[str] = set()
+    details: str | None = None
+    table_header: list[str] = []
+    table_rows = 0
+
+    def close_part() -> str:
+        part = ''.join(current)
+        if details:
+            part += '\n</details>\n'
+        if used:
+            part = part.rstrip('\n') + '\n\n' + ''.join(definitions[label] for label in sorted(used, key=int))
+        return part
+
+    def new_labels(line: str) -> set[str]:
+        return {label for label in REFERENCE_RE.findall(line) if label in definitions} - used
+
+    for line in lines:
+        labels = new_labels(line)
+        line_length = len(line) + sum(len(definitions[label]) for label in labels)
+        if current and current_length + line_length > budget:
+            parts.append(close_part())
+            current = [details, '\n'] if details else []
+            current.extend(table_header if line.startswith('|') else [])
+            current_length = sum(len(e) for e in current)
+            used = set()
+            labels = new_labels(line)
+            line_length = len(line) + sum(len(definitions[label]) for label in labels)
+        used |= labels
+
+        if line.lstrip().startswith('<details>'):
+            details = line
+        elif line.strip() == '</details>':
+            details = None
+        if not line.startswith('|'):
+            table_header, table_rows = [], 0
+        elif table_rows < 2:
+            table_header.append(line)
+        table_rows += line.startswith('|')
+
+        current.append(line)
+        current_length += line_length
+
+    parts.append(close_part())
+    return [part.rstrip('\n') + '\n' + get_part_marker(marker, index) for index, part in enumerate(parts, start=1)]
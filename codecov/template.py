@@ -3,21 +3,28 @@ import decimal
 import functools
 import hashlib
 import itertools
+import json
 import pathlib
+from collections.abc import Iterable
 from importlib import resources
 from typing import Any
 
 import jinja2
 from jinja2.sandbox import SandboxedEnvironment
 
-from codecov import badge, diff_grouper
+from codecov import badge, diff_grouper, groups, references
 from codecov.coverage.base import DiffCoverage, FileDiffCoverage
-from codecov.coverage.jest import JestCoverage, JestFileCoverage
-from codecov.coverage.pytest import PytestCoverage, PytestFileCoverage
-from codecov.exceptions import MissingMarker, TemplateException
+from codecov.coverage.jest import JestCoverage, JestCoverageInfo, JestFileCoverage
+from codecov.coverage.pytest import PytestCoverage, PytestCoverageInfo, PytestFileCoverage
+from codecov.exceptions import CommentTooLong, MissingMarker, TemplateException
 from codecov.log import log
 
 MARKER = """<!-- This comment was generated by codecov -->"""
+# Built-in templates compiled ahead of time by `python -m codecov.precompile`
+PRECOMPILED_PATH = pathlib.Path(__file__).parent / 'template_files' / 'compiled'
+PRECOMPILED_MANIFEST = 'manifest.json'
+# Distinct diff anchors and badge URLs memoized during a render
+LINKS_CACHE_SIZE = 4096
 
 
 def pluralize(number: int, singular: str = '', plural: str = 's') -> str:
@@ -57,60 +64,201 @@ class FileInfo:
     diff: FileDiffCoverage | None
 
 
+@jinja2.pass_context
+def _file_url(
+    context: jinja2.runtime.Context,
+    filename: pathlib.Path,
+    lines: tuple[int, int] | None = None,
+    base: bool = False,
+) -> str:
+    return context['links'].file_url(filename, lines, base)
+
+
+@jinja2.pass_context
+def _generate_badge(context: jinja2.runtime.Context, label: str, message: str, color: str) -> str:
+    return context['links'].badge_url(label, message, color)
+
+
+@jinja2.pass_context
+def _get_badge_color(context: jinja2.runtime.Context, rate: decimal.Decimal) -> str:
+    return badge.get_badge_color(
+        rate,
+        minimum_green=context['minimum_green'],
+        minimum_orange=context['minimum_orange'],
+    )
+
+
+@jinja2.pass_context
+def _native_coverage_table(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    context: jinja2.runtime.Context,
+    files: list[FileInfo],
+    missing_map: dict[pathlib.Path, list[groups.Group]],
+    totals: PytestCoverageInfo | JestCoverageInfo,
+    diff_totals: DiffCoverage | None,
+    branch_coverage: bool = False,
+    base: bool = False,
+) -> str:
+    renderer = CoverageTable(
+        links=context['links'],
+        minimum_green=context['minimum_green'],
+        minimum_orange=context['minimum_orange'],
+    )
+    return renderer.render(files, missing_map, totals, diff_totals, branch_coverage=branch_coverage, base=base)
+
+
+def get_filters_fingerprint(env: jinja2.Environment) -> str:
+    """
+    Jinja decides when compiling a template whether a filter gets the render context, and
+    a sandboxed environment compiles every call through its checks, so templates compiled
+    by another environment than `env` must not be reused.
+    """
+    filters = sorted(f'{name}:{getattr(func, "jinja_pass_arg", None)}' for name, func in env.filters.items())
+    if env.sandboxed:
+        filters.append('sandboxed')
+    return hashlib.sha256(','.join(filters).encode()).hexdigest()
+
+
+@functools.cache
+def read_precompiled_manifest() -> dict[str, Any]:
+    try:
+        return json.loads((PRECOMPILED_PATH / PRECOMPILED_MANIFEST).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def has_precompiled_templates(env: jinja2.Environment) -> bool:
+    """
+    The precompiled modules are only valid for the Jinja version and the filters they
+    were generated with, the templates are compiled at runtime otherwise.
+    """
+    manifest = read_precompiled_manifest()
+    return manifest.get('jinja2') == jinja2.__version__ and manifest.get('filters') == get_filters_fingerprint(env)
+
+
+def create_environment(
+    bytecode_cache: jinja2.BytecodeCache | None = None,
+    precompiled: bool = True,
+    sandboxed: bool = False,
+) -> jinja2.Environment:
+    """
+    The filters depending on the pull request read it from the render context, so that
+    a single environment, and the templates it compiled, serve every render.
+
+    The built-in templates are ours and render in a regular environment, without the
+    checks of the sandbox on every attribute access and call. A custom template comes
+    from the repository of the pull request and renders in a sandboxed environment.
+    """
+    loader: jinja2.BaseLoader = jinja2.PackageLoader(__package__, 'template_files')
+    env_class = SandboxedEnvironment if sandboxed else jinja2.Environment
+    env = env_class(loader=loader, bytecode_cache=bytecode_cache)
+    env.filters['pct'] = pct
+    env.filters['x100'] = x100
+    env.filters['generate_badge'] = _generate_badge
+    env.filters['pluralize'] = pluralize
+    env.filters['file_url'] = _file_url
+    env.filters['get_badge_color'] = _get_badge_color
+    env.globals['native_coverage_table'] = _native_coverage_table
+    if precompiled and has_precompiled_templates(env):
+        env.loader = jinja2.ChoiceLoader([jinja2.ModuleLoader(PRECOMPILED_PATH), loader])
+    return env
+
+
+@functools.cache
+def get_environment(sandboxed: bool = False) -> jinja2.Environment:
+    env = create_environment(sandboxed=sandboxed)
+    # The compiled templates are kept on disk, so they are only compiled once per install,
+    # and the filters and the sandbox they were compiled with are part of the key
+    env.bytecode_cache = jinja2.FileSystemBytecodeCache(
+        pattern=f'__codecov_{get_filters_fingerprint(env)[:16]}_%s.cache',
+    )
+    return env
+
+
+def get_template(name: str) -> jinja2.Template:
+    return get_environment().get_template(name)
+
+
+def compile_template(source: str) -> jinja2.Template:
+    """Compile a custom template, which runs in the sandbox."""
+    try:
+        return get_environment(sandboxed=True).from_string(source)
+    except jinja2.exceptions.TemplateError as exc:
+        log.error('Template compilation error: %s', str(exc))
+        raise TemplateException from exc
+
+
 def get_comment_markdown(  # pylint: disable=too-many-arguments,too-many-locals,too-many-positional-arguments
-    base_template: str,
+    base_template: str | jinja2.Template,
     coverage: PytestCoverage | JestCoverage,
     diff_coverage: DiffCoverage,
     minimum_green: decimal.Decimal,
     minimum_orange: decimal.Decimal,
     repo_name: str,
-    pr_number: int,
+    pr_number: int | None,
     base_ref: str,
     marker: str,
     /,
+    native_tables: bool = True,
+    max_length: int | None = None,
+    max_line_groups: int | None = None,
+    reference_links: bool = False,
+    missing_diff_lines: dict[pathlib.Path, list[groups.Group]] | None = None,
+    missing_lines_for_whole_project: dict[pathlib.Path, list[groups.Group]] | None = None,
+    diff_line_groups_truncated: bool | None = None,
+    project_line_groups_truncated: bool | None = None,
     **kwargs: Any,
 ):
-    env = SandboxedEnvironment(loader=jinja2.FileSystemLoader('codecov/template_files/'))
-    env.filters['pct'] = pct
-    env.filters['x100'] = x100
-    env.filters['generate_badge'] = badge.get_static_badge_url
-    env.filters['pluralize'] = pluralize
-    env.filters['file_url'] = functools.partial(
-        get_file_url,
-        repo_name=repo_name,
-        pr_number=pr_number,
-        base_ref=base_ref,
-    )
-    env.filters['get_badge_color'] = functools.partial(
-        badge.get_badge_color,
-        minimum_green=minimum_green,
-        minimum_orange=minimum_orange,
-    )
+    """
+    With `native_tables`, the coverage tables of `macros.coverage_table` are rendered by
+    `CoverageTable` instead of the Jinja macros, with exactly the same output.
 
-    missing_diff_lines = {
-        key: list(value)
-        for key, value in itertools.groupby(
-            diff_grouper.get_diff_missing_groups(coverage=coverage, diff_coverage=diff_coverage),
-            lambda x: x.file,
-        )
-    }
+    The comment is streamed, and the render is aborted with CommentTooLong as soon as it
+    goes over `max_length`. `max_line_groups` limits the groups of missing lines listed
+    for each file, the notice of the comment is only shown when the groups of a listed file
+    were actually cut. With `reference_links`, the links and images are written reference-style,
+    see `references.ReferenceLinks`.
 
-    missing_lines_for_whole_project = {
-        key: list(value)
-        for key, value in itertools.groupby(
-            diff_grouper.get_missing_groups(coverage=coverage),
-            lambda x: x.file,
+    The groups of missing lines are computed from the coverage unless they are given,
+    already grouped by file, by a `report.Report`.
+    """
+    if missing_diff_lines is None:
+        missing_diff_lines = group_by_file(
+            diff_grouper.get_diff_missing_groups(coverage=coverage, diff_coverage=diff_coverage)
         )
-    }
+    if missing_lines_for_whole_project is None:
+        missing_lines_for_whole_project = group_by_file(diff_grouper.get_missing_groups(coverage=coverage))
+    if max_line_groups is not None:
+        # Given by a truncated `report.Report`, whose groups are already cut
+        if diff_line_groups_truncated is None:
+            diff_line_groups_truncated = groups_truncated(missing_diff_lines, max_line_groups, kwargs.get('files'))
+        if project_line_groups_truncated is None:
+            project_line_groups_truncated = groups_truncated(
+                missing_lines_for_whole_project, max_line_groups, kwargs.get('coverage_files')
+            )
+        missing_diff_lines = truncate_groups(missing_diff_lines, max_line_groups)
+        missing_lines_for_whole_project = truncate_groups(missing_lines_for_whole_project, max_line_groups)
     try:
-        comment = env.from_string(base_template).render(
+        if isinstance(base_template, str):
+            # A template given as a string is a custom one
+            base_template = compile_template(base_template)
+        chunks = base_template.generate(
             coverage=coverage,
             diff_coverage=diff_coverage,
             missing_diff_lines=missing_diff_lines,
             missing_lines_for_whole_project=missing_lines_for_whole_project,
             marker=marker,
+            links=Links(repo_name=repo_name, pr_number=pr_number, base_ref=base_ref),
+            minimum_green=minimum_green,
+            minimum_orange=minimum_orange,
+            native_tables=native_tables,
+            max_line_groups=max_line_groups,
+            diff_line_groups_truncated=bool(diff_line_groups_truncated),
+            project_line_groups_truncated=bool(project_line_groups_truncated),
             **kwargs,
         )
+        if reference_links:
+            chunks = references.ReferenceLinks().rewrite(chunks, marker)
+        comment = _join_within(chunks, max_length)
     except jinja2.exceptions.TemplateError as exc:
         log.error('Template rendering error: %s', str(exc))
         raise TemplateException from exc
@@ -122,6 +270,40 @@ def get_comment_markdown(  # pylint: disable=too-many-arguments,too-many-locals,
     return comment
 
 
+def group_by_file(missing_groups: Iterable[groups.Group]) -> dict[pathlib.Path, list[groups.Group]]:
+    return {key: list(value) for key, value in itertools.groupby(missing_groups, lambda x: x.file)}
+
+
+def truncate_groups(
+    missing_map: dict[pathlib.Path, list[groups.Group]], max_line_groups: int
+) -> dict[pathlib.Path, list[groups.Group]]:
+    return {key: value[:max_line_groups] for key, value in missing_map.items()}
+
+
+def groups_truncated(
+    missing_map: dict[pathlib.Path, list[groups.Group]],
+    max_line_groups: int,
+    files: Iterable[FileInfo] | None = None,
+) -> bool:
+    """
+    Whether `truncate_groups` cuts the groups of one of the `files`, of any file by default.
+    """
+    paths = missing_map if files is None else [file.path for file in files]
+    return any(len(missing_map.get(path, [])) > max_line_groups for path in paths)
+
+
+def _join_within(chunks: Iterable[str], max_length: int | None) -> str:
+    rendered: list[str] = []
+    length = 0
+    for chunk in chunks:
+        length += len(chunk)
+        if max_length is not None and length > max_length:
+            log.debug('Comment rendering aborted after %d characters, over the %d budget.', length, max_length)
+            raise CommentTooLong
+        rendered.append(chunk)
+    return ''.join(rendered)
+
+
 def select_changed_files(
     coverage: PytestCoverage | JestCoverage,
     diff_coverage: DiffCoverage,
@@ -180,9 +362,8 @@ def select_files(
 
 
 def sort_and_trucate_files(files: list[FileInfo], max_files: int | None) -> list[FileInfo]:
-    files = sorted(files, key=sort_order, reverse=True)
     if max_files is not None:
-        files = files[:max_files]
+        files = sorted(files, key=sort_order, reverse=True)[:max_files]
     return sorted(files, key=lambda x: x.path)
 
 
@@ -204,26 +385,269 @@ def read_template_file(template: str) -> str:
     return (resources.files(__package__) / 'template_files' / template).read_text()
 
 
+def get_diff_anchor(filename: pathlib.Path | str) -> str:
+    return hashlib.sha256(str(filename).encode('utf-8')).hexdigest()
+
+
 def get_file_url(  # pylint: disable=too-many-arguments
     filename: pathlib.Path,
     lines: tuple[int, int] | None = None,
     base: bool = False,
     *,
     repo_name: str,
-    pr_number: int,
+    pr_number: int | None,
     base_ref: str,
+    diff_anchor: str | None = None,
 ) -> str:
-    if base:
+    # Without a pull request, a report rendered from a local diff links to the files of the branch
+    if base or pr_number is None:
         s = f'https://github.com/{repo_name}/blob/{base_ref}/{str(filename)}'
         if lines is not None:
             s += f'#L{lines[0]}-L{lines[1]}'
         return s
 
     # To link to a file in a PR, GitHub uses the link to the file overview combined with a SHA256 hash of the file path
-    s = f'https://github.com/{repo_name}/pull/{pr_number}/files#diff-{hashlib.sha256(str(filename).encode("utf-8")).hexdigest()}'
+    s = f'https://github.com/{repo_name}/pull/{pr_number}/files#diff-{diff_anchor or get_diff_anchor(filename)}'
 
     if lines is not None:
         # R stands for Right side of the diff. Since we generate these links for new code, we only need the right side.
         s += f'R{lines[0]}-R{lines[1]}'
 
     return s
+
+
+class Links:
+    """
+    URL builders of a single render. Every file links to its diff from each cell of its
+    row and most badges repeat the same label, message and color, so the diff anchors
+    and the badge URLs are only computed once per distinct input, up to `maxsize` each.
+    """
+
+    def __init__(self, *, repo_name: str, pr_number: int | None, base_ref: str, maxsize: int = LINKS_CACHE_SIZE):
+        self.repo_name = repo_name
+        self.pr_number = pr_number
+        self.base_ref = base_ref
+        self._diff_anchor = functools.lru_cache(maxsize=maxsize)(get_diff_anchor)
+        self._badge_url = functools.lru_cache(maxsize=maxsize)(badge.get_static_badge_url)
+
+    def file_url(self, filename: pathlib.Path | str, lines: tuple[int, int] | None = None, base: bool = False) -> str:
+        return get_file_url(
+            filename,  # type: ignore[arg-type]
+            lines,
+            base,
+            repo_name=self.repo_name,
+            pr_number=self.pr_number,
+            base_ref=self.base_ref,
+            diff_anchor=None if base or self.pr_number is None else self._diff_anchor(filename),
+        )
+
+    def badge_url(self, label: str, message: str, color: str) -> str:
+        return self._badge_url(label, message, color)
+
+
+class CoverageTable:
+    """
+    Pure Python rendering of `macros.coverage_table`, which builds every row with plain
+    string operations instead of a Jinja filter call per cell. The output is exactly the
+    one of the macros: any change to the macros of the table has to be mirrored here,
+    the golden tests of both renderings catch any difference.
+    """
+
+    def __init__(self, *, links: Links, minimum_green: decimal.Decimal, minimum_orange: decimal.Decimal):
+        self.links = links
+        self.minimum_green = minimum_green
+        self.minimum_orange = minimum_orange
+
+    def badge_color(self, rate: decimal.Decimal) -> str:
+        return badge.get_badge_color(x100(rate), minimum_green=self.minimum_green, minimum_orange=self.minimum_orange)
+
+    def badge(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        path: pathlib.Path | str,
+        label: str,
+        message: str,
+        color: str,
+        base: bool = False,
+        title: str | None = None,
+    ) -> str:
+        title_part = f' "{title}"' if title else ''
+        return (
+            f'[![]({self.links.badge_url(label, message, color)})]({self.links.file_url(path, base=base)}{title_part})'
+        )
+
+    def count_badge(self, path: pathlib.Path | str, count: int | None, base: bool = False) -> str:
+        # Missing lines and missing branches are green when there are none
+        return self.badge(path, '', str(count), 'brightgreen' if count == 0 else 'red', base)
+
+    def coverage_rate_badge(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        path: pathlib.Path | str,
+        percent_covered: decimal.Decimal,
+        percent_covered_display: str,
+        covered_statements_count: int,
+        statements_count: int,
+        base: bool = False,
+    ) -> str:
+        return self.badge(
+            path,
+            f'{percent_covered_display}%',
+            f'({covered_statements_count}/{statements_count})',
+            self.badge_color(percent_covered),
+            base,
+            pct(percent_covered, precision=2),
+        )
+
+    def diff_coverage_rate_badge(
+        self,
+        path: pathlib.Path | str,
+        added_statements_count: int | None,
+        covered_statements_count: int | None,
+        percent_covered: decimal.Decimal | None,
+    ) -> str:
+        if not added_statements_count or percent_covered is None:
+            return self.badge(path, '', 'N/A', 'grey')
+        return self.badge(
+            path,
+            pct(percent_covered, precision=0),
+            f'({covered_statements_count}/{added_statements_count})',
+            self.badge_color(percent_covered),
+            title=pct(percent_covered, precision=2),
+        )
+
+    def missing_lines_links(self, path: pathlib.Path, missing_groups: list[groups.Group], base: bool) -> str:
+        return ', '.join(
+            f'[{group.line_start}{f"-{group.line_end}" if group.line_start != group.line_end else ""}]'
+            f'({self.links.file_url(path, lines=(group.line_start, group.line_end), base=base)})'
+            for group in missing_groups
+        )
+
+    def missing_branches_links(self, path: pathlib.Path, branches: list[list[int]], base: bool) -> str:
+        links = []
+        for source, destination in branches:
+            if destination < 0:
+                links.append(f'[{source} -> exit]({self.links.file_url(path, lines=(source, source), base=base)})')
+                continue
+            lines = (source, destination) if destination > source else (destination, source)
+            links.append(f'[{source} -> {destination}]({self.links.file_url(path, lines=lines, base=base)})')
+        return ', '.join(links)
+
+    @staticmethod
+    def header(branch_coverage: bool, with_diff: bool) -> str:
+        wide, wider = '&emsp;' * 8, '&emsp;' * 13
+        titles = ['File', 'Statements', 'Missing']
+        alignments = [':--', ':-:', ':-:']
+        if branch_coverage:
+            titles += ['Branches', 'Missing']
+            alignments += [':-:', ':-:']
+        titles.append(f'<br>Coverage {wide}')
+        alignments.append(':-:')
+        if with_diff:
+            titles.append(f'Coverage {wide}<br>(new stmts)')
+            alignments.append(':-:')
+        titles.append(f'<br>Missing stmts {wider}')
+        alignments.append(':--')
+        if branch_coverage:
+            titles.append(f'<br>Missing branches {wider}')
+            alignments.append(':--')
+        return f'| {" | ".join(titles)} |\n| {" | ".join(alignments)} |'
+
+    def file_row(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        file: FileInfo,
+        missing_map: dict[pathlib.Path, list[groups.Group]],
+        branch_coverage: bool,
+        base: bool,
+        with_diff: bool,
+    ) -> str:
+        path = file.coverage.path
+        info = file.coverage.info
+        cells = [
+            f'&nbsp;&nbsp;[{path.name}]({self.links.file_url(path, base=base)})',
+            self.badge(path, '', str(info.num_statements), '007ec6', base),
+            self.count_badge(path, info.missing_lines, base),
+        ]
+        if branch_coverage:
+            cells += [
+                self.badge(path, '', str(getattr(info, 'num_branches', '')), '008080', base),
+                self.count_badge(path, getattr(info, 'missing_branches', None), base),
+            ]
+        cells.append(
+            self.coverage_rate_badge(
+                path, info.percent_covered, info.percent_covered_display, info.covered_lines, info.num_statements, base
+            )
+        )
+        if with_diff:
+            cells.append(
+                self.diff_coverage_rate_badge(
+                    path,
+                    len(file.diff.added_statements) if file.diff else None,
+                    len(file.diff.covered_statements) if file.diff else None,
+                    file.diff.percent_covered if file.diff else None,
+                )
+            )
+        cells.append(self.missing_lines_links(path, missing_map.get(path, []), base))
+        if branch_coverage:
+            missing_branches = (
+                file.diff.missing_branches
+                if with_diff and file.diff
+                else getattr(file.coverage, 'missing_branches', None)
+            )
+            cells.append(self.missing_branches_links(path, missing_branches or [], base))
+        return f'| {" | ".join(cells)} |'
+
+    def total_row(
+        self,
+        totals: PytestCoverageInfo | JestCoverageInfo,
+        diff_totals: DiffCoverage | None,
+        branch_coverage: bool,
+    ) -> str:
+        cells = [
+            '**Project Total**',
+            self.badge('whole project', '', str(totals.num_statements), '007ec6'),
+            self.count_badge('the whole project', totals.missing_lines),
+        ]
+        if branch_coverage:
+            cells += [
+                self.badge('the whole project', '', str(getattr(totals, 'num_branches', '')), '008080'),
+                self.count_badge('the whole project', getattr(totals, 'missing_branches', None)),
+            ]
+        cells.append(
+            self.coverage_rate_badge(
+                'the whole project',
+                totals.percent_covered,
+                totals.percent_covered_display,
+                totals.covered_lines,
+                totals.num_statements,
+            )
+        )
+        if diff_totals is not None:
+            cells.append(
+                self.diff_coverage_rate_badge(
+                    'the whole project',
+                    diff_totals.total_num_lines,
+                    diff_totals.total_num_lines - diff_totals.total_num_violations,
+                    diff_totals.total_percent_covered,
+                )
+            )
+        cells += ['&nbsp;', '&nbsp;'] if branch_coverage else ['&nbsp;']
+        return f'| {" | ".join(cells)} |'
+
+    def render(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        files: list[FileInfo],
+        missing_map: dict[pathlib.Path, list[groups.Group]],
+        totals: PytestCoverageInfo | JestCoverageInfo,
+        diff_totals: DiffCoverage | None,
+        branch_coverage: bool = False,
+        base: bool = False,
+    ) -> str:
+        with_diff = diff_totals is not None
+        lines = [self.header(branch_coverage, with_diff)]
+        # Same grouping as the `groupby` filter of Jinja: sorted by folder, stable within a folder
+        for parent, files_in_folder in itertools.groupby(
+            sorted(files, key=lambda f: f.path.parent), lambda f: f.path.parent
+        ):
+            lines.append(f'| &nbsp;&nbsp;**{parent}** |')
+            lines.extend(self.file_row(file, missing_map, branch_coverage, base, with_diff) for file in files_in_folder)
+        lines.append(self.total_row(totals, diff_totals, branch_coverage))
+        return '\n'.join(lines)
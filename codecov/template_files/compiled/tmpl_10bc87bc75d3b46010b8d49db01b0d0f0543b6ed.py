@@ -0,0 +1,36 @@
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'pr.md.j2'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_files = resolve('files')
+    l_0_macros = resolve('macros')
+    l_0_missing_diff_lines = resolve('missing_diff_lines')
+    l_0_coverage = resolve('coverage')
+    l_0_diff_coverage = resolve('diff_coverage')
+    l_0_branch_coverage = resolve('branch_coverage')
+    l_0_max_files = resolve('max_files')
+    l_0_count_files = resolve('count_files')
+    pass
+    if (not (undefined(name='files') if l_0_files is missing else l_0_files)):
+        pass
+        yield '\n\n  _This PR does not include changes to coverable code or code with missing coverage._'
+    else:
+        pass
+        yield '<details><summary>Click to see the coverage of changed files</summary>\n  <br>\n\n'
+        yield str(context.call(environment.getattr((undefined(name='macros') if l_0_macros is missing else l_0_macros), 'coverage_table'), (undefined(name='files') if l_0_files is missing else l_0_files), (undefined(name='missing_diff_lines') if l_0_missing_diff_lines is missing else l_0_missing_diff_lines), environment.getattr((undefined(name='coverage') if l_0_coverage is missing else l_0_coverage), 'info'), (undefined(name='diff_coverage') if l_0_diff_coverage is missing else l_0_diff_coverage), (undefined(name='branch_coverage') if l_0_branch_coverage is missing else l_0_branch_coverage), False))
+        if ((undefined(name='max_files') if l_0_max_files is missing else l_0_max_files) and ((undefined(name='count_files') if l_0_count_files is missing else l_0_count_files) > (undefined(name='max_files') if l_0_max_files is missing else l_0_max_files))):
+            pass
+            yield '\n  _The report is truncated to '
+            yield str((undefined(name='max_files') if l_0_max_files is missing else l_0_max_files))
+            yield ' files out of '
+            yield str((undefined(name='count_files') if l_0_count_files is missing else l_0_count_files))
+            yield '._\n  '
+        yield '\n\n</details>'
+
+blocks = {}
+debug_info = '1=19&8=25&10=26&11=29'
\ No newline at end of file
@@ -0,0 +1,527 @@
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'macros.md.j2'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_badge = l_0_statements_badge = l_0_branches_badge = l_0_missing_branches_badge = l_0_missing_lines_badge = l_0_coverage_rate_badge = l_0_diff_coverage_rate_badge = l_0_missing_lines_links = l_0_missing_branches_links = l_0_table_header = l_0_file_row = l_0_total_row = l_0_coverage_table = missing
+    try:
+        t_1 = environment.filters['file_url']
+    except KeyError:
+        @internalcode
+        def t_1(*unused):
+            raise TemplateRuntimeError("No filter named 'file_url' found.")
+    try:
+        t_2 = environment.filters['generate_badge']
+    except KeyError:
+        @internalcode
+        def t_2(*unused):
+            raise TemplateRuntimeError("No filter named 'generate_badge' found.")
+    try:
+        t_3 = environment.filters['get_badge_color']
+    except KeyError:
+        @internalcode
+        def t_3(*unused):
+            raise TemplateRuntimeError("No filter named 'get_badge_color' found.")
+    try:
+        t_4 = environment.filters['groupby']
+    except KeyError:
+        @internalcode
+        def t_4(*unused):
+            raise TemplateRuntimeError("No filter named 'groupby' found.")
+    try:
+        t_5 = environment.filters['length']
+    except KeyError:
+        @internalcode
+        def t_5(*unused):
+            raise TemplateRuntimeError("No filter named 'length' found.")
+    try:
+        t_6 = environment.filters['pct']
+    except KeyError:
+        @internalcode
+        def t_6(*unused):
+            raise TemplateRuntimeError("No filter named 'pct' found.")
+    try:
+        t_7 = environment.filters['string']
+    except KeyError:
+        @internalcode
+        def t_7(*unused):
+            raise TemplateRuntimeError("No filter named 'string' found.")
+    try:
+        t_8 = environment.filters['x100']
+    except KeyError:
+        @internalcode
+        def t_8(*unused):
+            raise TemplateRuntimeError("No filter named 'x100' found.")
+    try:
+        t_9 = environment.tests['none']
+    except KeyError:
+        @internalcode
+        def t_9(*unused):
+            raise TemplateRuntimeError("No test named 'none' found.")
+    pass
+    def macro(l_1_path, l_1_label, l_1_message, l_1_color, l_1_base, l_1_title):
+        t_10 = []
+        if l_1_path is missing:
+            l_1_path = undefined("parameter 'path' was not provided", name='path')
+        if l_1_label is missing:
+            l_1_label = undefined("parameter 'label' was not provided", name='label')
+        if l_1_message is missing:
+            l_1_message = undefined("parameter 'message' was not provided", name='message')
+        if l_1_color is missing:
+            l_1_color = undefined("parameter 'color' was not provided", name='color')
+        if l_1_base is missing:
+            l_1_base = False
+        if l_1_title is missing:
+            l_1_title = None
+        pass
+        t_10.extend((
+            '[![](',
+            str(t_2(context, l_1_label, message=l_1_message, color=l_1_color)),
+            ')](',
+            str(t_1(context, l_1_path, base=l_1_base)),
+        ))
+        if l_1_title:
+            pass
+            t_10.extend((
+                ' "',
+                str(l_1_title),
+                '"',
+            ))
+        t_10.append(
+            ')',
+        )
+        return concat(t_10)
+    context.exported_vars.add('badge')
+    context.vars['badge'] = l_0_badge = Macro(environment, macro, 'badge', ('path', 'label', 'message', 'color', 'base', 'title'), False, False, False, context.eval_ctx.autoescape)
+    def macro(l_1_path, l_1_statements_count, l_1_base):
+        t_11 = []
+        if l_1_path is missing:
+            l_1_path = undefined("parameter 'path' was not provided", name='path')
+        if l_1_statements_count is missing:
+            l_1_statements_count = undefined("parameter 'statements_count' was not provided", name='statements_count')
+        if l_1_base is missing:
+            l_1_base = False
+        pass
+        t_11.append(
+            str(context.call((undefined(name='badge') if l_0_badge is missing else l_0_badge), l_1_path, '', t_7(l_1_statements_count), '007ec6', l_1_base)),
+        )
+        return concat(t_11)
+    context.exported_vars.add('statements_badge')
+    context.vars['statements_badge'] = l_0_statements_badge = Macro(environment, macro, 'statements_badge', ('path', 'statements_count', 'base'), False, False, False, context.eval_ctx.autoescape)
+    def macro(l_1_path, l_1_branches_count, l_1_base):
+        t_12 = []
+        if l_1_path is missing:
+            l_1_path = undefined("parameter 'path' was not provided", name='path')
+        if l_1_branches_count is missing:
+            l_1_branches_count = undefined("parameter 'branches_count' was not provided", name='branches_count')
+        if l_1_base is missing:
+            l_1_base = False
+        pass
+        t_12.append(
+            str(context.call((undefined(name='badge') if l_0_badge is missing else l_0_badge), l_1_path, '', t_7(l_1_branches_count), '008080', l_1_base)),
+        )
+        return concat(t_12)
+    context.exported_vars.add('branches_badge')
+    context.vars['branches_badge'] = l_0_branches_badge = Macro(environment, macro, 'branches_badge', ('path', 'branches_count', 'base'), False, False, False, context.eval_ctx.autoescape)
+    def macro(l_1_path, l_1_missing_branches_count, l_1_base):
+        t_13 = []
+        if l_1_path is missing:
+            l_1_path = undefined("parameter 'path' was not provided", name='path')
+        if l_1_missing_branches_count is missing:
+            l_1_missing_branches_count = undefined("parameter 'missing_branches_count' was not provided", name='missing_branches_count')
+        if l_1_base is missing:
+            l_1_base = False
+        pass
+        t_13.append(
+            str(context.call((undefined(name='badge') if l_0_badge is missing else l_0_badge), l_1_path, '', t_7(l_1_missing_branches_count), ('brightgreen' if (l_1_missing_branches_count == 0) else 'red'), l_1_base)),
+        )
+        return concat(t_13)
+    context.exported_vars.add('missing_branches_badge')
+    context.vars['missing_branches_badge'] = l_0_missing_branches_badge = Macro(environment, macro, 'missing_branches_badge', ('path', 'missing_branches_count', 'base'), False, False, False, context.eval_ctx.autoescape)
+    def macro(l_1_path, l_1_missing_lines_count, l_1_base):
+        t_14 = []
+        if l_1_path is missing:
+            l_1_path = undefined("parameter 'path' was not provided", name='path')
+        if l_1_missing_lines_count is missing:
+            l_1_missing_lines_count = undefined("parameter 'missing_lines_count' was not provided", name='missing_lines_count')
+        if l_1_base is missing:
+            l_1_base = False
+        pass
+        t_14.append(
+            str(context.call((undefined(name='badge') if l_0_badge is missing else l_0_badge), l_1_path, '', t_7(l_1_missing_lines_count), ('brightgreen' if (l_1_missing_lines_count == 0) else 'red'), l_1_base)),
+        )
+        return concat(t_14)
+    context.exported_vars.add('missing_lines_badge')
+    context.vars['missing_lines_badge'] = l_0_missing_lines_badge = Macro(environment, macro, 'missing_lines_badge', ('path', 'missing_lines_count', 'base'), False, False, False, context.eval_ctx.autoescape)
+    def macro(l_1_path, l_1_percent_covered, l_1_percent_covered_display, l_1_covered_statements_count, l_1_statements_count, l_1_base):
+        t_15 = []
+        l_1_label = l_1_message = l_1_title = missing
+        if l_1_path is missing:
+            l_1_path = undefined("parameter 'path' was not provided", name='path')
+        if l_1_percent_covered is missing:
+            l_1_percent_covered = undefined("parameter 'percent_covered' was not provided", name='percent_covered')
+        if l_1_percent_covered_display is missing:
+            l_1_percent_covered_display = undefined("parameter 'percent_covered_display' was not provided", name='percent_covered_display')
+        if l_1_covered_statements_count is missing:
+            l_1_covered_statements_count = undefined("parameter 'covered_statements_count' was not provided", name='covered_statements_count')
+        if l_1_statements_count is missing:
+            l_1_statements_count = undefined("parameter 'statements_count' was not provided", name='statements_count')
+        if l_1_base is missing:
+            l_1_base = False
+        pass
+        l_1_label = str_join((l_1_percent_covered_display, '%', ))
+        l_1_message = str_join(('(', l_1_covered_statements_count, '/', l_1_statements_count, ')', ))
+        l_1_title = t_6(l_1_percent_covered, precision=2)
+        t_15.append(
+            str(context.call((undefined(name='badge') if l_0_badge is missing else l_0_badge), l_1_path, (undefined(name='label') if l_1_label is missing else l_1_label), (undefined(name='message') if l_1_message is missing else l_1_message), t_3(context, t_8(l_1_percent_covered)), l_1_base, (undefined(name='title') if l_1_title is missing else l_1_title))),
+        )
+        return concat(t_15)
+    context.exported_vars.add('coverage_rate_badge')
+    context.vars['coverage_rate_badge'] = l_0_coverage_rate_badge = Macro(environment, macro, 'coverage_rate_badge', ('path', 'percent_covered', 'percent_covered_display', 'covered_statements_count', 'statements_count', 'base'), False, False, False, context.eval_ctx.autoescape)
+    def macro(l_1_path, l_1_added_statements_count, l_1_covered_statements_count, l_1_percent_covered):
+        t_16 = []
+        l_1_label = resolve('label')
+        l_1_message = resolve('message')
+        l_1_title = resolve('title')
+        if l_1_path is missing:
+            l_1_path = undefined("parameter 'path' was not provided", name='path')
+        if l_1_added_statements_count is missing:
+            l_1_added_statements_count = undefined("parameter 'added_statements_count' was not provided", name='added_statements_count')
+        if l_1_covered_statements_count is missing:
+            l_1_covered_statements_count = undefined("parameter 'covered_statements_count' was not provided", name='covered_statements_count')
+        if l_1_percent_covered is missing:
+            l_1_percent_covered = undefined("parameter 'percent_covered' was not provided", name='percent_covered')
+        pass
+        if l_1_added_statements_count:
+            pass
+            l_1_label = t_6(l_1_percent_covered, precision=0)
+            l_1_message = str_join(('(', l_1_covered_statements_count, '/', l_1_added_statements_count, ')', ))
+            l_1_title = t_6(l_1_percent_covered, precision=2)
+            t_16.append(
+                str(context.call((undefined(name='badge') if l_0_badge is missing else l_0_badge), l_1_path, (undefined(name='label') if l_1_label is missing else l_1_label), (undefined(name='message') if l_1_message is missing else l_1_message), t_3(context, t_8(l_1_percent_covered)), title=(undefined(name='title') if l_1_title is missing else l_1_title))),
+            )
+        else:
+            pass
+            t_16.append(
+                str(context.call((undefined(name='badge') if l_0_badge is missing else l_0_badge), l_1_path, '', 'N/A', 'grey')),
+            )
+        return concat(t_16)
+    context.exported_vars.add('diff_coverage_rate_badge')
+    context.vars['diff_coverage_rate_badge'] = l_0_diff_coverage_rate_badge = Macro(environment, macro, 'diff_coverage_rate_badge', ('path', 'added_statements_count', 'covered_statements_count', 'percent_covered'), False, False, False, context.eval_ctx.autoescape)
+    def macro(l_1_path, l_1_groups, l_1_base):
+        t_17 = []
+        l_1_joiner = resolve('joiner')
+        l_1_comma = missing
+        if l_1_path is missing:
+            l_1_path = undefined("parameter 'path' was not provided", name='path')
+        if l_1_groups is missing:
+            l_1_groups = undefined("parameter 'groups' was not provided", name='groups')
+        if l_1_base is missing:
+            l_1_base = False
+        pass
+        l_1_comma = context.call((undefined(name='joiner') if l_1_joiner is missing else l_1_joiner))
+        for l_2_group in l_1_groups:
+            _loop_vars = {}
+            pass
+            t_17.extend((
+                str(context.call((undefined(name='comma') if l_1_comma is missing else l_1_comma), _loop_vars=_loop_vars)),
+                '[',
+                str(environment.getattr(l_2_group, 'line_start')),
+            ))
+            if (environment.getattr(l_2_group, 'line_start') != environment.getattr(l_2_group, 'line_end')):
+                pass
+                t_17.extend((
+                    '-',
+                    str(environment.getattr(l_2_group, 'line_end')),
+                ))
+            t_17.extend((
+                '](',
+                str(t_1(context, l_1_path, lines=(environment.getattr(l_2_group, 'line_start'), environment.getattr(l_2_group, 'line_end')), base=l_1_base)),
+                ')',
+            ))
+        l_2_group = missing
+        return concat(t_17)
+    context.exported_vars.add('missing_lines_links')
+    context.vars['missing_lines_links'] = l_0_missing_lines_links = Macro(environment, macro, 'missing_lines_links', ('path', 'groups', 'base'), False, False, False, context.eval_ctx.autoescape)
+    def macro(l_1_path, l_1_branches, l_1_base):
+        t_18 = []
+        l_1_joiner = resolve('joiner')
+        l_1_comma = missing
+        if l_1_path is missing:
+            l_1_path = undefined("parameter 'path' was not provided", name='path')
+        if l_1_branches is missing:
+            l_1_branches = undefined("parameter 'branches' was not provided", name='branches')
+        if l_1_base is missing:
+            l_1_base = False
+        pass
+        l_1_comma = context.call((undefined(name='joiner') if l_1_joiner is missing else l_1_joiner))
+        for l_2_branch in l_1_branches:
+            l_2_lines = resolve('lines')
+            l_2_source = l_2_destination = missing
+            _loop_vars = {}
+            pass
+            l_2_source = environment.getitem(l_2_branch, 0)
+            _loop_vars['source'] = l_2_source
+            l_2_destination = environment.getitem(l_2_branch, 1)
+            _loop_vars['destination'] = l_2_destination
+            t_18.append(
+                str(context.call((undefined(name='comma') if l_1_comma is missing else l_1_comma), _loop_vars=_loop_vars)),
+            )
+            if ((undefined(name='destination') if l_2_destination is missing else l_2_destination) < 0):
+                pass
+                t_18.extend((
+                    '[',
+                    str((undefined(name='source') if l_2_source is missing else l_2_source)),
+                    ' -> exit](',
+                    str(t_1(context, l_1_path, lines=((undefined(name='source') if l_2_source is missing else l_2_source), (undefined(name='source') if l_2_source is missing else l_2_source)), base=l_1_base)),
+                    ')',
+                ))
+            else:
+                pass
+                l_2_lines = (((undefined(name='source') if l_2_source is missing else l_2_source), (undefined(name='destination') if l_2_destination is missing else l_2_destination)) if ((undefined(name='destination') if l_2_destination is missing else l_2_destination) > (undefined(name='source') if l_2_source is missing else l_2_source)) else ((undefined(name='destination') if l_2_destination is missing else l_2_destination), (undefined(name='source') if l_2_source is missing else l_2_source)))
+                _loop_vars['lines'] = l_2_lines
+                t_18.extend((
+                    '[',
+                    str((undefined(name='source') if l_2_source is missing else l_2_source)),
+                    ' -> ',
+                    str((undefined(name='destination') if l_2_destination is missing else l_2_destination)),
+                    '](',
+                    str(t_1(context, l_1_path, lines=(undefined(name='lines') if l_2_lines is missing else l_2_lines), base=l_1_base)),
+                    ')',
+                ))
+        l_2_branch = l_2_source = l_2_destination = l_2_lines = missing
+        return concat(t_18)
+    context.exported_vars.add('missing_branches_links')
+    context.vars['missing_branches_links'] = l_0_missing_branches_links = Macro(environment, macro, 'missing_branches_links', ('path', 'branches', 'base'), False, False, False, context.eval_ctx.autoescape)
+    def macro(l_1_branch_coverage, l_1_with_diff):
+        t_19 = []
+        if l_1_branch_coverage is missing:
+            l_1_branch_coverage = undefined("parameter 'branch_coverage' was not provided", name='branch_coverage')
+        if l_1_with_diff is missing:
+            l_1_with_diff = undefined("parameter 'with_diff' was not provided", name='with_diff')
+        pass
+        t_19.append(
+            '| File | Statements | Missing |',
+        )
+        if l_1_branch_coverage:
+            pass
+            t_19.append(
+                ' Branches | Missing |',
+            )
+        t_19.append(
+            ' <br>Coverage &emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp; |',
+        )
+        if l_1_with_diff:
+            pass
+            t_19.append(
+                ' Coverage &emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;<br>(new stmts) |',
+            )
+        t_19.append(
+            ' <br>Missing stmts &emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp; |',
+        )
+        if l_1_branch_coverage:
+            pass
+            t_19.append(
+                ' <br>Missing branches &emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;&emsp; |',
+            )
+        t_19.append(
+            '\n| :-- | :-: | :-: |',
+        )
+        if l_1_branch_coverage:
+            pass
+            t_19.append(
+                ' :-: | :-: |',
+            )
+        t_19.append(
+            ' :-: |',
+        )
+        if l_1_with_diff:
+            pass
+            t_19.append(
+                ' :-: |',
+            )
+        t_19.append(
+            ' :-- |',
+        )
+        if l_1_branch_coverage:
+            pass
+            t_19.append(
+                ' :-- |',
+            )
+        return concat(t_19)
+    context.exported_vars.add('table_header')
+    context.vars['table_header'] = l_0_table_header = Macro(environment, macro, 'table_header', ('branch_coverage', 'with_diff'), False, False, False, context.eval_ctx.autoescape)
+    def macro(l_1_file, l_1_missing_map, l_1_branch_coverage, l_1_base, l_1_with_diff):
+        t_20 = []
+        l_1_path = l_1_info = l_1_missing_branches = missing
+        if l_1_file is missing:
+            l_1_file = undefined("parameter 'file' was not provided", name='file')
+        if l_1_missing_map is missing:
+            l_1_missing_map = undefined("parameter 'missing_map' was not provided", name='missing_map')
+        if l_1_branch_coverage is missing:
+            l_1_branch_coverage = undefined("parameter 'branch_coverage' was not provided", name='branch_coverage')
+        if l_1_base is missing:
+            l_1_base = undefined("parameter 'base' was not provided", name='base')
+        if l_1_with_diff is missing:
+            l_1_with_diff = undefined("parameter 'with_diff' was not provided", name='with_diff')
+        pass
+        l_1_path = environment.getattr(environment.getattr(l_1_file, 'coverage'), 'path')
+        l_1_info = environment.getattr(environment.getattr(l_1_file, 'coverage'), 'info')
+        l_1_missing_branches = ((environment.getattr(environment.getattr(l_1_file, 'diff'), 'missing_branches') if (l_1_with_diff and environment.getattr(l_1_file, 'diff')) else environment.getattr(environment.getattr(l_1_file, 'coverage'), 'missing_branches')) or [])
+        t_20.extend((
+            '| &nbsp;&nbsp;[',
+            str(environment.getattr((undefined(name='path') if l_1_path is missing else l_1_path), 'name')),
+            '](',
+            str(t_1(context, (undefined(name='path') if l_1_path is missing else l_1_path), base=l_1_base)),
+            ') | ',
+            str(context.call((undefined(name='statements_badge') if l_0_statements_badge is missing else l_0_statements_badge), (undefined(name='path') if l_1_path is missing else l_1_path), environment.getattr((undefined(name='info') if l_1_info is missing else l_1_info), 'num_statements'), l_1_base)),
+            ' | ',
+            str(context.call((undefined(name='missing_lines_badge') if l_0_missing_lines_badge is missing else l_0_missing_lines_badge), (undefined(name='path') if l_1_path is missing else l_1_path), environment.getattr((undefined(name='info') if l_1_info is missing else l_1_info), 'missing_lines'), l_1_base)),
+            ' |',
+        ))
+        if l_1_branch_coverage:
+            pass
+            t_20.extend((
+                ' ',
+                str(context.call((undefined(name='branches_badge') if l_0_branches_badge is missing else l_0_branches_badge), (undefined(name='path') if l_1_path is missing else l_1_path), environment.getattr((undefined(name='info') if l_1_info is missing else l_1_info), 'num_branches'), l_1_base)),
+                ' | ',
+                str(context.call((undefined(name='missing_branches_badge') if l_0_missing_branches_badge is missing else l_0_missing_branches_badge), (undefined(name='path') if l_1_path is missing else l_1_path), environment.getattr((undefined(name='info') if l_1_info is missing else l_1_info), 'missing_branches'), l_1_base)),
+                ' |',
+            ))
+        t_20.extend((
+            ' ',
+            str(context.call((undefined(name='coverage_rate_badge') if l_0_coverage_rate_badge is missing else l_0_coverage_rate_badge), (undefined(name='path') if l_1_path is missing else l_1_path), environment.getattr((undefined(name='info') if l_1_info is missing else l_1_info), 'percent_covered'), environment.getattr((undefined(name='info') if l_1_info is missing else l_1_info), 'percent_covered_display'), environment.getattr((undefined(name='info') if l_1_info is missing else l_1_info), 'covered_lines'), environment.getattr((undefined(name='info') if l_1_info is missing else l_1_info), 'num_statements'), l_1_base)),
+            ' |',
+        ))
+        if l_1_with_diff:
+            pass
+            t_20.extend((
+                ' ',
+                str(context.call((undefined(name='diff_coverage_rate_badge') if l_0_diff_coverage_rate_badge is missing else l_0_diff_coverage_rate_badge), (undefined(name='path') if l_1_path is missing else l_1_path), (t_5(environment.getattr(environment.getattr(l_1_file, 'diff'), 'added_statements')) if environment.getattr(l_1_file, 'diff') else None), (t_5(environment.getattr(environment.getattr(l_1_file, 'diff'), 'covered_statements')) if environment.getattr(l_1_file, 'diff') else None), (environment.getattr(environment.getattr(l_1_file, 'diff'), 'percent_covered') if environment.getattr(l_1_file, 'diff') else None))),
+                ' |',
+            ))
+        t_20.extend((
+            ' ',
+            str(context.call((undefined(name='missing_lines_links') if l_0_missing_lines_links is missing else l_0_missing_lines_links), (undefined(name='path') if l_1_path is missing else l_1_path), context.call(environment.getattr(l_1_missing_map, 'get'), (undefined(name='path') if l_1_path is missing else l_1_path), []), l_1_base)),
+            ' |',
+        ))
+        if l_1_branch_coverage:
+            pass
+            t_20.extend((
+                ' ',
+                str(context.call((undefined(name='missing_branches_links') if l_0_missing_branches_links is missing else l_0_missing_branches_links), (undefined(name='path') if l_1_path is missing else l_1_path), (undefined(name='missing_branches') if l_1_missing_branches is missing else l_1_missing_branches), l_1_base)),
+                ' |',
+            ))
+        return concat(t_20)
+    context.exported_vars.add('file_row')
+    context.vars['file_row'] = l_0_file_row = Macro(environment, macro, 'file_row', ('file', 'missing_map', 'branch_coverage', 'base', 'with_diff'), False, False, False, context.eval_ctx.autoescape)
+    def macro(l_1_totals, l_1_diff_totals, l_1_branch_coverage, l_1_with_diff):
+        t_21 = []
+        if l_1_totals is missing:
+            l_1_totals = undefined("parameter 'totals' was not provided", name='totals')
+        if l_1_diff_totals is missing:
+            l_1_diff_totals = undefined("parameter 'diff_totals' was not provided", name='diff_totals')
+        if l_1_branch_coverage is missing:
+            l_1_branch_coverage = undefined("parameter 'branch_coverage' was not provided", name='branch_coverage')
+        if l_1_with_diff is missing:
+            l_1_with_diff = undefined("parameter 'with_diff' was not provided", name='with_diff')
+        pass
+        t_21.extend((
+            '| **Project Total** | ',
+            str(context.call((undefined(name='statements_badge') if l_0_statements_badge is missing else l_0_statements_badge), 'whole project', environment.getattr(l_1_totals, 'num_statements'))),
+            ' | ',
+            str(context.call((undefined(name='missing_lines_badge') if l_0_missing_lines_badge is missing else l_0_missing_lines_badge), 'the whole project', environment.getattr(l_1_totals, 'missing_lines'))),
+            ' |',
+        ))
+        if l_1_branch_coverage:
+            pass
+            t_21.extend((
+                ' ',
+                str(context.call((undefined(name='branches_badge') if l_0_branches_badge is missing else l_0_branches_badge), 'the whole project', environment.getattr(l_1_totals, 'num_branches'))),
+                ' | ',
+                str(context.call((undefined(name='missing_branches_badge') if l_0_missing_branches_badge is missing else l_0_missing_branches_badge), 'the whole project', environment.getattr(l_1_totals, 'missing_branches'))),
+                ' |',
+            ))
+        t_21.extend((
+            ' ',
+            str(context.call((undefined(name='coverage_rate_badge') if l_0_coverage_rate_badge is missing else l_0_coverage_rate_badge), 'the whole project', environment.getattr(l_1_totals, 'percent_covered'), environment.getattr(l_1_totals, 'percent_covered_display'), environment.getattr(l_1_totals, 'covered_lines'), environment.getattr(l_1_totals, 'num_statements'))),
+            ' |',
+        ))
+        if l_1_with_diff:
+            pass
+            t_21.extend((
+                ' ',
+                str(context.call((undefined(name='diff_coverage_rate_badge') if l_0_diff_coverage_rate_badge is missing else l_0_diff_coverage_rate_badge), 'the whole project', environment.getattr(l_1_diff_totals, 'total_num_lines'), (environment.getattr(l_1_diff_totals, 'total_num_lines') - environment.getattr(l_1_diff_totals, 'total_num_violations')), environment.getattr(l_1_diff_totals, 'total_percent_covered'))),
+                ' |',
+            ))
+        t_21.append(
+            ' &nbsp; |',
+        )
+        if l_1_branch_coverage:
+            pass
+            t_21.append(
+                ' &nbsp; |',
+            )
+        return concat(t_21)
+    context.exported_vars.add('total_row')
+    context.vars['total_row'] = l_0_total_row = Macro(environment, macro, 'total_row', ('totals', 'diff_totals', 'branch_coverage', 'with_diff'), False, False, False, context.eval_ctx.autoescape)
+    def macro(l_1_files, l_1_missing_map, l_1_totals, l_1_diff_totals, l_1_branch_coverage, l_1_base):
+        t_22 = []
+        l_1_native_tables = resolve('native_tables')
+        l_1_native_coverage_table = resolve('native_coverage_table')
+        l_1_with_diff = resolve('with_diff')
+        if l_1_files is missing:
+            l_1_files = undefined("parameter 'files' was not provided", name='files')
+        if l_1_missing_map is missing:
+            l_1_missing_map = undefined("parameter 'missing_map' was not provided", name='missing_map')
+        if l_1_totals is missing:
+            l_1_totals = undefined("parameter 'totals' was not provided", name='totals')
+        if l_1_diff_totals is missing:
+            l_1_diff_totals = undefined("parameter 'diff_totals' was not provided", name='diff_totals')
+        if l_1_branch_coverage is missing:
+            l_1_branch_coverage = False
+        if l_1_base is missing:
+            l_1_base = False
+        pass
+        if (undefined(name='native_tables') if l_1_native_tables is missing else l_1_native_tables):
+            pass
+            t_22.append(
+                str(context.call((undefined(name='native_coverage_table') if l_1_native_coverage_table is missing else l_1_native_coverage_table), l_1_files, l_1_missing_map, l_1_totals, l_1_diff_totals, l_1_branch_coverage, l_1_base)),
+            )
+        else:
+            pass
+            l_1_with_diff = (not t_9(l_1_diff_totals))
+            t_22.extend((
+                str(context.call((undefined(name='table_header') if l_0_table_header is missing else l_0_table_header), l_1_branch_coverage, (undefined(name='with_diff') if l_1_with_diff is missing else l_1_with_diff))),
+                '\n',
+            ))
+            for (l_2_parent, l_2_files_in_folder) in t_4(environment, l_1_files, attribute='path.parent'):
+                _loop_vars = {}
+                pass
+                t_22.extend((
+                    '| &nbsp;&nbsp;**',
+                    str(l_2_parent),
+                    '** |\n',
+                ))
+                for l_3_file in l_2_files_in_folder:
+                    _loop_vars = {}
+                    pass
+                    t_22.extend((
+                        str(context.call((undefined(name='file_row') if l_0_file_row is missing else l_0_file_row), l_3_file, l_1_missing_map, l_1_branch_coverage, l_1_base, (undefined(name='with_diff') if l_1_with_diff is missing else l_1_with_diff), _loop_vars=_loop_vars)),
+                        '\n',
+                    ))
+                l_3_file = missing
+            l_2_parent = l_2_files_in_folder = missing
+            t_22.append(
+                str(context.call((undefined(name='total_row') if l_0_total_row is missing else l_0_total_row), l_1_totals, l_1_diff_totals, l_1_branch_coverage, (undefined(name='with_diff') if l_1_with_diff is missing else l_1_with_diff))),
+            )
+        return concat(t_22)
+    context.exported_vars.add('coverage_table')
+    context.vars['coverage_table'] = l_0_coverage_table = Macro(environment, macro, 'coverage_table', ('files', 'missing_map', 'totals', 'diff_totals', 'branch_coverage', 'base'), False, False, False, context.eval_ctx.autoescape)
+
+blocks = {}
+debug_info = '7=66&8=83&11=100&12=110&15=115&16=125&19=130&20=140&23=145&24=155&27=160&28=176&29=177&30=178&31=180&34=185&35=199&36=201&37=202&38=203&39=205&41=210&45=215&46=226&47=227&48=231&49=233&59=250&60=261&61=262&62=267&63=269&64=272&65=274&66=278&68=285&69=289&84=300&85=310&86=334&91=358&92=372&93=373&94=374&95=377&98=422&99=435&105=472&106=490&107=493&109=497&110=499&111=502&112=510&113=520'
\ No newline at end of file
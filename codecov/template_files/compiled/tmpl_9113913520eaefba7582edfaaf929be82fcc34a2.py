@@ -0,0 +1,196 @@
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'comment.md.j2'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_diff_line_groups_truncated = resolve('diff_line_groups_truncated')
+    l_0_complete_project_report = resolve('complete_project_report')
+    l_0_project_line_groups_truncated = resolve('project_line_groups_truncated')
+    l_0_max_line_groups = resolve('max_line_groups')
+    l_0_marker = resolve('marker')
+    l_0_macros = missing
+    pass
+    yield from context.blocks['title'][0](context)
+    yield '\n\n\n'
+    yield from context.blocks['coverage_badges'][0](context)
+    yield '\n'
+    l_0_macros = context.vars['macros'] = environment.get_template('macros.md.j2', 'comment.md.j2').make_module(context.get_all(), True, {'macros': l_0_macros})
+    context.exported_vars.discard('macros')
+    yield '\n\n'
+    yield from context.blocks['coverage_by_file'][0](context)
+    yield '\n\n'
+    yield from context.blocks['project_coverage_by_file'][0](context)
+    if ((undefined(name='diff_line_groups_truncated') if l_0_diff_line_groups_truncated is missing else l_0_diff_line_groups_truncated) or ((undefined(name='complete_project_report') if l_0_complete_project_report is missing else l_0_complete_project_report) and (undefined(name='project_line_groups_truncated') if l_0_project_line_groups_truncated is missing else l_0_project_line_groups_truncated))):
+        pass
+        yield '\n\n_The groups of missing lines are truncated to '
+        yield str((undefined(name='max_line_groups') if l_0_max_line_groups is missing else l_0_max_line_groups))
+        yield ' per file to fit in the comment._'
+    yield from context.blocks['footer'][0](context)
+    yield str((undefined(name='marker') if l_0_marker is missing else l_0_marker))
+
+def block_title(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    _block_vars = {}
+    pass
+    yield '## Coverage report'
+
+def block_coverage_badges(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    _block_vars = {}
+    pass
+    yield from context.blocks['coverage_evolution_badge'][0](context)
+    yield '&nbsp;&nbsp;'
+    yield from context.blocks['diff_coverage_badge'][0](context)
+
+def block_coverage_evolution_badge(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    _block_vars = {}
+    l_0_coverage = resolve('coverage')
+    l_0_color = resolve('color')
+    l_0_precise = resolve('precise')
+    try:
+        t_1 = environment.filters['generate_badge']
+    except KeyError:
+        @internalcode
+        def t_1(*unused):
+            raise TemplateRuntimeError("No filter named 'generate_badge' found.")
+    try:
+        t_2 = environment.filters['get_badge_color']
+    except KeyError:
+        @internalcode
+        def t_2(*unused):
+            raise TemplateRuntimeError("No filter named 'get_badge_color' found.")
+    try:
+        t_3 = environment.filters['pct']
+    except KeyError:
+        @internalcode
+        def t_3(*unused):
+            raise TemplateRuntimeError("No filter named 'pct' found.")
+    try:
+        t_4 = environment.filters['x100']
+    except KeyError:
+        @internalcode
+        def t_4(*unused):
+            raise TemplateRuntimeError("No filter named 'x100' found.")
+    pass
+    if (undefined(name='coverage') if l_0_coverage is missing else l_0_coverage):
+        pass
+        l_0_color = t_2(context, t_4(environment.getattr(environment.getattr((undefined(name='coverage') if l_0_coverage is missing else l_0_coverage), 'info'), 'percent_covered')))
+        _block_vars['color'] = l_0_color
+        l_0_precise = t_3(environment.getattr(environment.getattr((undefined(name='coverage') if l_0_coverage is missing else l_0_coverage), 'info'), 'percent_covered'), precision=2)
+        _block_vars['precise'] = l_0_precise
+        yield '<img src="'
+        yield str(t_1(context, 'Coverage', message=str_join((environment.getattr(environment.getattr((undefined(name='coverage') if l_0_coverage is missing else l_0_coverage), 'info'), 'percent_covered_display'), '%', )), color=(undefined(name='color') if l_0_color is missing else l_0_color)))
+        yield '" title="'
+        yield str((undefined(name='precise') if l_0_precise is missing else l_0_precise))
+        yield '">'
+
+def block_diff_coverage_badge(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    _block_vars = {}
+    l_0_diff_coverage = resolve('diff_coverage')
+    l_0_color = l_0_precise = missing
+    try:
+        t_1 = environment.filters['generate_badge']
+    except KeyError:
+        @internalcode
+        def t_1(*unused):
+            raise TemplateRuntimeError("No filter named 'generate_badge' found.")
+    try:
+        t_2 = environment.filters['get_badge_color']
+    except KeyError:
+        @internalcode
+        def t_2(*unused):
+            raise TemplateRuntimeError("No filter named 'get_badge_color' found.")
+    try:
+        t_3 = environment.filters['pct']
+    except KeyError:
+        @internalcode
+        def t_3(*unused):
+            raise TemplateRuntimeError("No filter named 'pct' found.")
+    try:
+        t_4 = environment.filters['x100']
+    except KeyError:
+        @internalcode
+        def t_4(*unused):
+            raise TemplateRuntimeError("No filter named 'x100' found.")
+    pass
+    l_0_color = t_2(context, t_4(environment.getattr((undefined(name='diff_coverage') if l_0_diff_coverage is missing else l_0_diff_coverage), 'total_percent_covered')))
+    _block_vars['color'] = l_0_color
+    l_0_precise = t_3(environment.getattr((undefined(name='diff_coverage') if l_0_diff_coverage is missing else l_0_diff_coverage), 'total_percent_covered'), precision=2)
+    _block_vars['precise'] = l_0_precise
+    yield '<img src="'
+    yield str(t_1(context, 'PR Coverage', message=t_3(environment.getattr((undefined(name='diff_coverage') if l_0_diff_coverage is missing else l_0_diff_coverage), 'total_percent_covered'), precision=0), color=(undefined(name='color') if l_0_color is missing else l_0_color)))
+    yield '" title="'
+    yield str((undefined(name='precise') if l_0_precise is missing else l_0_precise))
+    yield '">'
+
+def block_coverage_by_file(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    _block_vars = {}
+    pass
+    template = environment.get_template('pr.md.j2', 'comment.md.j2')
+    gen = template.root_render_func(template.new_context(context.get_all(), True, {}))
+    try:
+        for event in gen:
+            yield event
+    finally: gen.close()
+
+def block_project_coverage_by_file(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    _block_vars = {}
+    pass
+    template = environment.get_template('project.md.j2', 'comment.md.j2')
+    gen = template.root_render_func(template.new_context(context.get_all(), True, {}))
+    try:
+        for event in gen:
+            yield event
+    finally: gen.close()
+
+def block_footer(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    _block_vars = {}
+    l_0_label = resolve('label')
+    pass
+    yield '\n'
+    if (undefined(name='label') if l_0_label is missing else l_0_label):
+        pass
+        yield '\n<sub>\n    '
+        yield str((undefined(name='label') if l_0_label is missing else l_0_label))
+        yield '\n</sub>\n'
+    yield '\n'
+
+blocks = {'title': block_title, 'coverage_badges': block_coverage_badges, 'coverage_evolution_badge': block_coverage_evolution_badge, 'diff_coverage_badge': block_diff_coverage_badge, 'coverage_by_file': block_coverage_by_file, 'project_coverage_by_file': block_project_coverage_by_file, 'footer': block_footer}
+debug_info = '1=17&4=19&23=21&26=24&31=26&35=27&37=30&40=32&47=33&1=35&4=45&6=53&15=55&6=57&7=92&8=94&9=96&10=99&15=104&16=138&17=140&18=143&26=148&27=156&31=163&32=171&40=178&41=188&43=191'
\ No newline at end of file
@@ -0,0 +1,29 @@
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'project.md.j2'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_complete_project_report = resolve('complete_project_report')
+    l_0_coverage_files = resolve('coverage_files')
+    l_0_macros = resolve('macros')
+    l_0_missing_lines_for_whole_project = resolve('missing_lines_for_whole_project')
+    l_0_coverage = resolve('coverage')
+    l_0_branch_coverage = resolve('branch_coverage')
+    pass
+    if (undefined(name='complete_project_report') if l_0_complete_project_report is missing else l_0_complete_project_report):
+        pass
+        if (not (undefined(name='coverage_files') if l_0_coverage_files is missing else l_0_coverage_files)):
+            pass
+            yield '\n\n_No additional project files to report the coverage._'
+        else:
+            pass
+            yield '<details><summary>Click to see whole project coverage</summary>\n<br>\n\n'
+            yield str(context.call(environment.getattr((undefined(name='macros') if l_0_macros is missing else l_0_macros), 'coverage_table'), (undefined(name='coverage_files') if l_0_coverage_files is missing else l_0_coverage_files), (undefined(name='missing_lines_for_whole_project') if l_0_missing_lines_for_whole_project is missing else l_0_missing_lines_for_whole_project), environment.getattr((undefined(name='coverage') if l_0_coverage is missing else l_0_coverage), 'info'), None, (undefined(name='branch_coverage') if l_0_branch_coverage is missing else l_0_branch_coverage), True))
+            yield '\n\n</details>'
+
+blocks = {}
+debug_info = '1=17&2=19&9=25'
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""
+Watch mode for local development: render the report again whenever the coverage file or
+the diff of the working tree changes, with only the files whose coverage or added lines
+changed computed again.
+
+    GITHUB_REPOSITORY=org/repo COVERAGE_PATH=coverage.json codecov-watch --base main
+
+The diff is the one of `git diff <base>`, the working tree against the base, untracked files
+left out. The report goes to the standard output, or to `--output`.
+"""
+
+import argparse
+import dataclasses
+import os
+import pathlib
+import re
+import subprocess
+import sys
+import time
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from codecov import api, diff_grouper, groups, template
+from codecov.batch import files_version
+from codecov.config import STDIO_PATH, Config, str_to_bool
+from codecov.coverage.base import FileDiffCoverage
+from codecov.exceptions import ConfigurationException, CoreBaseException, CoreProcessingException
+from codecov.github import GithubDiffParser
+from codecov.log import log, setup as log_setup
+from codecov.report import Report, build_report
+from codecov.writers import MarkdownFileWriter
+
+if TYPE_CHECKING:
+    from codecov.coverage.jest import JestCoverage
+    from codecov.coverage.pytest import PytestCoverage
+
+# Seconds between two looks at the coverage file and the working tree
+INTERVAL = 0.5
+FILE_DIFF_RE = re.compile(r'^(?=diff --git )', re.MULTILINE)
+
+
+class Watcher:  # pylint: disable=too-many-instance-attributes
+    """
+    Keep what is computed per file from one update to the next: the added lines of every
+    file of the diff, the diff coverage of every file and their groups of missing lines.
+    An update computes them again for the changed files only.
+    """
+
+    def __init__(self, config: Config, base: str = 'HEAD', output: pathlib.Path = STDIO_PATH):
+        self.config = config
+        self.base = base
+        run = api.ReporterRun(config, reporter=api.Reporter(max_reports=1), diff='')
+        self.handler = run.coverage_module
+        self.writer = MarkdownFileWriter(output, markdown=run.markdown, max_files=config.MAX_FILES_IN_COMMENT)
+
+        self.coverage_version: tuple[tuple[int, int] | None, ...] | None = None
+        self.coverage: PytestCoverage | JestCoverage | None = None
+        self.diff: str | None = None
+        # Added lines of the diff of every file, by its text
+        self.file_diffs: dict[str, dict[pathlib.Path, list[int]]] = {}
+        self.added_lines: dict[pathlib.Path, list[int]] = {}
+        self.diff_files: dict[pathlib.Path, FileDiffCoverage] = {}
+        self.missing_lines: dict[pathlib.Path, list[groups.Group]] = {}
+        self.missing_diff_lines: dict[pathlib.Path, list[groups.Group]] = {}
+        self.report: Report | None = None
+
+    def get_diff(self) -> str:
+        try:
+            return subprocess.run(  # noqa: S603
+                ['git', 'diff', '--no-color', '--no-ext-diff', self.base],  # noqa: S607
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+        except subprocess.CalledProcessError as e:
+            log.error('Error getting the diff against %s: %s', self.base, e.stderr.strip())
+            raise CoreProcessingException from e
+        except OSError as e:
+            log.error('Error running git: %s', str(e))
+            raise CoreProcessingException from e
+
+    def update(self) -> set[pathlib.Path] | None:
+        """
+        Compute the report again if the coverage file or the diff changed, returning the
+        files computed again, or None when nothing changed.
+        """
+        version = files_version(self.config.coverage_paths)
+        diff = self.get_diff()
+        coverage = self.coverage
+        if coverage is not None and version == self.coverage_version and diff == self.diff:
+            return None
+
+        changed_coverage: set[pathlib.Path] = set()
+        if coverage is None or version != self.coverage_version:
+            coverage, changed_coverage = self._parse_coverage()
+            self.coverage, self.coverage_version = coverage, version
+        changed = changed_coverage | (self._parse_diff(diff) if diff != self.diff else set())
+        self.diff = diff
+
+        for path in changed:
+            self.diff_files.pop(path, None)
+        self.diff_files.update(
+            self.handler.get_diff_coverage(
+                added_lines={path: self.added_lines[path] for path in changed if path in self.added_lines},
+                coverage=coverage,
+                config=self.config,
+            ).files
+        )
+        diff_coverage = self.handler.total_diff_coverage(
+            files={path: self.diff_files[path] for path in self.added_lines if path in self.diff_files},
+            num_changed_lines=sum(len(lines) for lines in self.added_lines.values()),
+        )
+
+        for path in changed:
+            files = {path: coverage.files[path]} if path in coverage.files else {}
+            file_coverage = dataclasses.replace(coverage, files=files)  # type: ignore[arg-type]
+            if path in changed_coverage:
+                _set_groups(self.missing_lines, path, diff_grouper.get_missing_groups(coverage=file_coverage))
+            file_diff_coverage = dataclasses.replace(
+                diff_coverage, files={path: diff_coverage.files[path]} if path in diff_coverage.files else {}
+            )
+            _set_groups(
+                self.missing_diff_lines,
+                path,
+                diff_grouper.get_diff_missing_groups(coverage=file_coverage, diff_coverage=file_diff_coverage),
+            )
+
+        self.report = build_report(
+            coverage=coverage,
+            diff_coverage=diff_coverage,
+            skip_covered_files_in_report=self.config.SKIP_COVERED_FILES_IN_REPORT,
+            # In the order of the files, as when computed in one go
+            missing_diff_lines={
+                path: self.missing_diff_lines[path] for path in diff_coverage.files if path in self.missing_diff_lines
+            },
+            missing_lines_for_whole_project={
+                path: self.missing_lines[path] for path in coverage.files if path in self.missing_lines
+            },
+        )
+        return changed
+
+    def _parse_coverage(self) -> 'tuple[PytestCoverage | JestCoverage, set[pathlib.Path]]':
+        """
+        Parse the coverage file and return the files whose coverage changed, or that are
+        not in it anymore.
+        """
+        coverage = self.handler.get_coverage(config=self.config)
+        previous: dict[pathlib.Path, Any] = self.coverage.files if self.coverage is not None else {}
+        files: dict[pathlib.Path, Any] = coverage.files
+        changed = {path for path in previous.keys() | files.keys() if previous.get(path) != files.get(path)}
+        return coverage, changed
+
+    def _parse_diff(self, diff: str) -> set[pathlib.Path]:
+        """Parse the diff of the files whose diff changed, and return the files whose added lines changed."""
+        file_diffs = {}
+        added_lines: dict[pathlib.Path, list[int]] = {}
+        for file_diff in FILE_DIFF_RE.split(diff):
+            if not file_diff:
+                continue
+            if file_diff not in file_diffs:
+                file_diffs[file_diff] = self.file_diffs.get(file_diff) or GithubDiffParser(diff=file_diff).parse()
+            for path, lines in file_diffs[file_diff].items():
+                added_lines.setdefault(path, []).extend(lines)
+        changed = {
+            path
+            for path in set(added_lines) | set(self.added_lines)
+            if added_lines.get(path) != self.added_lines.get(path)
+        }
+        self.file_diffs, self.added_lines = file_diffs, added_lines
+        return changed
+
+    def write(self) -> None:
+        if self.report is not None:
+            self.writer.write(self.report)
+
+    def watch(self, interval: float = INTERVAL) -> None:
+        while True:
+            start = time.perf_counter()
+            try:
+                changed = self.update()
+            except CoreBaseException as e:
+                # The coverage file may be read while the tests are still writing it
+                log.warning('Report not updated: %s', str(e) or type(e).__name__)
+                changed = None
+            if changed is not None:
+                self.write()
+                log.info(
+                    'Report updated in %.0f ms, %d file(s) computed again.',
+                    (time.perf_counter() - start) * 1000,
+                    len(changed),
+                )
+            time.sleep(interval)
+
+
+def _set_groups(
+    missing: dict[pathlib.Path, list[groups.Group]], path: pathlib.Path, path_groups: Iterable[groups.Group]
+) -> None:
+    missing.pop(path, None)
+    missing.update(template.group_by_file(path_groups))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base', default='HEAD', help='git revision the working tree is compared with')
+    parser.add_argument('--output', type=pathlib.Path, default=STDIO_PATH, help='file the report is written to')
+    parser.add_argument('--interval', type=float, default=INTERVAL, help='seconds between two looks for changes')
+    args = parser.parse_args()
+
+    log_setup(debug=str_to_bool(os.environ.get('DEBUG', '')))
+    try:
+        # The diff comes from git and nothing is posted to GitHub
+        config = Config.from_environ(environ={**os.environ, **api.DEFAULTS})
+    except (ValueError, ConfigurationException) as e:
+        log.error('Error: %s', str(e))
+        sys.exit(1)
+    try:
+        Watcher(config, base=args.base, output=args.output).watch(interval=args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
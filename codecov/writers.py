@@ -0,0 +1,152 @@
+import decimal
+import json
+import pathlib
+import sys
+from abc import ABC, abstractmethod
+from typing import Any
+
+import jinja2
+
+from codecov import groups, template
+from codecov.config import STDIO_PATH
+from codecov.log import log
+from codecov.report import Report
+
+
+class MarkdownWriter:
+    """
+    Render a report to Markdown with the comment template. Everything that depends on
+    the report comes from the view model, so rendering it several times, for several
+    outputs or to fit a budget, does not compute anything again.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        base_template: str | jinja2.Template,
+        *,
+        repo_name: str,
+        pr_number: int | None,
+        base_ref: str,
+        minimum_green: decimal.Decimal,
+        minimum_orange: decimal.Decimal,
+        marker: str = template.MARKER,
+        native_tables: bool = True,
+        reference_links: bool = False,
+        **options: Any,
+    ):
+        self.base_template = base_template
+        self.repo_name = repo_name
+        self.pr_number = pr_number
+        self.base_ref = base_ref
+        self.minimum_green = minimum_green
+        self.minimum_orange = minimum_orange
+        self.marker = marker
+        self.native_tables = native_tables
+        self.reference_links = reference_links
+        # Template variables such as `branch_coverage`, `complete_project_report` or `label`
+        self.options = options
+
+    def render(self, report: Report, max_length: int | None = None) -> str:
+        return template.get_comment_markdown(
+            self.base_template,
+            report.coverage,
+            report.diff_coverage,
+            self.minimum_green,
+            self.minimum_orange,
+            self.repo_name,
+            self.pr_number,
+            self.base_ref,
+            self.marker,
+            native_tables=self.native_tables,
+            max_length=max_length,
+            reference_links=self.reference_links,
+            **report.get_template_context(),
+            **self.options,
+        )
+
+
+class ReportWriter(ABC):
+    """Write a report to a file, without any network access."""
+
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+
+    @abstractmethod
+    def write(self, report: Report) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+
+class MarkdownFileWriter(ReportWriter):
+    """
+    Write the Markdown report, truncated to `max_files` files, to a file, or to the
+    standard output for the `-` path.
+    """
+
+    mode = 'w'
+
+    def __init__(self, path: pathlib.Path, markdown: MarkdownWriter, max_files: int | None = None):
+        super().__init__(path)
+        self.markdown = markdown
+        self.max_files = max_files
+
+    def write(self, report: Report) -> None:
+        contents = self.markdown.render(report.truncate(max_files=self.max_files))
+        if self.path == STDIO_PATH:
+            sys.stdout.write(contents + '\n')
+            return
+        with self.path.open(self.mode) as file:
+            file.write(contents + '\n')
+        log.info('Report written to %s', self.path)
+
+
+class StepSummaryWriter(MarkdownFileWriter):
+    """
+    Append the Markdown report to the job summary of GitHub Actions, the file named by
+    GITHUB_STEP_SUMMARY, which other steps of the job may also write to.
+    """
+
+    mode = 'a'
+
+
+class JsonWriter(ReportWriter):
+    """Write every file of the report, without any truncation, to a JSON document."""
+
+    def write(self, report: Report) -> None:
+        self.path.write_text(json.dumps(self.get_document(report), indent=2) + '\n')
+        log.info('Report written to %s', self.path)
+
+    @staticmethod
+    def get_document(report: Report) -> dict[str, Any]:
+        coverage_info = report.coverage.info
+        diff_coverage = report.diff_coverage
+        return {
+            'coverage': {
+                'percent_covered': str(coverage_info.percent_covered),
+                'num_statements': coverage_info.num_statements,
+                'covered_lines': coverage_info.covered_lines,
+                'missing_lines': coverage_info.missing_lines,
+            },
+            'diff_coverage': {
+                'percent_covered': str(diff_coverage.total_percent_covered),
+                'num_lines': diff_coverage.total_num_lines,
+                'num_violations': diff_coverage.total_num_violations,
+            },
+            'files': [JsonWriter.get_file(file, report.missing_diff_lines.get(file.path, [])) for file in report.files],
+            'project_files': [
+                JsonWriter.get_file(file, report.missing_lines_for_whole_project.get(file.path, []))
+                for file in report.coverage_files
+            ],
+        }
+
+    @staticmethod
+    def get_file(file: template.FileInfo, missing_groups: list[groups.Group]) -> dict[str, Any]:
+        info = file.coverage.info
+        return {
+            'path': str(file.path),
+            'num_statements': info.num_statements,
+            'missing_lines': info.missing_lines,
+            'percent_covered': str(info.percent_covered),
+            'diff_percent_covered': str(file.diff.percent_covered) if file.diff else None,
+            'added_statements': len(file.diff.added_statements) if file.diff else None,
+            'missing_line_groups': [[group.line_start, group.line_end] for group in missing_groups],
+        }
@@ -4,6 +4,7 @@ import dataclasses
 import datetime
 import decimal
 import functools
+import json
 import pathlib
 import secrets
 from collections.abc import Callable
@@ -22,6 +23,7 @@ from codecov.coverage.pytest import (
     PytestFileCoverage,
 )
 from codecov.github_client import GitHubClient
+from tests.fake_github import FakeGithub
 
 
 @pytest.fixture
@@ -210,6 +212,49 @@ def make_coverage_and_diff(make_coverage, make_diff_coverage) -> Callable[[str],
     return _
 
 
+@pytest.fixture
+def make_large_coverage(make_diff_coverage) -> Callable[[int, int], tuple[PytestCoverage, DiffCoverage]]:
+    """
+    Coverage of `num_files` files of `num_lines` lines added by the pull request, with
+    every other line missing coverage, so `num_lines / 2` groups of missing lines per file.
+    """
+
+    def _(num_files: int, num_lines: int) -> tuple[PytestCoverage, DiffCoverage]:
+        summary = {
+            'covered_lines': num_lines - num_lines // 2,
+            'num_statements': num_lines,
+            'percent_covered': 50.0,
+            'percent_covered_display': '50',
+            'missing_lines': num_lines // 2,
+            'excluded_lines': 0,
+        }
+        files = {
+            f'src/package_{i % 5}/module_{i}.py': {
+                'executed_lines': list(range(1, num_lines + 1, 2)),
+                'missing_lines': list(range(2, num_lines + 1, 2)),
+                'excluded_lines': [],
+                'summary': summary,
+            }
+            for i in range(num_files)
+        }
+        coverage = PytestCoverageHandler().extract_info(
+            {
+                'meta': {
+                    'version': '7.0',
+                    'timestamp': '2024-01-01T00:00:00',
+                    'branch_coverage': False,
+                    'show_contexts': False,
+                },
+                'files': files,
+                'totals': summary | {'num_statements': num_files * num_lines},
+            }
+        )
+        added_lines = {path: list(range(1, num_lines + 1)) for path in coverage.files}
+        return coverage, make_diff_coverage(added_lines=added_lines, coverage=coverage)
+
+    return _
+
+
 @pytest.fixture
 def coverage_json():
     return {
@@ -254,6 +299,13 @@ def coverage_json():
     }
 
 
+@pytest.fixture
+def coverage_file(tmp_path, coverage_json) -> pathlib.Path:
+    path = tmp_path / 'coverage.json'
+    path.write_text(json.dumps(coverage_json))
+    return path
+
+
 @pytest.fixture
 def coverage_obj_more_files(make_coverage):
     return make_coverage(
@@ -441,4 +493,32 @@ def gh(gh_client, test_config: Config):
     github_mock.user.email = 'baz@foobar.com'
     github_mock.user.login = 'foo'
     github_mock.post_comment = MagicMock(return_value=None)
+    github_mock.post_comments = MagicMock(return_value=None)
     return github_mock
+
+
+@pytest.fixture
+def fake_github(test_config):
+    """
+    A fake GitHub API served on localhost, with an open pull request
+    #GITHUB_PR_NUMBER changing codebase/code.py.
+    """
+    with FakeGithub(repository=test_config.GITHUB_REPOSITORY) as fake:
+        fake.add_pull_request(
+            number=test_config.GITHUB_PR_NUMBER,
+            head_ref='feature/branch',
+            diff='diff --git a/codebase/code.py b/codebase/code.py\nindex 0000000..1111111 100644\n--- a/codebase/code.py\n+++ b/codebase/code.py\n@@ -1,4 +1,6 @@\n line\n line\n+line added\n line\n line\n+line added\n',
+        )
+        yield fake
+
+
+@pytest.fixture
+def fake_github_environ(fake_github, test_config, coverage_file) -> dict[str, str]:
+    """Environment running the whole pipeline against the `fake_github` server."""
+    return {
+        'GITHUB_REPOSITORY': test_config.GITHUB_REPOSITORY,
+        'GITHUB_TOKEN': test_config.GITHUB_TOKEN,
+        'GITHUB_PR_NUMBER': str(test_config.GITHUB_PR_NUMBER),
+        'GITHUB_API_URL': fake_github.url,
+        'COVERAGE_PATH': str(coverage_file),
+    }
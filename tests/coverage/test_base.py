@@ -1,5 +1,6 @@
 import dataclasses
 import decimal
+import importlib.metadata
 import json
 import pathlib
 import tempfile
@@ -7,7 +8,8 @@ from unittest.mock import patch
 
 import pytest
 
-from codecov.coverage.base import DiffCoverage, FileDiffCoverage
+from codecov.coverage.base import HANDLERS_GROUP, BaseCoverageHandler, DiffCoverage, FileDiffCoverage
+from codecov.coverage.jest import JestCoverageHandler
 from codecov.coverage.pytest import PytestCoverageHandler
 from codecov.exceptions import ConfigurationException
 
@@ -44,6 +46,14 @@ class TestBase:
             test_config.COVERAGE_PATH = pathlib.Path('path/to/file.json')
             handler.get_coverage(config=test_config)
 
+    def test_load(self, coverage_file, coverage_json, tmp_path):
+        handler = PytestCoverageHandler()
+        assert handler.load(coverage_file) == handler.extract_info(coverage_json)
+
+        (tmp_path / 'other.json').write_text('{"files": {}}')
+        with pytest.raises(ConfigurationException):
+            handler.load(tmp_path / 'other.json')
+
     @pytest.mark.parametrize(
         'added_lines, update_obj, expected',
         [
@@ -297,3 +307,48 @@ class TestBase:
             config=config,
         )
         assert result == expected
+
+
+class TestGetCoverageHandler:
+    @pytest.fixture(autouse=True)
+    def registry(self):
+        with patch.dict(BaseCoverageHandler.REGISTRY, clear=True):
+            yield BaseCoverageHandler.REGISTRY
+
+    @pytest.mark.parametrize(
+        'test_framework, expected', [('pytest', PytestCoverageHandler), ('jest', JestCoverageHandler)]
+    )
+    def test_builtin(self, registry, test_framework, expected):
+        with patch('importlib.metadata.entry_points') as entry_points:
+            assert type(BaseCoverageHandler.get_coverage_handler(test_framework)) is expected
+        entry_points.assert_not_called()
+        assert registry == {test_framework: expected}
+
+    def test_plugin(self, registry):
+        entry_point = importlib.metadata.EntryPoint(
+            name='vitest', value='codecov.coverage.jest:JestCoverageHandler', group=HANDLERS_GROUP
+        )
+        with patch('importlib.metadata.entry_points', return_value=[entry_point]) as entry_points:
+            assert type(BaseCoverageHandler.get_coverage_handler('vitest')) is JestCoverageHandler
+            BaseCoverageHandler.get_coverage_handler('vitest')
+        entry_points.assert_called_once_with(group=HANDLERS_GROUP, name='vitest')
+        assert registry == {'vitest': JestCoverageHandler}
+
+    @pytest.mark.parametrize(
+        'value',
+        [
+            'codecov.coverage.missing:Handler',
+            'codecov.coverage.jest:MissingHandler',
+            'codecov.coverage.jest:JestCoverage',
+        ],
+    )
+    def test_plugin_invalid(self, value):
+        entry_point = importlib.metadata.EntryPoint(name='vitest', value=value, group=HANDLERS_GROUP)
+        with patch('importlib.metadata.entry_points', return_value=[entry_point]):
+            with pytest.raises(ConfigurationException):
+                BaseCoverageHandler.get_coverage_handler('vitest')
+
+    def test_unknown(self):
+        with patch('importlib.metadata.entry_points', return_value=[]):
+            with pytest.raises(ConfigurationException):
+                BaseCoverageHandler.get_coverage_handler('vitest')
@@ -0,0 +1,329 @@
+import copy
+import dataclasses
+import decimal
+import json
+import pathlib
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from codecov.api import Reporter
+from codecov.coverage.base import BaseCoverageHandler
+from codecov.coverage.jest import JestCoverage, JestCoverageHandler
+from codecov.coverage.partial import (
+    FilePartial,
+    Partial,
+    PartialCoverageHandler,
+    Totals,
+    decode_branches,
+    decode_lines,
+    encode_branches,
+    encode_lines,
+    main,
+    merge,
+    merge_reports,
+    read_partial,
+)
+from codecov.coverage.pytest import PytestCoverageHandler
+from codecov.exceptions import ConfigurationException
+from codecov.github import GithubDiffParser
+
+DIFF = (
+    'diff --git a/codebase/code.py b/codebase/code.py\n'
+    'index 0000000..1111111 100644\n'
+    '--- a/codebase/code.py\n'
+    '+++ b/codebase/code.py\n'
+    '@@ -5,4 +5,8 @@\n line\n+line added\n+line added\n line\n+line added\n+line added\n line\n line\n'
+)
+
+
+@pytest.fixture
+def shards(coverage_json) -> list[dict]:
+    """The coverage report of the fixture split over two shards."""
+    first, second = copy.deepcopy(coverage_json), copy.deepcopy(coverage_json)
+    first['files']['codebase/code.py'].update(
+        executed_lines=[1, 2, 3, 5],
+        missing_lines=[6, 8, 10, 11, 13, 14],
+        executed_branches=[[2, 3], [3, 5]],
+        missing_branches=[[5, -1], [5, 6], [10, 11], [11, -1], [13, 14]],
+    )
+    second['files']['codebase/code.py'].update(
+        executed_lines=[1, 2, 5, 13, 14],
+        missing_lines=[3, 6, 8, 10, 11],
+        executed_branches=[[5, 6], [13, 14]],
+        missing_branches=[[2, 3], [3, 5], [5, -1], [10, 11], [11, -1]],
+    )
+    second['meta']['timestamp'] = '2000-01-02T00:00:00'
+    return [first, second]
+
+
+def to_partial(data: dict) -> Partial:
+    return Partial.from_coverage(PytestCoverageHandler().extract_info(data))
+
+
+@pytest.mark.parametrize(
+    'lines, text',
+    [
+        ([], ''),
+        ([7], '7'),
+        ([1, 2, 3, 5, 8, 9], '1-3,5,8-9'),
+        ([9, 1, 3, 2], '1-3,9'),
+    ],
+)
+def test_encode_lines(lines, text):
+    assert encode_lines(lines) == text
+    assert decode_lines(text) == set(lines)
+
+
+def test_encode_branches():
+    branches = {(5, -1), (2, 3), (10, 11)}
+    assert encode_branches(branches) == '2>3,5>-1,10>11'
+    assert decode_branches(encode_branches(branches)) == branches
+
+
+def test_partial_json(coverage_json):
+    partial = to_partial(coverage_json)
+    data = json.loads(json.dumps(partial.as_json()))
+
+    assert data['files']['codebase/code.py']['covered_lines'] == '1-3,5,13-14'
+    assert Partial.from_json(data) == partial
+    with pytest.raises(ValueError):
+        Partial.from_json(coverage_json)
+
+
+def test_merge(shards, coverage_json):
+    first, second = (to_partial(shard) for shard in shards)
+    merged = first.merge(second)
+
+    # Covered in any shard, missing in none
+    assert merged.files['codebase/code.py'] == to_partial(coverage_json).files['codebase/code.py']
+    assert merged.branch_coverage
+    assert merged.timestamp == second.timestamp
+    assert second.merge(first) == merged
+
+
+def test_merge_associative():
+    partials = [
+        Partial(files={'a.py': FilePartial(covered_lines={1}, missing_lines={2, 3})}),
+        Partial(files={'a.py': FilePartial(covered_lines={2}, missing_lines={1, 3}), 'b.py': FilePartial({1})}),
+        Partial(files={'a.py': FilePartial(covered_lines={3}, missing_lines={1, 2}, excluded_lines={4})}),
+    ]
+    first, second, third = partials
+    assert first.merge(second).merge(third) == first.merge(second.merge(third)) == merge(partials)
+    assert merge(partials).files['a.py'] == FilePartial(covered_lines={1, 2, 3}, excluded_lines={4})
+    assert merge([]) == Partial()
+
+
+def test_partial_handler(shards, coverage_json):
+    merged = merge(to_partial(shard) for shard in shards)
+    coverage = PartialCoverageHandler().extract_info(merged.as_json())
+    expected = PytestCoverageHandler().extract_info(coverage_json)
+
+    path = pathlib.Path('codebase/code.py')
+    assert coverage.files[path].covered_lines == expected.files[path].covered_lines
+    assert coverage.files[path].missing_lines == expected.files[path].missing_lines
+    assert coverage.files[path].executed_branches == expected.files[path].executed_branches
+    assert coverage.files[path].missing_branches == sorted(expected.files[path].missing_branches)
+    # Lines and branches, as coverage.py computes the totals: 10 / 17
+    assert coverage.info.num_statements == 10
+    assert coverage.info.num_branches == 7
+    assert coverage.info.percent_covered == decimal.Decimal('0.58')
+    assert coverage.info.percent_covered_display == '59'
+    assert coverage.meta.timestamp == expected.meta.timestamp.replace(day=2)
+
+    with pytest.raises(KeyError):
+        PartialCoverageHandler().extract_info(coverage_json)
+
+
+def test_partial_report(shards, coverage_json, test_config, tmp_path):
+    """The report of the merged partials is the one of the whole test suite."""
+    merged = tmp_path / 'merged.json'
+    merged.write_text(json.dumps(merge(to_partial(shard) for shard in shards).as_json()))
+    settings = {'GITHUB_REPOSITORY': test_config.GITHUB_REPOSITORY, 'GITHUB_PR_NUMBER': '1', 'BRANCH_COVERAGE': 'true'}
+    whole = tmp_path / 'coverage.json'
+    whole.write_text(json.dumps(coverage_json))
+
+    result = Reporter().report({**settings, 'TEST_FRAMEWORK': 'partial'}, diff=DIFF, coverage=merged)
+    expected = Reporter().report(settings, diff=DIFF, coverage=whole)
+    assert result.diff_coverage == expected.diff_coverage
+    assert result.report.missing_diff_lines == expected.report.missing_diff_lines
+
+
+def test_partial_limit(shards):
+    partial = to_partial(shards[0])
+    limited = partial.limit({pathlib.Path('codebase/code.py'): [3, 5, 6, 7]})
+
+    file = limited.files['codebase/code.py']
+    assert (file.covered_lines, file.missing_lines) == ({3, 5}, {6})
+    assert (file.executed_branches, file.missing_branches) == ({(3, 5)}, {(5, -1), (5, 6)})
+    # The counts of the whole file are carried along
+    assert file.totals == Totals(covered_lines=4, missing_lines=6, covered_branches=2, missing_branches=5)
+    assert file.get_totals() == partial.files['codebase/code.py'].get_totals()
+    assert Partial.from_json(json.loads(json.dumps(limited.as_json()))) == limited
+    assert 'totals' not in partial.as_json()['files']['codebase/code.py']
+
+
+def test_merge_limited(shards, coverage_json, test_config, tmp_path):
+    """The diff coverage of merged limited partials is exact, the totals are a lower bound."""
+    added_lines = GithubDiffParser(diff=DIFF).parse()
+    merged = merge(to_partial(shard).limit(added_lines) for shard in shards)
+    assert merge(to_partial(shard) for shard in shards).limit(added_lines).files.keys() == merged.files.keys()
+
+    merged_path = tmp_path / 'merged.json'
+    merged_path.write_text(json.dumps(merged.as_json()))
+    whole = tmp_path / 'coverage.json'
+    whole.write_text(json.dumps(coverage_json))
+    settings = {'GITHUB_REPOSITORY': test_config.GITHUB_REPOSITORY, 'GITHUB_PR_NUMBER': '1', 'BRANCH_COVERAGE': 'true'}
+
+    result = Reporter().report({**settings, 'TEST_FRAMEWORK': 'partial'}, diff=DIFF, coverage=merged_path)
+    expected = Reporter().report(settings, diff=DIFF, coverage=whole)
+    assert result.diff_coverage == expected.diff_coverage
+    # The second shard covers 5 lines, the union of the shards 6
+    info = result.coverage.files[pathlib.Path('codebase/code.py')].info
+    assert (info.covered_lines, info.num_statements) == (5, 10)
+    assert (result.coverage.info.covered_lines, expected.coverage.info.covered_lines) == (5, 6)
+
+
+def test_totals_merge():
+    first = Totals(covered_lines=4, missing_lines=6, excluded_lines=1, covered_branches=2, missing_branches=5)
+    second = Totals(covered_lines=5, missing_lines=5, covered_branches=3, missing_branches=4)
+
+    assert first.merge(second) == second.merge(first) == Totals(5, 5, 1, 3, 4)
+    # A full file merged with a limited one carries the totals on
+    full = FilePartial(covered_lines={1, 2}, missing_lines={3})
+    limited = FilePartial(covered_lines={3}, totals=Totals(covered_lines=1, missing_lines=2))
+    assert full.merge(limited).totals == Totals(covered_lines=2, missing_lines=1)
+    assert full.merge(full).totals is None
+
+
+@pytest.fixture
+def shard_files(shards, tmp_path) -> list[pathlib.Path]:
+    paths = []
+    for index, shard in enumerate(shards):
+        paths.append(tmp_path / f'coverage-{index}.json')
+        paths[-1].write_text(json.dumps(shard))
+    return paths
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_merge_reports(shard_files, coverage_json, workers, monkeypatch):
+    monkeypatch.setattr('codecov.coverage.partial.PARALLEL_MIN_SIZE', 0)
+    coverage = PytestCoverageHandler().from_partial(
+        merge_reports(shard_files, test_framework='pytest', workers=workers)
+    )
+
+    expected = PytestCoverageHandler().extract_info(coverage_json)
+    path = pathlib.Path('codebase/code.py')
+    assert coverage.files[path].covered_lines == expected.files[path].covered_lines
+    assert coverage.files[path].missing_lines == expected.files[path].missing_lines
+    assert coverage.info.covered_branches == 4
+
+    shard_files[1].write_text('{}')
+    with pytest.raises(ConfigurationException):
+        merge_reports(shard_files, test_framework='pytest', workers=workers)
+
+
+def jest_report(counts: dict[int, int]) -> dict:
+    """Jest report of a file with a statement per line, executed `counts[line]` times."""
+    return {
+        '/app/index.ts': {
+            'path': '/app/index.ts',
+            'statementMap': {str(line): {'start': {'line': line}, 'end': {'line': line}} for line in counts},
+            'fnMap': {},
+            'branchMap': {},
+            's': {str(line): count for line, count in counts.items()},
+            'f': {},
+            'b': {},
+        }
+    }
+
+
+def test_merge_reports_jest(test_config, tmp_path):
+    paths = [tmp_path / 'coverage-0.json', tmp_path / 'coverage-1.json']
+    paths[0].write_text(json.dumps(jest_report({1: 1, 2: 0, 3: 0, 4: 0})))
+    paths[1].write_text(json.dumps(jest_report({1: 0, 2: 3, 3: 0, 4: 0})))
+    config = dataclasses.replace(test_config, TEST_FRAMEWORK='jest', COVERAGE_PATH=paths)
+
+    coverage = JestCoverageHandler().get_coverage(config)
+
+    assert isinstance(coverage, JestCoverage)
+    file = coverage.files[pathlib.Path('/app/index.ts')]
+    assert (file.covered_lines, file.missing_lines) == ([1, 2], [3, 4])
+    assert (coverage.info.covered_lines, coverage.info.num_statements) == (2, 4)
+    assert coverage.info.percent_covered_display == '50'
+
+
+def test_merge_reports_unsupported_handler(test_config, tmp_path):
+    class OtherHandler(JestCoverageHandler):
+        from_partial = BaseCoverageHandler.from_partial
+
+    paths = [tmp_path / 'coverage-0.json', tmp_path / 'coverage-1.json']
+    for path in paths:
+        path.write_text(json.dumps(jest_report({1: 1})))
+    with pytest.raises(ConfigurationException):
+        OtherHandler().get_coverage(dataclasses.replace(test_config, TEST_FRAMEWORK='jest', COVERAGE_PATH=paths))
+
+
+def test_report_several_coverage_files(shard_files, coverage_json, test_config, tmp_path):
+    """One report for the reports of all the parallel jobs, as for the report of the whole test suite."""
+    settings = {'GITHUB_REPOSITORY': test_config.GITHUB_REPOSITORY, 'GITHUB_PR_NUMBER': '1', 'BRANCH_COVERAGE': 'true'}
+    whole = tmp_path / 'whole.json'
+    whole.write_text(json.dumps(coverage_json))
+
+    result = Reporter().report(settings, diff=DIFF, coverage=str(tmp_path / 'coverage-*.json'))
+    expected = Reporter().report(settings, diff=DIFF, coverage=whole)
+    assert result.diff_coverage == expected.diff_coverage
+    assert result.report.missing_diff_lines == expected.report.missing_diff_lines
+
+
+def test_main(shards, tmp_path):
+    paths = []
+    for index, shard in enumerate(shards):
+        (tmp_path / f'coverage-{index}.json').write_text(json.dumps(shard))
+        paths.append(tmp_path / f'partial-{index}.json')
+        with patch.object(
+            sys,
+            'argv',
+            ['codecov-partial', 'create', str(tmp_path / f'coverage-{index}.json'), '--output', str(paths[-1])],
+        ):
+            main()
+
+    merged = tmp_path / 'merged.json'
+    with patch.object(sys, 'argv', ['codecov-partial', 'merge', *map(str, paths), '--output', str(merged)]):
+        main()
+    assert Partial.from_json(json.loads(merged.read_text())) == merge(to_partial(shard) for shard in shards)
+
+    diff = tmp_path / 'pr.diff'
+    diff.write_text(DIFF)
+    limited = tmp_path / 'limited.json'
+    argv = [
+        'codecov-partial',
+        'create',
+        str(tmp_path / 'coverage-0.json'),
+        '--diff',
+        str(diff),
+        '--output',
+        str(limited),
+    ]
+    with patch.object(sys, 'argv', argv):
+        main()
+    added_lines = GithubDiffParser(diff=DIFF).parse()
+    assert Partial.from_json(json.loads(limited.read_text())) == to_partial(shards[0]).limit(added_lines)
+
+    with (
+        patch.object(sys, 'argv', [*argv[:4], str(tmp_path / 'missing.diff'), *argv[5:]]),
+        pytest.raises(SystemExit),
+    ):
+        main()
+
+    with (
+        patch.object(sys, 'argv', ['codecov-partial', 'merge', str(tmp_path / 'coverage-0.json'), '--output', 'x']),
+        pytest.raises(SystemExit),
+    ):
+        main()
+
+
+def test_read_partial_invalid(tmp_path):
+    with pytest.raises(ConfigurationException):
+        read_partial(tmp_path / 'missing.json')
@@ -0,0 +1,294 @@
+import dataclasses
+import http.server
+import json
+import re
+import threading
+import time
+import urllib.parse
+from typing import Any
+
+from codecov.log import log
+
+RATE_LIMIT = 5000
+# GitHub rejects check run requests carrying more annotations
+MAX_ANNOTATIONS = 50
+DIFF_MEDIA_TYPE = 'application/vnd.github.v3.diff'
+
+
+@dataclasses.dataclass
+class FakePullRequest:
+    number: int
+    head_ref: str
+    diff: str
+    head_sha: str = '0' * 40
+    state: str = 'open'
+
+    def as_json(self) -> dict[str, Any]:
+        return {
+            'number': self.number,
+            'state': self.state,
+            'head': {'ref': self.head_ref, 'sha': self.head_sha},
+        }
+
+
+class FakeGithub:
+    """
+    In-memory stand-in for the part of the GitHub REST API used by codecov, served over
+    HTTP on localhost so that `GitHubClient` talks to it exactly as it would to GitHub.
+
+        with FakeGithub(repository='org/repo', latency=0.05) as fake:
+            fake.add_pull_request(number=1, head_ref='feature', diff=diff)
+            GitHubClient(token='...', url=fake.url)
+
+    Every response waits `latency` seconds and carries the rate limit headers, comments
+    are paginated like GitHub does (`per_page`, `page` and a `Link` header).
+    """
+
+    def __init__(
+        self,
+        repository: str = 'example/foobar',
+        login: str = 'codecov-bot',
+        latency: float = 0.0,
+        per_page: int = 30,
+    ):
+        self.repository = repository
+        self.login = login
+        self.latency = latency
+        self.per_page = per_page
+        self.rate_limit_remaining = RATE_LIMIT
+        self.rate_limit_reset = int(time.time()) + 3600
+        self.pull_requests: dict[int, FakePullRequest] = {}
+        self.comments: dict[int, dict[str, Any]] = {}
+        self.check_runs: dict[int, dict[str, Any]] = {}
+        # (method, path) of every request received, in order
+        self.requests: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._next_comment_id = 1
+        self._next_check_run_id = 1
+        self._server: _FakeGithubServer | None = None
+
+    def add_pull_request(self, number: int, head_ref: str, diff: str, state: str = 'open') -> FakePullRequest:
+        pull_request = FakePullRequest(number=number, head_ref=head_ref, diff=diff, state=state)
+        self.pull_requests[number] = pull_request
+        return pull_request
+
+    def add_comment(self, pr_number: int, body: str, login: str | None = None) -> dict[str, Any]:
+        with self._lock:
+            comment_id = self._next_comment_id
+            self._next_comment_id += 1
+            comment = {
+                'id': comment_id,
+                'issue_number': pr_number,
+                'body': body,
+                'user': {'login': login or self.login},
+            }
+            self.comments[comment_id] = comment
+        return comment
+
+    def add_check_run(self, data: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            check_run_id = self._next_check_run_id
+            self._next_check_run_id += 1
+            output = data.get('output', {})
+            check_run = {
+                'id': check_run_id,
+                'name': data['name'],
+                'head_sha': data['head_sha'],
+                'status': data.get('status', 'queued'),
+                'conclusion': data.get('conclusion'),
+                'output': {'title': output.get('title'), 'summary': output.get('summary')},
+                'annotations': list(output.get('annotations', [])),
+            }
+            self.check_runs[check_run_id] = check_run
+        return check_run
+
+    def issue_comments(self, pr_number: int) -> list[dict[str, Any]]:
+        return [comment for comment in self.comments.values() if comment['issue_number'] == pr_number]
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError('The fake GitHub server is not started.')
+        host, port = self._server.server_address[:2]
+        return f'http://{host!s}:{port}'
+
+    def start(self) -> 'FakeGithub':
+        self._server = _FakeGithubServer(('127.0.0.1', 0), _FakeGithubHandler, fake=self)
+        threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+        log.debug('Fake GitHub server listening on %s', self.url)
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'FakeGithub':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class _FakeGithubServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, fake: FakeGithub):
+        super().__init__(server_address, handler_class)
+        self.fake = fake
+
+
+class _FakeGithubHandler(http.server.BaseHTTPRequestHandler):
+    server: _FakeGithubServer
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes, Nagle would hold the body back on a kept alive connection
+    disable_nagle_algorithm = True
+
+    ROUTES = [
+        ('GET', re.compile(r'^/user$'), 'get_user'),
+        ('GET', re.compile(r'^/repos/(?P<repo>[^/]+/[^/]+)/pulls$'), 'list_pulls'),
+        ('GET', re.compile(r'^/repos/(?P<repo>[^/]+/[^/]+)/pulls/(?P<number>\d+)$'), 'get_pull'),
+        ('GET', re.compile(r'^/repos/(?P<repo>[^/]+/[^/]+)/issues/(?P<number>\d+)/comments$'), 'list_comments'),
+        ('POST', re.compile(r'^/repos/(?P<repo>[^/]+/[^/]+)/issues/(?P<number>\d+)/comments$'), 'create_comment'),
+        ('PATCH', re.compile(r'^/repos/(?P<repo>[^/]+/[^/]+)/issues/comments/(?P<comment_id>\d+)$'), 'update_comment'),
+        ('DELETE', re.compile(r'^/repos/(?P<repo>[^/]+/[^/]+)/issues/comments/(?P<comment_id>\d+)$'), 'delete_comment'),
+        ('POST', re.compile(r'^/repos/(?P<repo>[^/]+/[^/]+)/check-runs$'), 'create_check_run'),
+        ('PATCH', re.compile(r'^/repos/(?P<repo>[^/]+/[^/]+)/check-runs/(?P<check_run_id>\d+)$'), 'update_check_run'),
+    ]
+
+    @property
+    def fake(self) -> FakeGithub:
+        return self.server.fake
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        log.debug('Fake GitHub: ' + format, *args)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self._dispatch('GET')
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self._dispatch('POST')
+
+    def do_PATCH(self):  # pylint: disable=invalid-name
+        self._dispatch('PATCH')
+
+    def do_DELETE(self):  # pylint: disable=invalid-name
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method: str) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else {}
+
+        with self.fake._lock:
+            self.fake.requests.append((method, url.path))
+            self.fake.rate_limit_remaining = max(self.fake.rate_limit_remaining - 1, 0)
+        time.sleep(self.fake.latency)
+
+        for route_method, pattern, name in self.ROUTES:
+            match = pattern.match(url.path)
+            if route_method != method or not match:
+                continue
+            params = match.groupdict()
+            if params.pop('repo', self.fake.repository) != self.fake.repository:
+                break
+            getattr(self, name)(query=query, body=body, **params)
+            return
+        self._send_json({'message': 'Not Found'}, status=404)
+
+    def _send(
+        self,
+        status: int,
+        content: bytes,
+        content_type: str | None,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('X-RateLimit-Limit', str(RATE_LIMIT))
+        self.send_header('X-RateLimit-Remaining', str(self.fake.rate_limit_remaining))
+        self.send_header('X-RateLimit-Used', str(RATE_LIMIT - self.fake.rate_limit_remaining))
+        self.send_header('X-RateLimit-Reset', str(self.fake.rate_limit_reset))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _send_json(self, data: Any, status: int = 200, headers: dict[str, str] | None = None) -> None:
+        self._send(status, json.dumps(data).encode(), 'application/json; charset=utf-8', headers)
+
+    def _send_page(self, items: list[Any], query: dict[str, str]) -> None:
+        per_page = int(query.get('per_page', self.fake.per_page))
+        page = int(query.get('page', 1))
+        last_page = max((len(items) + per_page - 1) // per_page, 1)
+        headers = {}
+        if page < last_page:
+            next_query = urllib.parse.urlencode(query | {'page': page + 1})
+            last_query = urllib.parse.urlencode(query | {'page': last_page})
+            path = urllib.parse.urlsplit(self.path).path
+            headers['Link'] = (
+                f'<{self.fake.url}{path}?{next_query}>; rel="next", <{self.fake.url}{path}?{last_query}>; rel="last"'
+            )
+        self._send_json(items[(page - 1) * per_page : page * per_page], headers=headers)
+
+    # Routes
+    def get_user(self, query, body):
+        self._send_json({'login': self.fake.login, 'id': 1, 'name': self.fake.login, 'email': None})
+
+    def list_pulls(self, query, body):
+        state = query.get('state', 'open')
+        pulls = [pr.as_json() for pr in self.fake.pull_requests.values() if state in ('all', pr.state)]
+        self._send_page(pulls, query)
+
+    def get_pull(self, query, body, number):
+        pull_request = self.fake.pull_requests.get(int(number))
+        if pull_request is None:
+            self._send_json({'message': 'Not Found'}, status=404)
+        elif self.headers.get('Accept') == DIFF_MEDIA_TYPE:
+            self._send(200, pull_request.diff.encode(), 'text/plain; charset=utf-8')
+        else:
+            self._send_json(pull_request.as_json())
+
+    def list_comments(self, query, body, number):
+        self._send_page(self.fake.issue_comments(int(number)), query)
+
+    def create_comment(self, query, body, number):
+        self._send_json(self.fake.add_comment(pr_number=int(number), body=body['body']), status=201)
+
+    def update_comment(self, query, body, comment_id):
+        comment = self.fake.comments.get(int(comment_id))
+        if comment is None:
+            self._send_json({'message': 'Not Found'}, status=404)
+            return
+        comment['body'] = body['body']
+        self._send_json(comment)
+
+    def delete_comment(self, query, body, comment_id):
+        if self.fake.comments.pop(int(comment_id), None) is None:
+            self._send_json({'message': 'Not Found'}, status=404)
+            return
+        self._send(204, b'', None)
+
+    def create_check_run(self, query, body):
+        if len(body.get('output', {}).get('annotations', [])) > MAX_ANNOTATIONS:
+            self._send_json({'message': 'Validation Failed'}, status=422)
+            return
+        self._send_json(self.fake.add_check_run(body), status=201)
+
+    def update_check_run(self, query, body, check_run_id):
+        check_run = self.fake.check_runs.get(int(check_run_id))
+        annotations = body.get('output', {}).get('annotations', [])
+        if check_run is None:
+            self._send_json({'message': 'Not Found'}, status=404)
+            return
+        if len(annotations) > MAX_ANNOTATIONS:
+            self._send_json({'message': 'Validation Failed'}, status=422)
+            return
+        with self.fake._lock:
+            # Annotations of every update are appended to the existing ones
+            check_run['annotations'].extend(annotations)
+        self._send_json(check_run)
@@ -0,0 +1,46 @@
+import pathlib
+
+from codecov import annotations
+
+
+def test_get_annotations(make_coverage, make_diff_coverage):
+    coverage = make_coverage(
+        """
+        # file: codebase/code.py
+        1 line covered
+        2 line missing
+        3 line covered
+        4 line missing
+        5 line missing
+        6 line missing
+        """
+    )
+    diff_coverage = make_diff_coverage(
+        added_lines={pathlib.Path('codebase/code.py'): [1, 2, 3, 4, 5, 6]},
+        coverage=coverage,
+    )
+
+    assert annotations.get_annotations(coverage=coverage, diff_coverage=diff_coverage) == [
+        {
+            'path': 'codebase/code.py',
+            'start_line': 2,
+            'end_line': 2,
+            'annotation_level': 'warning',
+            'title': 'Missing coverage',
+            'message': 'Added line #L2 is not covered by tests',
+        },
+        {
+            'path': 'codebase/code.py',
+            'start_line': 4,
+            'end_line': 6,
+            'annotation_level': 'warning',
+            'title': 'Missing coverage',
+            'message': 'Added lines #L4 - L6 are not covered by tests',
+        },
+    ]
+
+
+def test_get_annotations_fully_covered(coverage_obj, make_diff_coverage):
+    diff_coverage = make_diff_coverage(added_lines={pathlib.Path('codebase/code.py'): [1, 2]}, coverage=coverage_obj)
+
+    assert annotations.get_annotations(coverage=coverage_obj, diff_coverage=diff_coverage) == []
@@ -0,0 +1,107 @@
+import decimal
+import json
+import pathlib
+from unittest.mock import patch
+
+import pytest
+
+from codecov import template
+from codecov.api import Reporter
+from codecov.coverage.pytest import PytestCoverageHandler
+from codecov.exceptions import ConfigurationException, CoreProcessingException
+
+DIFF = (
+    'diff --git a/codebase/code.py b/codebase/code.py\n'
+    'index 0000000..1111111 100644\n'
+    '--- a/codebase/code.py\n'
+    '+++ b/codebase/code.py\n'
+    '@@ -1,4 +1,6 @@\n line\n line\n+line added\n line\n line\n+line added\n'
+)
+
+
+@pytest.fixture
+def settings(test_config) -> dict[str, str]:
+    return {'GITHUB_REPOSITORY': test_config.GITHUB_REPOSITORY, 'GITHUB_PR_NUMBER': str(test_config.GITHUB_PR_NUMBER)}
+
+
+def test_reporter_report(settings, coverage_file):
+    result = Reporter().report(settings, diff=DIFF, coverage=coverage_file)
+
+    assert result.diff_coverage.total_percent_covered == decimal.Decimal('0.5')
+    assert result.coverage.info.percent_covered == decimal.Decimal('0.6')
+    (comment,) = result.comments
+    assert result.text == comment
+    assert comment.startswith('## Coverage report')
+    assert template.MARKER in comment
+    assert f'/pull/{settings["GITHUB_PR_NUMBER"]}/' in comment
+
+
+def test_reporter_report_parsed_coverage(test_config, coverage_obj):
+    result = Reporter().report(test_config, diff=DIFF, coverage=coverage_obj)
+
+    assert result.coverage is coverage_obj
+    assert list(result.diff_coverage.files) == [pathlib.Path('codebase/code.py')]
+    assert template.MARKER in result.text
+
+
+def test_reporter_report_parsed_coverage_mapping(settings, coverage_obj):
+    result = Reporter().report(settings, diff=DIFF, coverage=coverage_obj)
+
+    assert result.coverage is coverage_obj
+    assert result.diff_coverage.total_percent_covered == decimal.Decimal('0.5')
+    assert template.MARKER in result.text
+
+
+def test_reporter_report_reuses_reports(settings, coverage_file, coverage_json):
+    reporter = Reporter()
+    with patch.object(
+        PytestCoverageHandler, 'get_coverage', autospec=True, side_effect=PytestCoverageHandler.get_coverage
+    ) as get_coverage:
+        first = reporter.report(settings, diff=DIFF, coverage=coverage_file)
+        second = reporter.report({**settings, 'COVERAGE_PATH': str(coverage_file)}, diff=DIFF)
+        assert get_coverage.call_count == 1
+        assert second.coverage is first.coverage
+
+        # A report rewritten in place is parsed again
+        coverage_json['totals']['percent_covered'] = 70.0
+        coverage_file.write_text(json.dumps(coverage_json, indent=2))
+        third = reporter.report(settings, diff=DIFF, coverage=coverage_file)
+        assert get_coverage.call_count == 2
+        assert third.coverage.info.percent_covered == decimal.Decimal('0.7')
+
+
+def test_reporter_report_custom_template(settings, coverage_file, tmp_path):
+    template_path = tmp_path / 'comment.md.j2'
+    template_path.write_text('Coverage {{ diff_coverage.total_percent_covered | pct }} {{ marker }}')
+    reporter = Reporter()
+
+    with patch('codecov.template.compile_template', side_effect=template.compile_template) as compile_template:
+        for _ in range(2):
+            result = reporter.report(
+                {**settings, 'TEMPLATE_PATH': str(template_path)}, diff=DIFF, coverage=coverage_file
+            )
+            assert result.text == f'Coverage 50% {template.MARKER}'
+    compile_template.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    'settings',
+    [
+        {},
+        {'GITHUB_REPOSITORY': 'example/foobar', 'GITHUB_PR_NUMBER': 'one'},
+        {'GITHUB_REPOSITORY': 'example/foobar', 'MAX_COMMENTS': '0'},
+    ],
+)
+def test_reporter_report_invalid_config(settings, coverage_file):
+    with pytest.raises(ConfigurationException):
+        Reporter().report(settings, diff=DIFF, coverage=coverage_file)
+
+
+def test_reporter_report_invalid_coverage(settings, tmp_path):
+    with pytest.raises(ConfigurationException):
+        Reporter().report(settings, diff=DIFF, coverage=tmp_path / 'missing.json')
+
+    coverage_path = tmp_path / 'coverage.json'
+    coverage_path.write_text('not json')
+    with pytest.raises(CoreProcessingException):
+        Reporter().report(settings, diff=DIFF, coverage=coverage_path)
@@ -0,0 +1,126 @@
+import dataclasses
+import json
+import os
+import pathlib
+from unittest.mock import patch
+
+import pytest
+
+from codecov import template
+from codecov.batch import Batch, load_jobs, main
+from codecov.coverage.pytest import PytestCoverageHandler
+from codecov.exceptions import ConfigurationException
+
+
+@pytest.fixture
+def jobs(fake_github, fake_github_environ, test_config) -> list[dict[str, str]]:
+    for number in (2, 3):
+        fake_github.add_pull_request(
+            number=number,
+            head_ref=f'feature/{number}',
+            diff=fake_github.pull_requests[test_config.GITHUB_PR_NUMBER].diff,
+        )
+    return [{'GITHUB_PR_NUMBER': str(number)} for number in (test_config.GITHUB_PR_NUMBER, 2, 3)]
+
+
+@pytest.fixture
+def jobs_path(tmp_path) -> pathlib.Path:
+    return tmp_path / 'jobs.json'
+
+
+def test_batch_run(fake_github, fake_github_environ, jobs, jobs_path, test_config):
+    jobs_path.write_text(json.dumps(jobs))
+    configs = load_jobs(jobs_path, environ=fake_github_environ)
+    batch = Batch(workers=2)
+    with patch.object(
+        PytestCoverageHandler, 'get_coverage', autospec=True, side_effect=PytestCoverageHandler.get_coverage
+    ) as get_coverage:
+        results = batch.run(configs)
+
+    assert [(result.pr_number, result.error) for result in results] == [
+        (test_config.GITHUB_PR_NUMBER, None),
+        (2, None),
+        (3, None),
+    ]
+    for number in (test_config.GITHUB_PR_NUMBER, 2, 3):
+        (comment,) = fake_github.issue_comments(number)
+        assert template.MARKER in comment['body']
+    # The jobs share the report and the HTTP session
+    get_coverage.assert_called_once()
+    assert len(batch.sessions) == 1
+    assert all(session.is_closed for session in batch.sessions.values())
+
+
+def test_batch_run_failed_job(fake_github, fake_github_environ, jobs, jobs_path, test_config):
+    jobs_path.write_text(json.dumps([*jobs, {'GITHUB_PR_NUMBER': '999'}]))
+    configs = load_jobs(jobs_path, environ=fake_github_environ)
+    results = Batch().run(configs)
+
+    assert [result.error is None for result in results] == [True, True, True, False]
+    assert results[-1].pr_number == 999
+
+
+def test_batch_run_unexpected_errors(fake_github, fake_github_environ, jobs, jobs_path, tmp_path, test_config):
+    malformed = tmp_path / 'malformed.json'
+    malformed.write_text('[1, 2]')
+    jobs_path.write_text(json.dumps([jobs[0], {**jobs[1], 'COVERAGE_PATH': str(malformed)}]))
+    configs = load_jobs(jobs_path, environ={**fake_github_environ, 'GITHUB_API_URL': 'http://127.0.0.1:9'})
+    results = Batch().run(configs)
+    assert [result.error is not None for result in results] == [True, True]
+
+    # Only the job with the malformed report fails
+    configs = load_jobs(jobs_path, environ=fake_github_environ)
+    results = Batch().run(configs)
+    assert [result.error is None for result in results] == [True, False]
+    assert len(fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)) == 1
+
+
+def test_load_jobs(jobs_path, fake_github_environ):
+    jobs_path.write_text(json.dumps([{'GITHUB_PR_NUMBER': 7}, {'GITHUB_PR_NUMBER': '8', 'MAX_COMMENTS': '2'}]))
+
+    configs = load_jobs(jobs_path, environ=fake_github_environ)
+
+    assert [(config.GITHUB_PR_NUMBER, config.MAX_COMMENTS) for config in configs] == [(7, 1), (8, 2)]
+    assert {config.GITHUB_REPOSITORY for config in configs} == {fake_github_environ['GITHUB_REPOSITORY']}
+
+
+@pytest.mark.parametrize('contents', ['not json', '{"GITHUB_PR_NUMBER": 1}', '[1]', '[{"MAX_COMMENTS": "0"}]'])
+def test_load_jobs_invalid(tmp_path, jobs_path, fake_github_environ, contents):
+    jobs_path.write_text(contents)
+    with pytest.raises(ConfigurationException):
+        load_jobs(jobs_path, environ=fake_github_environ)
+
+    with pytest.raises(ConfigurationException):
+        load_jobs(tmp_path / 'missing.json', environ=fake_github_environ)
+
+
+def test_main(fake_github, fake_github_environ, jobs, jobs_path):
+    jobs_path.write_text(json.dumps(jobs))
+    with patch.dict(os.environ, fake_github_environ, clear=True):
+        with patch('sys.argv', ['codecov-batch', str(jobs_path)]):
+            main()
+
+        jobs_path.write_text(json.dumps([*jobs, {'GITHUB_PR_NUMBER': '999'}]))
+        with patch('sys.argv', ['codecov-batch', str(jobs_path), '--workers', '1']):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+        assert exc_info.value.code == 1
+
+        jobs_path.write_text('[1]')
+        with patch('sys.argv', ['codecov-batch', str(jobs_path)]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+        assert exc_info.value.code == 1
+
+
+def test_batch_get_coverage_max_reports(test_config):
+    batch = Batch(max_reports=2)
+    configs = [dataclasses.replace(test_config, COVERAGE_PATH=pathlib.Path(f'{name}.json')) for name in 'abc']
+
+    assert batch.get_coverage(configs[0], parse=lambda: 'a') == 'a'
+    assert batch.get_coverage(configs[1], parse=lambda: 'b') == 'b'
+    # A hit makes the report the most recently used one
+    assert batch.get_coverage(configs[0], parse=lambda: 'other') == 'a'
+    assert batch.get_coverage(configs[2], parse=lambda: 'c') == 'c'
+
+    assert list(batch.coverages.values()) == ['a', 'c']
@@ -38,6 +38,9 @@ def test_config_from_environ_missing():
     with pytest.raises(MissingEnvironmentVariable):
         config.Config.from_environ({})
 
+    with pytest.raises(MissingEnvironmentVariable, match='GITHUB_REPOSITORY'):
+        config.Config.from_environ({}, defaults={'COVERAGE_PATH': []})
+
 
 def test_config_from_environ_sample():
     token = secrets.token_urlsafe()
@@ -119,6 +122,11 @@ def test_config_clean_complete_project_report():
     assert value is True
 
 
+def test_config_clean_reference_links():
+    value = config.Config.clean_reference_links('true')
+    assert value is True
+
+
 def test_config_clean_skip_covered_files_in_report():
     value = config.Config.clean_skip_covered_files_in_report('True')
     assert value is True
@@ -134,12 +142,128 @@ def test_config_clean_github_pr_number():
     assert value == 123
 
 
+def test_config_clean_max_comments():
+    assert config.Config.clean_max_comments('3') == 3
+
+
+def test_config_max_comments_positive():
+    with pytest.raises(ValueError):
+        config.Config(
+            GITHUB_REPOSITORY='your_repository',
+            COVERAGE_PATH=pathlib.Path('coverage.json'),
+            GITHUB_TOKEN='your_token',  # noqa: S106
+            GITHUB_PR_NUMBER=123,
+            MAX_COMMENTS=0,
+        )
+
+
+def test_config_clean_comment_deadline_seconds():
+    value = config.Config.clean_comment_deadline_seconds('90.5')
+    assert value == 90.5
+
+
+def test_config_comment_deadline_seconds_positive():
+    with pytest.raises(ValueError):
+        config.Config(
+            GITHUB_REPOSITORY='your_repository',
+            COVERAGE_PATH=pathlib.Path('coverage.json'),
+            GITHUB_TOKEN='your_token',  # noqa: S106
+            GITHUB_PR_NUMBER=123,
+            COMMENT_DEADLINE_SECONDS=0,
+        )
+
+
+def test_config_clean_outputs():
+    assert config.Config.clean_outputs('comment') == [config.OutputType.COMMENT]
+    assert config.Config.clean_outputs('check-run, comment,') == [
+        config.OutputType.CHECK_RUN,
+        config.OutputType.COMMENT,
+    ]
+    assert config.Config.clean_outputs('step-summary,json') == [
+        config.OutputType.STEP_SUMMARY,
+        config.OutputType.JSON,
+    ]
+    with pytest.raises(ValueError):
+        config.Config.clean_outputs('foo')
+
+
+def test_config_clean_report_paths():
+    assert config.Config.clean_github_step_summary('summary.md') == pathlib.Path('summary.md')
+    assert config.Config.clean_json_report_path('report.json') == pathlib.Path('report.json')
+    assert config.Config.clean_markdown_report_path('report.md') == pathlib.Path('report.md')
+
+
+def test_config_offline(tmp_path):
+    with tempfile.NamedTemporaryFile(suffix='.json') as temp_file:
+        environ = {
+            'GITHUB_REPOSITORY': 'your_repository',
+            'COVERAGE_PATH': temp_file.name,
+            'DIFF_PATH': '-',
+            'OUTPUTS': 'markdown',
+            'MARKDOWN_REPORT_PATH': '-',
+        }
+        offline_config = config.Config.from_environ(environ)
+        assert offline_config.offline is True
+        assert offline_config.GITHUB_TOKEN == ''
+        assert offline_config.GITHUB_PR_NUMBER is None
+
+        # Posting the comment needs the token and the pull request
+        with pytest.raises(ValueError):
+            config.Config.from_environ(environ | {'OUTPUTS': 'markdown,comment'})
+        with pytest.raises(ValueError):
+            config.Config.from_environ(environ | {'OUTPUTS': 'markdown,comment', 'GITHUB_TOKEN': 'your_token'})
+
+
+def test_config_clean_diff_path(tmp_path):
+    diff_path = tmp_path / 'pr.diff'
+    diff_path.write_text('')
+    assert config.Config.clean_diff_path(str(diff_path)) == diff_path.resolve()
+    assert config.Config.clean_diff_path('-') == config.STDIO_PATH
+    with pytest.raises(ValueError):
+        config.Config.clean_diff_path(str(tmp_path / 'missing.diff'))
+
+
+def test_config_outputs_required():
+    with pytest.raises(ValueError):
+        config.Config(
+            GITHUB_REPOSITORY='your_repository',
+            COVERAGE_PATH=pathlib.Path('coverage.json'),
+            GITHUB_TOKEN='your_token',  # noqa: S106
+            GITHUB_PR_NUMBER=123,
+            OUTPUTS=[],
+        )
+
+
+def test_config_clean_template_path(tmp_path):
+    template_path = tmp_path / 'comment.md.j2'
+    with pytest.raises(ValueError):
+        config.Config.clean_template_path(str(template_path))
+
+    template_path.write_text('{{ marker }}')
+    assert config.Config.clean_template_path(str(template_path)) == template_path.resolve()
+
+
 def test_config_clean_coverage_path():
     with tempfile.NamedTemporaryFile(suffix='.json') as temp_file:
         value = config.Config.clean_coverage_path(temp_file.name)
         assert value == pathlib.Path(temp_file.name).resolve()
 
 
+def test_config_clean_coverage_path_several(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'reports').mkdir()
+    for name in ('reports/b.json', 'reports/a.json', 'other.json'):
+        (tmp_path / name).write_text('{}')
+
+    paths = config.Config.clean_coverage_path('reports/*.json, other.json, reports/a.json')
+    assert paths == [tmp_path / 'reports/a.json', tmp_path / 'reports/b.json', tmp_path / 'other.json']
+    assert config.Config.clean_coverage_path('other*.json') == tmp_path / 'other.json'
+    with pytest.raises(ValueError):
+        config.Config.clean_coverage_path('missing/*.json')
+    with pytest.raises(ValueError):
+        config.Config.clean_coverage_path('reports/*.json,missing.json')
+
+
 def test_str_to_bool_invalid():
     assert config.str_to_bool('invalid') is False
 
@@ -0,0 +1,105 @@
+import http.server
+import json
+import secrets
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from codecov.deadline import Deadline
+from codecov.exceptions import DeadlineExceeded
+from codecov.github_client import TIMEOUT, GitHubClient
+
+
+class SlowHandler(http.server.BaseHTTPRequestHandler):
+    # Seconds to wait before answering, per path
+    delays = {'/slow': 5.0, '/fast': 0.0}
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        time.sleep(self.delays.get(self.path, 0.0))
+        body = json.dumps({'path': self.path}).encode()
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            # The client gave up waiting
+            pass
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture
+def slow_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_deadline_unbounded():
+    deadline = Deadline()
+
+    assert deadline.remaining() is None
+    assert deadline.expired() is False
+    assert deadline.timeout(60) == 60
+    deadline.check('testing')
+
+
+def test_deadline_remaining():
+    deadline = Deadline(30)
+
+    assert 0 < deadline.remaining() <= 30
+    assert deadline.timeout(60) <= 30
+    assert deadline.timeout(10) == 10
+    deadline.check('testing')
+
+
+def test_deadline_expired():
+    with patch('codecov.deadline.time.monotonic', side_effect=[100.0, 131.0, 131.0]):
+        deadline = Deadline(30)
+
+        assert deadline.expired() is True
+        with pytest.raises(DeadlineExceeded):
+            deadline.check('testing')
+
+
+def test_github_client_fast_endpoint(slow_server):
+    client = GitHubClient(token=secrets.token_hex(16), url=slow_server, deadline=Deadline(5))
+
+    assert client.fast.get() == {'path': '/fast'}
+
+
+def test_github_client_slow_endpoint_cancelled(slow_server):
+    client = GitHubClient(token=secrets.token_hex(16), url=slow_server, deadline=Deadline(0.5))
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        client.slow.get()
+
+    # The request is cut at the deadline instead of waiting for the endpoint or the 60s TIMEOUT
+    assert time.monotonic() - start < 3
+
+
+def test_github_client_no_request_after_deadline(slow_server):
+    client = GitHubClient(token=secrets.token_hex(16), url=slow_server, deadline=Deadline(0.5))
+    with pytest.raises(DeadlineExceeded):
+        client.slow.get()
+
+    with patch.object(client.session, 'request') as request_mock:
+        with pytest.raises(DeadlineExceeded):
+            client.fast.get()
+        request_mock.assert_not_called()
+
+
+def test_github_client_timeout_without_deadline(session, gh_client):
+    session.register('GET', '/repos', timeout=TIMEOUT)(json={'foo': 'bar'})
+
+    assert gh_client.repos.get() == {'foo': 'bar'}
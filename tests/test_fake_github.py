@@ -0,0 +1,278 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from codecov import shards, template
+from codecov.exceptions import NotFound
+from codecov.github import CLAIM_ATTEMPTS, Github
+from codecov.github_client import GitHubClient
+from codecov.main import Main
+from tests.fake_github import RATE_LIMIT, FakeGithub
+
+
+@pytest.fixture
+def fake_client(fake_github, test_config) -> GitHubClient:
+    return GitHubClient(token=test_config.GITHUB_TOKEN, url=fake_github.url)
+
+
+def test_fake_github_not_started():
+    with pytest.raises(RuntimeError):
+        _ = FakeGithub().url
+
+
+def test_fake_github_user(fake_github, fake_client):
+    assert fake_client.user.get().login == fake_github.login
+
+
+def test_fake_github_pull_request(fake_github, fake_client, test_config):
+    pulls_path = fake_client.repos(test_config.GITHUB_REPOSITORY).pulls
+
+    pull_request = pulls_path(test_config.GITHUB_PR_NUMBER).get()
+    assert pull_request.number == test_config.GITHUB_PR_NUMBER
+    assert pull_request.head.ref == 'feature/branch'
+
+    diff = pulls_path(test_config.GITHUB_PR_NUMBER).get(
+        use_text=True,
+        headers={'Accept': 'application/vnd.github.v3.diff'},
+    )
+    assert diff == fake_github.pull_requests[test_config.GITHUB_PR_NUMBER].diff
+
+    assert [pr.number for pr in pulls_path.get(state='open')] == [test_config.GITHUB_PR_NUMBER]
+    with pytest.raises(NotFound):
+        pulls_path(999).get()
+    with pytest.raises(NotFound):
+        fake_client.repos('other/repo').pulls(test_config.GITHUB_PR_NUMBER).get()
+
+
+def test_fake_github_comments(fake_github, fake_client, test_config):
+    comments_path = fake_client.repos(test_config.GITHUB_REPOSITORY).issues.comments
+    issue_comments_path = fake_client.repos(test_config.GITHUB_REPOSITORY).issues(test_config.GITHUB_PR_NUMBER).comments
+
+    comment = issue_comments_path.post(body='hello')
+    assert comment.body == 'hello'
+    assert comments_path(comment.id).patch(body='bye').body == 'bye'
+    assert [c['body'] for c in fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)] == ['bye']
+
+    comments_path(comment.id).delete()
+    assert fake_github.issue_comments(test_config.GITHUB_PR_NUMBER) == []
+    with pytest.raises(NotFound):
+        comments_path(comment.id).patch(body='bye')
+    with pytest.raises(NotFound):
+        comments_path(comment.id).delete()
+
+
+def test_fake_github_pagination_and_rate_limit(fake_github, test_config):
+    for i in range(45):
+        fake_github.add_comment(pr_number=test_config.GITHUB_PR_NUMBER, body=f'comment {i}')
+    path = f'/repos/{test_config.GITHUB_REPOSITORY}/issues/{test_config.GITHUB_PR_NUMBER}/comments'
+
+    with httpx.Client(base_url=fake_github.url) as client:
+        first = client.get(path)
+        last = client.get(path, params={'per_page': 20, 'page': 3})
+
+    assert len(first.json()) == fake_github.per_page
+    assert 'rel="next"' in first.headers['Link']
+    assert [c['body'] for c in last.json()] == [f'comment {i}' for i in range(40, 45)]
+    assert 'Link' not in last.headers
+    assert int(first.headers['X-RateLimit-Remaining']) == RATE_LIMIT - 1
+    assert int(last.headers['X-RateLimit-Remaining']) == RATE_LIMIT - 2
+    assert fake_github.requests == [('GET', path), ('GET', path)]
+
+
+def test_post_comment_finds_marker_past_first_page(fake_github, fake_client, test_config):
+    for i in range(150):
+        fake_github.add_comment(pr_number=test_config.GITHUB_PR_NUMBER, body=f'comment {i}', login='someone')
+    existing = fake_github.add_comment(pr_number=test_config.GITHUB_PR_NUMBER, body=f'old report {template.MARKER}')
+
+    gh = Github(client=fake_client, repository=test_config.GITHUB_REPOSITORY, pr_number=test_config.GITHUB_PR_NUMBER)
+    gh.post_comment(contents=f'new report {template.MARKER}', marker=template.MARKER)
+
+    assert len(fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)) == 151
+    assert fake_github.comments[existing['id']]['body'] == f'new report {template.MARKER}'
+
+
+def test_post_comments_updates_parts(fake_github, fake_client, test_config):
+    other = fake_github.add_comment(
+        pr_number=test_config.GITHUB_PR_NUMBER, body=f'quoted {template.MARKER}', login='someone'
+    )
+    gh = Github(client=fake_client, repository=test_config.GITHUB_REPOSITORY, pr_number=test_config.GITHUB_PR_NUMBER)
+
+    def report(count: int, run: int) -> list[str]:
+        return [
+            f'run {run} part {part} {shards.get_part_marker(template.MARKER, part)}' for part in range(1, count + 1)
+        ]
+
+    def bodies() -> list[str]:
+        return [c['body'] for c in fake_github.issue_comments(test_config.GITHUB_PR_NUMBER) if c['id'] != other['id']]
+
+    gh.post_comments(contents=report(3, run=1), marker=template.MARKER)
+    assert bodies() == report(3, run=1)
+    ids = [c['id'] for c in fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)]
+
+    # Parts still needed are updated in place, the last one is deleted
+    gh.post_comments(contents=report(2, run=2), marker=template.MARKER)
+    assert bodies() == report(2, run=2)
+    assert [c['id'] for c in fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)] == ids[:3]
+
+    gh.post_comments(contents=report(4, run=3), marker=template.MARKER)
+    assert bodies() == report(4, run=3)
+    assert fake_github.comments[other['id']]['body'] == f'quoted {template.MARKER}'
+
+
+def test_post_comments_lease(fake_github, fake_client, test_config):
+    gh = Github(client=fake_client, repository=test_config.GITHUB_REPOSITORY, pr_number=test_config.GITHUB_PR_NUMBER)
+    report = f'report {template.MARKER}'
+
+    assert gh.claim_comments(marker=template.MARKER, lease=(1, 1, 10)) is True
+    assert gh.post_comments(contents=[report], marker=template.MARKER, lease=(1, 1, 10)) is True
+    (comment,) = fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)
+    assert shards.get_lease(comment['body']) == (1, 1, 10)
+
+    # A newer run claims the comment, the older one then leaves it alone
+    assert gh.claim_comments(marker=template.MARKER, lease=(2, 1, 5)) is True
+    assert gh.claim_comments(marker=template.MARKER, lease=(1, 1, 10)) is False
+    assert gh.post_comments(contents=['old ' + report], marker=template.MARKER, lease=(1, 1, 10)) is False
+    assert fake_github.comments[comment['id']]['body'] == f'<!-- codecov run 2.1.5 -->\n{report}'
+
+    assert gh.post_comments(contents=['new ' + report], marker=template.MARKER, lease=(2, 1, 5)) is True
+    assert fake_github.comments[comment['id']]['body'] == f'<!-- codecov run 2.1.5 -->\nnew {report}'
+    assert len(fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)) == 1
+
+
+def test_claim_comments_concurrent_first_parts(fake_github, fake_client, test_config):
+    gh = Github(client=fake_client, repository=test_config.GITHUB_REPOSITORY, pr_number=test_config.GITHUB_PR_NUMBER)
+    # Two older runs both found no comment and created a first part
+    for lease in [(1, 1, 5), (1, 1, 10)]:
+        fake_github.add_comment(test_config.GITHUB_PR_NUMBER, shards.set_lease(f'placeholder {template.MARKER}', lease))
+
+    assert gh.claim_comments(marker=template.MARKER, lease=(1, 1, 7)) is False
+    assert gh.claim_comments(marker=template.MARKER, lease=(1, 1, 10)) is True
+    (comment,) = fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)
+    assert shards.get_lease(comment['body']) == (1, 1, 10)
+
+
+def test_claim_comments_overwritten_lease(fake_github, fake_client, test_config):
+    gh = Github(client=fake_client, repository=test_config.GITHUB_REPOSITORY, pr_number=test_config.GITHUB_PR_NUMBER)
+    comment = fake_github.add_comment(test_config.GITHUB_PR_NUMBER, f'report {template.MARKER}')
+    update_comment = gh._update_comment
+
+    def update_then_overwrite(comment_id, contents):
+        update_comment(comment_id, contents)
+        # An older run reading the comment at the same time writes its lease last
+        fake_github.comments[comment_id]['body'] = shards.set_lease(contents, (1, 1, 5))
+
+    with patch.object(gh, '_update_comment', side_effect=update_then_overwrite) as update_mock:
+        assert gh.claim_comments(marker=template.MARKER, lease=(1, 1, 10)) is True
+    assert update_mock.call_count == CLAIM_ATTEMPTS
+
+    assert gh.claim_comments(marker=template.MARKER, lease=(1, 1, 10)) is True
+    assert shards.get_lease(fake_github.comments[comment['id']]['body']) == (1, 1, 10)
+
+
+def test_main_run_coalesce_comments_interleaved(fake_github, fake_github_environ, test_config):
+    """Two first runs both find no comment, both create one, and only the newest report is left."""
+    environ = fake_github_environ | {'COALESCE_COMMENTS': 'true', 'GITHUB_RUN_ATTEMPT': '1'}
+    runs = []
+    for run_id in ('19', '20'):
+        with patch.dict(os.environ, environ | {'GITHUB_RUN_ID': run_id}, clear=True):
+            runs.append(Main())
+
+    barrier = threading.Barrier(len(runs), timeout=10)
+    create_comments = Github._create_comments
+
+    def create_together(self, contents):
+        # Both runs listed the comments before either of them creates one
+        barrier.wait()
+        create_comments(self, contents)
+
+    with patch.object(Github, '_create_comments', autospec=True, side_effect=create_together):
+        with ThreadPoolExecutor(max_workers=len(runs)) as executor:
+            for future in [executor.submit(run.run) for run in runs]:
+                future.result()
+
+    (comment,) = fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)
+    assert shards.get_lease(comment['body'])[:2] == (20, 1)
+    assert comment['body'].split('\n', 1)[1].startswith('## Coverage report')
+    assert runs[1].superseded is False
+
+
+def test_main_run_coalesce_comments(fake_github, fake_github_environ, test_config):
+    environ = fake_github_environ | {'COALESCE_COMMENTS': 'true', 'GITHUB_RUN_ID': '20', 'GITHUB_RUN_ATTEMPT': '1'}
+    with patch.dict(os.environ, environ, clear=True):
+        Main().run()
+    (comment,) = fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)
+    assert shards.get_lease(comment['body'])[:2] == (20, 1)
+    assert comment['body'].split('\n', 1)[1].startswith('## Coverage report')
+
+    # A run triggered earlier, finishing late, does not overwrite the report
+    fake_github.comments[comment['id']]['body'] = shards.set_lease('newest report ' + template.MARKER, (20, 1, 0))
+    with patch.dict(os.environ, environ | {'GITHUB_RUN_ID': '19'}, clear=True):
+        main = Main()
+        main.run()
+    assert main.superseded is True
+    assert fake_github.comments[comment['id']]['body'].endswith('newest report ' + template.MARKER)
+
+
+def test_main_run_against_fake_github(fake_github, fake_github_environ, test_config):
+    with patch.dict(os.environ, fake_github_environ, clear=True):
+        Main().run()
+
+    comments = fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)
+    assert len(comments) == 1
+    assert comments[0]['body'].startswith('## Coverage report')
+    assert template.MARKER in comments[0]['body']
+
+    with patch.dict(os.environ, fake_github_environ, clear=True):
+        Main().run()
+
+    # The second run updates the comment of the first one
+    assert [c['id'] for c in fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)] == [comments[0]['id']]
+
+
+def test_main_run_diff_path_against_fake_github(fake_github, fake_github_environ, test_config, tmp_path):
+    diff_path = tmp_path / 'pr.diff'
+    diff_path.write_text(fake_github.pull_requests[test_config.GITHUB_PR_NUMBER].diff)
+    with patch.dict(os.environ, fake_github_environ | {'DIFF_PATH': str(diff_path)}, clear=True):
+        Main().run()
+
+    assert len(fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)) == 1
+    # The pull request is looked up, its diff is not downloaded
+    path = f'/repos/{test_config.GITHUB_REPOSITORY}/pulls/{test_config.GITHUB_PR_NUMBER}'
+    assert fake_github.requests.count(('GET', path)) == 1
+
+
+def test_main_run_check_run_against_fake_github(fake_github, fake_github_environ, test_config):
+    with patch.dict(os.environ, fake_github_environ | {'OUTPUTS': 'check-run'}, clear=True):
+        Main().run()
+
+    assert fake_github.issue_comments(test_config.GITHUB_PR_NUMBER) == []
+    (check_run,) = fake_github.check_runs.values()
+    assert check_run['name'] == 'codecov'
+    assert check_run['output']['title'] == 'PR coverage 50%'
+    # Line 6 is the only added line missing coverage
+    assert [(a['path'], a['start_line'], a['end_line']) for a in check_run['annotations']] == [
+        ('codebase/code.py', 6, 6)
+    ]
+
+    with patch.dict(os.environ, fake_github_environ | {'OUTPUTS': 'comment, check-run'}, clear=True):
+        Main().run()
+
+    assert len(fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)) == 1
+    assert len(fake_github.check_runs) == 2
+    # The head commit comes with the pull request, looked up once per run
+    path = f'/repos/{test_config.GITHUB_REPOSITORY}/pulls/{test_config.GITHUB_PR_NUMBER}'
+    assert fake_github.requests.count(('GET', path)) == 2 * 2
+
+
+def test_main_run_custom_template_against_fake_github(fake_github, fake_github_environ, test_config, tmp_path):
+    template_path = tmp_path / 'comment.md.j2'
+    template_path.write_text('Custom {{ diff_coverage.total_percent_covered | pct }}\n{{ marker }}')
+    with patch.dict(os.environ, fake_github_environ | {'TEMPLATE_PATH': str(template_path)}, clear=True):
+        Main().run()
+
+    (comment,) = fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)
+    assert comment['body'] == f'Custom 50%\n{template.MARKER}'
@@ -3,8 +3,9 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from codecov.exceptions import CannotGetPullRequest, CannotGetUser, CannotPostComment
-from codecov.github import Github, GithubDiffParser, User
+from codecov.exceptions import CannotGetPullRequest, CannotGetUser, CannotPostCheckRun, CannotPostComment
+from codecov.github import ANNOTATIONS_PER_REQUEST, Github, GithubDiffParser, User
+from codecov.github_client import GitHubClient
 
 TEST_DATA_PR_DIFF = 'diff --git a/file.py b/file.py\nindex 1234567..abcdefg 100644\n--- a/file.py\n+++ b/file.py\n@@ -1,2 +1,2 @@\n-foo\n+bar\n-baz\n+qux\n'
 
@@ -78,7 +79,7 @@ class TestGitHub:
         )
         assert gh.user == User(name='bar', email='baz', login='foo')
         gh_init_pr_number_mock.assert_called_once()
-        gh_init_pr_diff_mock.assert_called_once()
+        gh_init_pr_diff_mock.assert_not_called()
 
     @patch.object(Github, '_init_pr_diff', return_value=TEST_DATA_PR_DIFF)
     @patch.object(Github, '_init_user', return_value=User(name='bar', email='baz@foobar.com', login='foo'))
@@ -139,7 +140,11 @@ class TestGitHub:
         gh_init_user_mock.reset_mock()
 
         session.register('GET', f'/repos/{test_config.GITHUB_REPOSITORY}/pulls/{test_config.GITHUB_PR_NUMBER}')(
-            json={'number': test_config.GITHUB_PR_NUMBER, 'head': {'ref': 'feature/branch'}, 'state': 'open'}
+            json={
+                'number': test_config.GITHUB_PR_NUMBER,
+                'head': {'ref': 'feature/branch', 'sha': 'abc123'},
+                'state': 'open',
+            }
         )
         gh = Github(
             client=gh_client,
@@ -148,8 +153,10 @@ class TestGitHub:
         )
         assert gh.pr_number == test_config.GITHUB_PR_NUMBER
         assert gh.base_ref == 'feature/branch'
+        # Known without another request
+        assert gh.head_sha == 'abc123'
         gh_init_user_mock.assert_called_once()
-        gh_init_pr_diff_mock.assert_called_once()
+        gh_init_pr_diff_mock.assert_not_called()
 
     @patch.object(Github, '_init_pr_diff', return_value=TEST_DATA_PR_DIFF)
     @patch.object(Github, '_init_user', return_value=User(name='bar', email='baz@foobar.com', login='foo'))
@@ -197,8 +204,12 @@ class TestGitHub:
 
         session.register('GET', f'/repos/{test_config.GITHUB_REPOSITORY}/pulls')(
             json=[
-                {'head': {'ref': 'feature/not-the-right-branch'}, 'number': 124, 'state': 'open'},
-                {'head': {'ref': 'feature/branch'}, 'number': test_config.GITHUB_PR_NUMBER, 'state': 'open'},
+                {'head': {'ref': 'feature/not-the-right-branch', 'sha': 'def456'}, 'number': 124, 'state': 'open'},
+                {
+                    'head': {'ref': 'feature/branch', 'sha': 'abc123'},
+                    'number': test_config.GITHUB_PR_NUMBER,
+                    'state': 'open',
+                },
             ]
         )
         gh = Github(
@@ -207,8 +218,9 @@ class TestGitHub:
             ref=test_config.GITHUB_REF,
         )
         assert gh.pr_number == test_config.GITHUB_PR_NUMBER
+        assert gh.head_sha == 'abc123'
         gh_init_user_mock.assert_called_once()
-        gh_init_pr_diff_mock.assert_called_once()
+        gh_init_pr_diff_mock.assert_not_called()
 
     @patch.object(Github, '_init_pr_number', return_value=(123, 'feature/branch'))
     @patch.object(Github, '_init_user', return_value=User(name='bar', email='baz@foobar.com', login='foo'))
@@ -223,12 +235,14 @@ class TestGitHub:
         session.register('GET', f'/repos/{test_config.GITHUB_REPOSITORY}/pulls/{test_config.GITHUB_PR_NUMBER}')(
             status_code=403
         )
+        gh = Github(
+            client=gh_client,
+            repository=test_config.GITHUB_REPOSITORY,
+            pr_number=test_config.GITHUB_PR_NUMBER,
+        )
+        # Downloaded on first use only
         with pytest.raises(CannotGetPullRequest):
-            Github(
-                client=gh_client,
-                repository=test_config.GITHUB_REPOSITORY,
-                pr_number=test_config.GITHUB_PR_NUMBER,
-            )
+            _ = gh.pr_diff
         gh_init_user_mock.assert_called_once()
         gh_init_pr_number_mock.assert_called_once()
         gh_init_user_mock.reset_mock()
@@ -237,12 +251,14 @@ class TestGitHub:
         session.register('GET', f'/repos/{test_config.GITHUB_REPOSITORY}/pulls/{test_config.GITHUB_PR_NUMBER}')(
             status_code=404
         )
+        gh = Github(
+            client=gh_client,
+            repository=test_config.GITHUB_REPOSITORY,
+            pr_number=test_config.GITHUB_PR_NUMBER,
+        )
+        # Downloaded on first use only
         with pytest.raises(CannotGetPullRequest):
-            Github(
-                client=gh_client,
-                repository=test_config.GITHUB_REPOSITORY,
-                pr_number=test_config.GITHUB_PR_NUMBER,
-            )
+            _ = gh.pr_diff
         gh_init_user_mock.assert_called_once()
         gh_init_pr_number_mock.assert_called_once()
         gh_init_user_mock.reset_mock()
@@ -280,7 +296,7 @@ class TestGitHub:
             ).post_comment(contents='a' * 65537, marker='marker')
         gh_init_user_mock.assert_called_once()
         gh_init_pr_number_mock.assert_called_once()
-        gh_init_pr_diff_mock.assert_called_once()
+        gh_init_pr_diff_mock.assert_not_called()
         gh_init_user_mock.reset_mock()
         gh_init_pr_number_mock.reset_mock()
         gh_init_pr_diff_mock.reset_mock()
@@ -301,7 +317,7 @@ class TestGitHub:
             ).post_comment(contents='hi!', marker='marker')
         gh_init_user_mock.assert_called_once()
         gh_init_pr_number_mock.assert_called_once()
-        gh_init_pr_diff_mock.assert_called_once()
+        gh_init_pr_diff_mock.assert_not_called()
         gh_init_user_mock.reset_mock()
         gh_init_pr_number_mock.reset_mock()
         gh_init_pr_diff_mock.reset_mock()
@@ -322,7 +338,7 @@ class TestGitHub:
         gh.post_comment(contents='hi!', marker='marker')
         gh_init_user_mock.assert_called_once()
         gh_init_pr_number_mock.assert_called_once()
-        gh_init_pr_diff_mock.assert_called_once()
+        gh_init_pr_diff_mock.assert_not_called()
 
     @patch.object(Github, '_init_pr_diff', return_value=TEST_DATA_PR_DIFF)
     @patch.object(Github, '_init_pr_number', return_value=(123, 'feature/branch'))
@@ -362,7 +378,7 @@ class TestGitHub:
             ).post_comment(contents='hi!', marker='marker')
         gh_init_user_mock.assert_called_once()
         gh_init_pr_number_mock.assert_called_once()
-        gh_init_pr_diff_mock.assert_called_once()
+        gh_init_pr_diff_mock.assert_not_called()
         gh_init_user_mock.reset_mock()
         gh_init_pr_number_mock.reset_mock()
         gh_init_pr_diff_mock.reset_mock()
@@ -383,7 +399,7 @@ class TestGitHub:
             ).post_comment(contents='hi!', marker='marker')
         gh_init_user_mock.assert_called_once()
         gh_init_pr_number_mock.assert_called_once()
-        gh_init_pr_diff_mock.assert_called_once()
+        gh_init_pr_diff_mock.assert_not_called()
         gh_init_user_mock.reset_mock()
         gh_init_pr_number_mock.reset_mock()
         gh_init_pr_diff_mock.reset_mock()
@@ -404,7 +420,81 @@ class TestGitHub:
         gh.post_comment(contents='hi!', marker='marker')
         gh_init_user_mock.assert_called_once()
         gh_init_pr_number_mock.assert_called_once()
-        gh_init_pr_diff_mock.assert_called_once()
+        gh_init_pr_diff_mock.assert_not_called()
+
+    @patch.object(Github, '_init_pr_diff', return_value=TEST_DATA_PR_DIFF)
+    @patch.object(Github, '_init_pr_number', return_value=(123, 'feature/branch'))
+    @patch.object(Github, '_init_user', return_value=User(name='bar', email='baz@foobar.com', login='foo'))
+    def test_head_sha(
+        self,
+        gh_init_user_mock: MagicMock,
+        gh_init_pr_number_mock: MagicMock,
+        gh_init_pr_diff_mock: MagicMock,
+        session,
+        test_config,
+        gh_client,
+    ):
+        session.register('GET', f'/repos/{test_config.GITHUB_REPOSITORY}/pulls/123')(status_code=404)
+        gh = Github(client=gh_client, repository=test_config.GITHUB_REPOSITORY, pr_number=123)
+        with pytest.raises(CannotGetPullRequest):
+            _ = gh.head_sha
+
+        session.register('GET', f'/repos/{test_config.GITHUB_REPOSITORY}/pulls/123')(
+            json={'number': 123, 'head': {'ref': 'feature/branch', 'sha': 'abc123'}, 'state': 'open'}
+        )
+        gh = Github(client=gh_client, repository=test_config.GITHUB_REPOSITORY, pr_number=123)
+        assert gh.head_sha == 'abc123'
+        # Cached, no second request is registered
+        assert gh.head_sha == 'abc123'
+
+    @patch.object(Github, '_init_pr_diff', return_value=TEST_DATA_PR_DIFF)
+    @patch.object(Github, '_init_pr_number', return_value=(123, 'feature/branch'))
+    @patch.object(Github, '_init_user', return_value=User(name='bar', email='baz@foobar.com', login='foo'))
+    @pytest.mark.parametrize('status_code', [403, 422])
+    def test_post_check_run_error(
+        self,
+        gh_init_user_mock: MagicMock,
+        gh_init_pr_number_mock: MagicMock,
+        gh_init_pr_diff_mock: MagicMock,
+        status_code,
+        session,
+        test_config,
+        gh_client,
+    ):
+        session.register('POST', f'/repos/{test_config.GITHUB_REPOSITORY}/check-runs')(status_code=status_code)
+        gh = Github(client=gh_client, repository=test_config.GITHUB_REPOSITORY, pr_number=123)
+        gh.head_sha = 'abc123'
+
+        with pytest.raises(CannotPostCheckRun):
+            gh.post_check_run(name='codecov', title='title', summary='summary', annotations=[])
+
+    @pytest.mark.parametrize('num_annotations, num_requests', [(0, 1), (50, 1), (51, 2), (120, 3)])
+    def test_post_check_run_batches(self, num_annotations, num_requests, fake_github, test_config):
+        client = GitHubClient(token=test_config.GITHUB_TOKEN, url=fake_github.url)
+        annotations = [
+            {
+                'path': 'codebase/code.py',
+                'start_line': i,
+                'end_line': i,
+                'annotation_level': 'warning',
+                'message': f'line {i}',
+            }
+            for i in range(1, num_annotations + 1)
+        ]
+
+        gh = Github(client=client, repository=test_config.GITHUB_REPOSITORY, pr_number=test_config.GITHUB_PR_NUMBER)
+        fake_github.requests.clear()
+        gh.post_check_run(name='codecov', title='title', summary='summary', annotations=annotations)
+
+        (check_run,) = fake_github.check_runs.values()
+        assert check_run['head_sha'] == fake_github.pull_requests[test_config.GITHUB_PR_NUMBER].head_sha
+        assert check_run['status'] == 'completed'
+        assert check_run['output'] == {'title': 'title', 'summary': 'summary'}
+        # Batches are appended concurrently, so only the content is guaranteed, not the order
+        assert sorted(a['start_line'] for a in check_run['annotations']) == list(range(1, num_annotations + 1))
+        check_run_requests = [r for r in fake_github.requests if 'check-runs' in r[1]]
+        assert len(check_run_requests) == num_requests
+        assert num_requests == max(-(-num_annotations // ANNOTATIONS_PER_REQUEST), 1)
 
 
 class TestGithubDiffParser:
@@ -52,6 +52,34 @@ def test_github_client_post_non_json(session, gh_client):
     gh_client.repos('a/b').issues().post(a=1)
 
 
+def test_github_client_hooks(session, gh_client):
+    records = []
+    gh_client.hooks.append(records.append)
+    session.register('GET', '/repos/a/b/pulls/1')(
+        json={'foo': 'bar'},
+        headers={'X-RateLimit-Remaining': '4321', 'X-RateLimit-Reset': '1700000000'},
+    )
+    session.register('PATCH', '/repos/a/b/issues/comments/2', json={'body': 'hi'})(status_code=404)
+
+    gh_client.repos('a/b').pulls(1).get()
+    with pytest.raises(ApiError):
+        gh_client.repos('a/b').issues.comments(2).patch(body='hi')
+
+    first, second = records
+    assert (first.method, first.endpoint, first.status_code) == ('GET', '/repos/{repo}/pulls/{pull}', 200)
+    assert first.response_bytes == len(b'{"foo":"bar"}')
+    assert first.rate_limit_remaining == 4321
+    assert first.rate_limit_reset == 1700000000
+    assert first.elapsed >= 0
+    assert (second.method, second.endpoint, second.status_code) == (
+        'PATCH',
+        '/repos/{repo}/issues/comments/{comment}',
+        404,
+    )
+    assert second.rate_limit_remaining is None
+    assert second.rate_limit_reset is None
+
+
 def test_json_object():
     obj = JsonObject({'a': 1})
 
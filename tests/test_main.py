@@ -1,15 +1,38 @@
+import io
+import json
+import os
 import pathlib
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from codecov import template
+from codecov.config import OutputType
 from codecov.coverage.pytest import PytestCoverageHandler
-from codecov.exceptions import ConfigurationException, CoreProcessingException, MissingMarker, TemplateException
-from codecov.main import Main
+from codecov.deadline import DEADLINE_EXIT_CODE, Deadline
+from codecov.exceptions import (
+    CommentTooLong,
+    ConfigurationException,
+    CoreProcessingException,
+    DeadlineExceeded,
+    MissingMarker,
+    TemplateException,
+)
+from codecov.main import Main, _bisect_largest, main
+from codecov.report import build_report
 
 
 class TestMain:
+    def test_bisect_largest(self):
+        def render(n: int) -> None:
+            if n > 37:
+                raise CommentTooLong
+
+        assert _bisect_largest(render, low=0, high=100) == 37
+        assert _bisect_largest(render, low=0, high=20) == 20
+        assert _bisect_largest(render, low=40, high=100) is None
+
     def test_init_with_exception(self, test_config, gh):
         with patch.object(Main, '_init_config', return_value=test_config):
             with patch.object(Main, '_init_github', return_value=gh):
@@ -37,7 +60,7 @@ class TestMain:
                 main.coverage_module = MagicMock()
                 main.coverage_module.get_coverage = MagicMock(side_effect=ConfigurationException)
                 with pytest.raises(CoreProcessingException):
-                    main._process_coverage()
+                    main.process_coverage()
 
         with patch.object(Main, '_init_config', return_value=test_config):
             with patch.object(Main, '_init_github', return_value=gh):
@@ -46,7 +69,7 @@ class TestMain:
                 main.coverage_module.get_coverage = MagicMock(return_value=coverage_obj)
                 main.coverage_module.get_diff_coverage = MagicMock(return_value=diff_coverage_obj)
 
-                main._process_coverage()
+                main.process_coverage()
 
                 assert main.coverage == coverage_obj
                 assert main.diff_coverage == diff_coverage_obj
@@ -57,6 +80,30 @@ class TestMain:
                     config=test_config,
                 )
 
+    def test_process_coverage_overlaps_diff(self, test_config, gh, coverage_obj, diff_coverage_obj):
+        parsing = threading.Event()
+
+        def get_coverage(config):
+            parsing.set()
+            return coverage_obj
+
+        def get_diff():
+            # Only returns once the report is being parsed in another thread
+            assert parsing.wait(timeout=5)
+            return gh.pr_diff
+
+        with patch.object(Main, '_init_config', return_value=test_config):
+            with patch.object(Main, '_init_github', return_value=gh):
+                main = Main()
+                main.coverage_module = MagicMock()
+                main.coverage_module.get_coverage = MagicMock(side_effect=get_coverage)
+                main.coverage_module.get_diff_coverage = MagicMock(return_value=diff_coverage_obj)
+                with patch.object(main, '_get_diff', side_effect=get_diff):
+                    main.process_coverage()
+
+                assert main.coverage == coverage_obj
+                assert main.diff_coverage == diff_coverage_obj
+
     def test_process_coverage_branch_coverage(self, test_config, gh, coverage_obj, diff_coverage_obj):
         with patch.object(Main, '_init_config', return_value=test_config):
             test_config.BRANCH_COVERAGE = True
@@ -66,12 +113,12 @@ class TestMain:
                 main.coverage_module.get_coverage = MagicMock(return_value=coverage_obj)
                 main.coverage_module.get_diff_coverage = MagicMock(return_value=diff_coverage_obj)
 
-                assert main._process_coverage() is None
+                assert main.process_coverage() is None
 
                 assert main.coverage == coverage_obj
                 assert main.diff_coverage == diff_coverage_obj
 
-    @patch('codecov.main.template.get_comment_markdown')
+    @patch('codecov.template.get_comment_markdown')
     def test_create_comment(
         self,
         get_comment_markdown_mock: MagicMock,
@@ -116,19 +163,228 @@ class TestMain:
                 main.coverage = coverage_obj
                 main.diff_coverage = diff_coverage_obj
                 main._create_comment()
-                gh.post_comment.assert_called_once_with(
-                    contents='sample comment',
+                gh.post_comments.assert_called_once_with(
+                    contents=['sample comment'],
                     marker=template.MARKER,
+                    lease=None,
                 )
 
+    @patch('codecov.template.get_comment_markdown')
+    def test_create_comment_split(
+        self,
+        get_comment_markdown_mock: MagicMock,
+        test_config,
+        gh,
+        coverage_obj,
+        diff_coverage_obj,
+    ):
+        get_comment_markdown_mock.return_value = ('line\n' * 20000) + template.MARKER
+        with patch.object(Main, '_init_config', return_value=test_config):
+            with patch.object(Main, '_init_github', return_value=gh):
+                main = Main()
+                main.coverage = coverage_obj
+                main.diff_coverage = diff_coverage_obj
+                with pytest.raises(CoreProcessingException):
+                    main._create_comment()
+                gh.post_comments.assert_not_called()
+
+                test_config.MAX_COMMENTS = 2
+                main._create_comment()
+                parts = gh.post_comments.call_args.kwargs['contents']
+                assert len(parts) == 2
+
+    @pytest.mark.parametrize(
+        'num_files, num_lines, notice',
+        [
+            (400, 10, '_The report is truncated to '),
+            (3, 8000, '_The groups of missing lines are truncated to '),
+        ],
+    )
+    def test_create_comment_truncated_to_fit(self, test_config, gh, make_large_coverage, num_files, num_lines, notice):
+        test_config.MAX_FILES_IN_COMMENT = num_files
+        with patch.object(Main, '_init_config', return_value=test_config):
+            with patch.object(Main, '_init_github', return_value=gh):
+                main = Main()
+                main.coverage, main.diff_coverage = make_large_coverage(num_files, num_lines)
+                main._create_comment()
+
+        (comment,) = gh.post_comments.call_args.kwargs['contents']
+        assert len(comment) <= 65536
+        assert notice in comment
+        assert comment.endswith(template.MARKER)
+
+    def test_create_comment_reference_links(self, test_config, gh, coverage_obj, diff_coverage_obj):
+        test_config.REFERENCE_LINKS = True
+        with patch.object(Main, '_init_config', return_value=test_config):
+            with patch.object(Main, '_init_github', return_value=gh):
+                main = Main()
+                main.coverage = coverage_obj
+                main.diff_coverage = diff_coverage_obj
+                main._create_comment()
+
+        (comment,) = gh.post_comments.call_args.kwargs['contents']
+        assert '](https://' not in comment
+        assert '\n[0]: https://' in comment
+
+    def test_create_comment_does_not_fit(self, test_config, gh, make_large_coverage):
+        with patch.object(Main, '_init_config', return_value=test_config):
+            with patch.object(Main, '_init_github', return_value=gh):
+                main = Main()
+                main.coverage, main.diff_coverage = make_large_coverage(3, 10)
+                with patch('codecov.main.shards.MAX_COMMENT_LENGTH', 100):
+                    with pytest.raises(CoreProcessingException):
+                        main._create_comment()
+        gh.post_comments.assert_not_called()
+
+    def test_run_file_outputs(self, test_config, gh, coverage_obj, diff_coverage_obj, tmp_path):
+        test_config.OUTPUTS = [OutputType.STEP_SUMMARY, OutputType.JSON]
+        test_config.GITHUB_STEP_SUMMARY = tmp_path / 'summary.md'
+        test_config.JSON_REPORT_PATH = tmp_path / 'report.json'
+        with patch.object(Main, '_init_config', return_value=test_config):
+            with patch.object(Main, '_init_github', return_value=gh):
+                main = Main()
+                main.process_coverage = MagicMock()
+                main.coverage = coverage_obj
+                main.diff_coverage = diff_coverage_obj
+                with patch('codecov.report.build_report', wraps=build_report) as build_report_mock:
+                    main.run()
+
+        # Both outputs share a single view model
+        build_report_mock.assert_called_once()
+        assert test_config.GITHUB_STEP_SUMMARY.read_text().startswith('## Coverage report')
+        assert json.loads(test_config.JSON_REPORT_PATH.read_text())['files'][0]['path'] == 'codebase/code.py'
+        gh.post_comments.assert_not_called()
+
+    @pytest.mark.parametrize('output', [OutputType.STEP_SUMMARY, OutputType.JSON])
+    def test_run_file_outputs_without_path(self, test_config, gh, coverage_obj, diff_coverage_obj, output):
+        test_config.OUTPUTS = [output]
+        with patch.object(Main, '_init_config', return_value=test_config):
+            with patch.object(Main, '_init_github', return_value=gh):
+                main = Main()
+                main.process_coverage = MagicMock()
+                main.coverage = coverage_obj
+                main.diff_coverage = diff_coverage_obj
+                with pytest.raises(CoreProcessingException):
+                    main.run()
+
+    @pytest.mark.parametrize(
+        'pr_number, ref, link',
+        [
+            (123, None, 'https://github.com/example/foobar/pull/123/files#diff-'),
+            (None, 'feature', 'https://github.com/example/foobar/blob/feature/codebase/code.py'),
+        ],
+    )
+    def test_run_offline(self, test_config, coverage_obj, tmp_path, pr_number, ref, link):
+        test_config.GITHUB_PR_NUMBER = pr_number
+        test_config.GITHUB_REF = ref
+        test_config.OUTPUTS = [OutputType.MARKDOWN]
+        test_config.MARKDOWN_REPORT_PATH = tmp_path / 'report.md'
+        test_config.DIFF_PATH = tmp_path / 'pr.diff'
+        added = ''.join(f'+line {i}\n' for i in range(1, 13))
+        test_config.DIFF_PATH.write_text(
+            f'diff --git a/codebase/code.py b/codebase/code.py\n--- /dev/null\n+++ b/codebase/code.py\n@@ -0,0 +1,12 @@\n{added}'
+        )
+        with patch.object(Main, '_init_config', return_value=test_config):
+            with patch.object(Main, '_init_github') as init_github_mock:
+                main = Main()
+                with patch.object(main.coverage_module, 'get_coverage', return_value=coverage_obj):
+                    main.run()
+
+        init_github_mock.assert_not_called()
+        assert main.diff_coverage.num_changed_lines == 12
+        report = test_config.MARKDOWN_REPORT_PATH.read_text()
+        assert report.startswith('## Coverage report')
+        assert link in report
+
+    def test_run_offline_stdio(self, coverage_obj, tmp_path, capsys):
+        environ = {
+            'GITHUB_REPOSITORY': 'example/foobar',
+            'COVERAGE_PATH': str(tmp_path / 'coverage.json'),
+            'DIFF_PATH': '-',
+            'OUTPUTS': 'markdown',
+            'MARKDOWN_REPORT_PATH': '-',
+        }
+        (tmp_path / 'coverage.json').write_text('{}')
+        added = ''.join(f'+line {i}\n' for i in range(1, 13))
+        diff = f'diff --git a/codebase/code.py b/codebase/code.py\n--- /dev/null\n+++ b/codebase/code.py\n@@ -0,0 +1,12 @@\n{added}'
+        with patch.dict(os.environ, environ, clear=True), patch('sys.stdin', io.StringIO(diff)):
+            with patch.object(Main, '_init_github') as init_github_mock:
+                main = Main()
+                with patch.object(main.coverage_module, 'get_coverage', return_value=coverage_obj):
+                    main.run()
+
+        init_github_mock.assert_not_called()
+        assert main.diff_coverage.num_changed_lines == 12
+        report = capsys.readouterr().out
+        assert report.startswith('## Coverage report')
+        assert 'https://github.com/example/foobar/blob/HEAD/codebase/code.py' in report
+
+    def test_run_diff_path_with_comment(self, test_config, gh, coverage_obj, tmp_path):
+        test_config.DIFF_PATH = tmp_path / 'pr.diff'
+        test_config.DIFF_PATH.write_text(gh.pr_diff)
+        with patch.object(Main, '_init_config', return_value=test_config):
+            with patch.object(Main, '_init_github', return_value=gh):
+                main = Main()
+                assert main.config.offline is False
+                with patch.object(main.coverage_module, 'get_coverage', return_value=coverage_obj):
+                    main.run()
+
+        gh.post_comments.assert_called_once()
+
+    def test_get_diff_unreadable(self, test_config, tmp_path):
+        test_config.DIFF_PATH = tmp_path / 'missing.diff'
+        with patch.object(Main, '_init_config', return_value=test_config):
+            main = Main()
+            with pytest.raises(CoreProcessingException):
+                main._get_diff()
+
     def test_run(self, test_config, gh):
         with patch.object(Main, '_init_config', return_value=test_config):
             with patch.object(Main, '_init_github', return_value=gh):
                 main = Main()
-                main._process_coverage = MagicMock()
+                main.process_coverage = MagicMock()
                 main._create_comment = MagicMock()
 
                 assert main.run() is None
 
-                main._process_coverage.assert_called_once()
+                main.process_coverage.assert_called_once()
                 main._create_comment.assert_called_once()
+
+    def test_run_deadline_exceeded(self, test_config, gh, coverage_obj, diff_coverage_obj):
+        with patch.object(Main, '_init_config', return_value=test_config):
+            with patch.object(Main, '_init_github', return_value=gh):
+                main = Main()
+                main.deadline = Deadline(1)
+                main.coverage_module = MagicMock()
+                main.coverage_module.get_coverage = MagicMock(return_value=coverage_obj)
+                main.coverage_module.get_diff_coverage = MagicMock(return_value=diff_coverage_obj)
+
+                with patch.object(main.deadline, 'expired', return_value=True):
+                    with pytest.raises(DeadlineExceeded):
+                        main.run()
+
+                main.coverage_module.get_coverage.assert_not_called()
+                gh.post_comments.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    'side_effect, exit_code',
+    [
+        (DeadlineExceeded, DEADLINE_EXIT_CODE),
+        (CoreProcessingException, 1),
+    ],
+)
+def test_main_exit_code(side_effect, exit_code):
+    with patch('codecov.main.Main') as main_mock:
+        main_mock.return_value.run.side_effect = side_effect
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+
+    assert exc_info.value.code == exit_code
+
+
+def test_main():
+    with patch('codecov.main.Main') as main_mock:
+        assert main() is None
+
+    main_mock.return_value.run.assert_called_once()
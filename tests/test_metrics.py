@@ -0,0 +1,93 @@
+import json
+import os
+from unittest.mock import patch
+
+from codecov.main import Main
+from codecov.metrics import RequestMetrics, RequestRecord
+
+
+def make_record(**kwargs) -> RequestRecord:
+    defaults = {
+        'method': 'GET',
+        'endpoint': '/repos/{repo}/pulls/{pull}',
+        'status_code': 200,
+        'elapsed': 0.1,
+        'request_bytes': 0,
+        'response_bytes': 100,
+        'rate_limit_remaining': None,
+    }
+    return RequestRecord(**(defaults | kwargs))
+
+
+def test_request_metrics_summary():
+    metrics = RequestMetrics()
+    metrics(make_record(elapsed=0.1, rate_limit_remaining=4999))
+    metrics(make_record(elapsed=0.3, status_code=404, rate_limit_remaining=4998))
+    metrics(make_record(method='POST', endpoint='/repos/{repo}/issues/{issue}/comments', request_bytes=20))
+    metrics(make_record(elapsed=0.2, rate_limit_remaining=4996))
+
+    summary = metrics.summary()
+
+    assert summary['requests'] == 4
+    assert summary['request_bytes'] == 20
+    assert summary['response_bytes'] == 400
+    assert summary['rate_limit_used'] == 4
+    assert summary['rate_limit_remaining'] == 4996
+    pulls, comments = summary['endpoints']
+    assert pulls['method'] == 'GET'
+    assert pulls['endpoint'] == '/repos/{repo}/pulls/{pull}'
+    assert pulls['count'] == 3
+    assert round(pulls['total_elapsed'], 6) == 0.6
+    assert pulls['max_elapsed'] == 0.3
+    assert pulls['status_codes'] == {200: 2, 404: 1}
+    assert comments['count'] == 1
+
+
+def test_request_metrics_rate_limit_windows():
+    metrics = RequestMetrics()
+    metrics(make_record(rate_limit_remaining=10, rate_limit_reset=1000))
+    metrics(make_record(rate_limit_remaining=8, rate_limit_reset=1000))
+    # The window ends during the run: the remaining calls start over
+    metrics(make_record(rate_limit_remaining=4999, rate_limit_reset=4600))
+    metrics(make_record(rate_limit_remaining=4997, rate_limit_reset=4600))
+    # An answer of a concurrent request arriving late
+    metrics(make_record(rate_limit_remaining=4998, rate_limit_reset=4600))
+
+    assert metrics.rate_limit_used() == 3 + 3
+    assert metrics.summary()['rate_limit_remaining'] == 4998
+
+
+def test_request_metrics_empty(tmp_path):
+    metrics = RequestMetrics()
+    metrics.log_summary()
+    metrics.write(tmp_path / 'metrics.json')
+
+    assert json.loads((tmp_path / 'metrics.json').read_text()) == {
+        'requests': 0,
+        'total_elapsed': 0,
+        'request_bytes': 0,
+        'response_bytes': 0,
+        'rate_limit_used': None,
+        'rate_limit_remaining': None,
+        'endpoints': [],
+    }
+
+
+def test_main_run_writes_metrics(fake_github, fake_github_environ, tmp_path, caplog):
+    metrics_path = tmp_path / 'metrics.json'
+    with patch.dict(os.environ, fake_github_environ | {'METRICS_PATH': str(metrics_path)}, clear=True):
+        with caplog.at_level('INFO', logger='codecov'):
+            Main().run()
+
+    summary = json.loads(metrics_path.read_text())
+    endpoints = {(e['method'], e['endpoint']): e['count'] for e in summary['endpoints']}
+    assert endpoints == {
+        ('GET', '/user'): 1,
+        # The pull request details, then its diff
+        ('GET', '/repos/{repo}/pulls/{pull}'): 2,
+        ('GET', '/repos/{repo}/issues/{issue}/comments'): 1,
+        ('POST', '/repos/{repo}/issues/{issue}/comments'): 1,
+    }
+    assert summary['requests'] == 5
+    assert summary['rate_limit_used'] == 5
+    assert 'GitHub API: 5 requests' in caplog.text
@@ -0,0 +1,60 @@
+import json
+from unittest.mock import patch
+
+import jinja2
+import pytest
+
+from codecov import precompile, template
+
+
+def test_precompiled_templates_up_to_date():
+    manifest = json.loads((template.PRECOMPILED_PATH / template.PRECOMPILED_MANIFEST).read_text())
+    # Run `make templates` when this fails
+    assert manifest['templates'] == precompile.get_template_checksums()
+    assert manifest['filters'] == template.get_filters_fingerprint(template.create_environment(precompiled=False))
+
+
+def test_compile_templates(tmp_path):
+    (tmp_path / 'tmpl_stale.py').write_text('')
+    precompile.compile_templates(target=tmp_path)
+
+    manifest = json.loads((tmp_path / template.PRECOMPILED_MANIFEST).read_text())
+    assert manifest['jinja2'] == jinja2.__version__
+    assert not (tmp_path / 'tmpl_stale.py').exists()
+    modules = sorted(path.name for path in tmp_path.glob('tmpl_*.py'))
+    assert modules == sorted(jinja2.ModuleLoader.get_module_filename(name) for name in manifest['templates'])
+
+    if (
+        manifest['jinja2']
+        == json.loads((template.PRECOMPILED_PATH / template.PRECOMPILED_MANIFEST).read_text())['jinja2']
+    ):
+        for module in modules:
+            assert (tmp_path / module).read_text() == (template.PRECOMPILED_PATH / module).read_text()
+
+
+def test_precompiled_templates_loaded():
+    env = template.create_environment()
+    if not template.has_precompiled_templates(env):
+        pytest.skip('Templates were precompiled with another Jinja version')
+
+    with patch.object(env, 'compile') as compile_mock:
+        env.get_template('comment.md.j2')
+    compile_mock.assert_not_called()
+
+
+def test_precompiled_templates_other_jinja_version():
+    with patch.object(jinja2, '__version__', '0.0'):
+        assert isinstance(template.create_environment().loader, jinja2.PackageLoader)
+
+
+def test_precompiled_templates_other_filters():
+    env = template.create_environment()
+    env.filters['pct'] = jinja2.pass_context(lambda context, value: template.pct(value))
+    assert template.has_precompiled_templates(env) is False
+
+
+def test_precompiled_templates_not_sandboxed():
+    env = template.create_environment(precompiled=False)
+    sandboxed_env = template.create_environment(precompiled=False, sandboxed=True)
+    assert template.get_filters_fingerprint(sandboxed_env) != template.get_filters_fingerprint(env)
+    assert template.has_precompiled_templates(sandboxed_env) is False
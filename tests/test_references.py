@@ -0,0 +1,35 @@
+from codecov import references
+
+MARKER = '<!-- marker -->'
+
+
+def test_reference_links_dedup():
+    links = references.ReferenceLinks()
+    line = '[![](https://badge/1)](https://diff/a) | [![](https://badge/1)](https://diff/a "50%") | [2](https://diff/a)'
+
+    assert links.rewrite_line(line) == '[![][0]][1] | [![][0]][2] | [2][1]'
+    assert links.definitions() == '[0]: https://badge/1\n[1]: https://diff/a\n[2]: https://diff/a "50%"\n'
+
+
+def test_reference_links_rewrite_chunks():
+    chunks = ['## Report\n| [file', '.py](https://diff/', 'a) | [![](https://badge/1)](https://diff/a) |\n\n', MARKER]
+
+    comment = ''.join(references.ReferenceLinks().rewrite(chunks, MARKER))
+
+    assert comment == (
+        f'## Report\n| [file.py][0] | [![][1]][0] |\n\n\n\n[0]: https://diff/a\n[1]: https://badge/1\n\n{MARKER}'
+    )
+
+
+def test_reference_links_rewrite_marker_first():
+    chunks = [MARKER, '\n[file.py](https://diff/a)']
+
+    comment = ''.join(references.ReferenceLinks().rewrite(chunks, MARKER))
+
+    assert comment == f'{MARKER}\n[file.py][0]\n\n[0]: https://diff/a\n'
+
+
+def test_reference_links_rewrite_no_links():
+    chunks = ['## Report\n', '<img src="https://badge/1">\n', MARKER]
+
+    assert ''.join(references.ReferenceLinks().rewrite(chunks, MARKER)) == ''.join(chunks)
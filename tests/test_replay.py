@@ -0,0 +1,97 @@
+import json
+import os
+import pathlib
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from codecov.exceptions import ConfigurationException
+from codecov.main import Main
+from codecov.replay import RecordingTransport, ReplayTransport, load_cassette
+
+
+def test_record_and_replay(fake_github, tmp_path, test_config):
+    cassette = tmp_path / 'cassette.json'
+    cassette.write_text('left by an earlier recording\n')
+    with httpx.Client(base_url=fake_github.url, transport=RecordingTransport(path=cassette)) as client:
+        recorded_user = client.get('/user', headers={'Authorization': f'token {test_config.GITHUB_TOKEN}'})
+        recorded_missing = client.get('/repos/other/repo/pulls/1')
+        # Each exchange is appended as it happens, the cassette is complete before the client closes
+        assert len(cassette.read_text().splitlines()) == 2
+
+    assert test_config.GITHUB_TOKEN not in cassette.read_text()
+    interactions = load_cassette(cassette)
+    assert [(i.method, i.target, i.status_code) for i in interactions] == [
+        ('GET', '/user', 200),
+        ('GET', '/repos/other/repo/pulls/1', 404),
+    ]
+
+    with httpx.Client(base_url='https://api.github.com', transport=ReplayTransport(path=cassette)) as client:
+        assert client.get('/user').json() == recorded_user.json()
+        assert client.get('/repos/other/repo/pulls/1').status_code == recorded_missing.status_code
+        with pytest.raises(ConfigurationException):
+            client.get('/user')
+
+
+def test_replay_latency(tmp_path):
+    cassette = tmp_path / 'cassette.json'
+    cassette.write_text(
+        json.dumps(
+            {
+                'method': 'GET',
+                'target': '/user',
+                'status_code': 200,
+                'headers': [['content-type', 'application/json']],
+                'content': '{"login": "foo"}',
+                'elapsed': 0.25,
+            }
+        )
+        + '\n'
+    )
+
+    with patch('codecov.replay.time.sleep') as sleep_mock:
+        with httpx.Client(
+            base_url='https://api.github.com', transport=ReplayTransport(cassette, latency=True)
+        ) as client:
+            assert client.get('/user').json() == {'login': 'foo'}
+
+    sleep_mock.assert_called_once_with(0.25)
+
+
+@pytest.mark.parametrize('content', [None, '{', '{"foo": []}', '[1]'])
+def test_load_cassette_error(tmp_path, content):
+    cassette = tmp_path / 'cassette.json'
+    if content is not None:
+        cassette.write_text(content)
+
+    with pytest.raises(ConfigurationException):
+        load_cassette(cassette)
+
+
+def test_main_replays_recorded_run(fake_github, fake_github_environ, tmp_path, test_config):
+    cassette = tmp_path / 'cassette.json'
+    with patch.dict(os.environ, fake_github_environ | {'HTTP_RECORD_PATH': str(cassette)}, clear=True):
+        Main().run()
+    recorded = fake_github.issue_comments(test_config.GITHUB_PR_NUMBER)[0]['body']
+    fake_github.stop()
+
+    replay_environ = fake_github_environ | {
+        'GITHUB_API_URL': 'https://api.github.com',
+        'HTTP_REPLAY_PATH': str(cassette),
+    }
+    with patch.dict(os.environ, replay_environ, clear=True):
+        main = Main()
+        with patch.object(main.github, 'post_comments') as post_comments_mock:
+            main.run()
+
+    assert post_comments_mock.call_args.kwargs['contents'] == [recorded]
+
+
+def test_main_transport(test_config):
+    main = Main.__new__(Main)
+    main.config = test_config
+    assert main._init_transport() is None
+
+    main.config.HTTP_RECORD_PATH = pathlib.Path('cassette.json')
+    assert isinstance(main._init_transport(), RecordingTransport)
@@ -0,0 +1,65 @@
+import dataclasses
+import pathlib
+
+from codecov import groups, report, template
+
+
+def test_build_report(coverage_obj, diff_coverage_obj):
+    built = report.build_report(coverage_obj, diff_coverage_obj, skip_covered_files_in_report=False)
+
+    files, count_files = template.select_changed_files(
+        coverage=coverage_obj, diff_coverage=diff_coverage_obj, max_files=None, skip_covered_files_in_report=False
+    )
+    assert built.files == files
+    assert built.count_files == count_files
+    assert built.missing_diff_lines == {
+        pathlib.Path('codebase/code.py'): [
+            groups.Group(file=pathlib.Path('codebase/code.py'), line_start=6, line_end=8)
+        ]
+    }
+    assert built.max_files is None
+    assert built.max_line_groups is None
+
+
+def test_report_truncate(make_large_coverage):
+    coverage, diff_coverage = make_large_coverage(10, 20)
+    built = report.build_report(coverage, diff_coverage, skip_covered_files_in_report=False)
+
+    truncated = built.truncate(max_files=4, max_line_groups=2)
+
+    assert [file.path for file in truncated.files] == sorted(file.path for file in truncated.files)
+    assert len(truncated.files) == 4
+    assert truncated.count_files == 10
+    # The files of the pull request fill the budget, no room left for the project table
+    assert truncated.coverage_files == []
+    assert all(len(value) == 2 for value in truncated.missing_diff_lines.values())
+    assert (truncated.max_files, truncated.max_line_groups) == (4, 2)
+    assert (truncated.diff_line_groups_truncated, truncated.project_line_groups_truncated) == (True, False)
+    assert built.truncate(max_files=4, max_line_groups=10).diff_line_groups_truncated is False
+    # The report itself is left untouched
+    assert len(built.files) == 10
+    assert all(len(value) == 10 for value in built.missing_diff_lines.values())
+    assert built.truncate(max_files=None).files == built.files
+
+
+def test_report_truncate_ties(make_large_coverage):
+    coverage, diff_coverage = make_large_coverage(10, 20)
+    built = report.build_report(coverage, diff_coverage, skip_covered_files_in_report=False)
+
+    # All the files tie, the first ones of the coverage report are kept, sorted by path
+    expected = sorted(list(coverage.files)[:4])
+    assert [file.path for file in built.truncate(max_files=4).files] == expected
+
+    project = dataclasses.replace(built, files=[], count_files=0).truncate(max_files=3)
+    assert [file.path for file in project.coverage_files] == sorted(list(coverage.files)[:3])
+
+
+def test_report_truncate_pull_request_over_budget(make_large_coverage):
+    coverage, diff_coverage = make_large_coverage(10, 20)
+    built = report.build_report(coverage, diff_coverage, skip_covered_files_in_report=False)
+
+    # More files in the pull request than `max_files`: none of the project table, rather than
+    # all but the last `count_files - max_files` of them
+    truncated = built.truncate(max_files=8)
+    assert len(truncated.files) == 8
+    assert truncated.coverage_files == []
@@ -0,0 +1,227 @@
+import http.client
+import json
+import os
+import secrets
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from codecov import template
+from codecov.exceptions import ConfigurationException, QueueFull
+from codecov.service import Service, ServiceServer, main
+
+
+@pytest.fixture
+def service_environ(fake_github, test_config) -> dict[str, str]:
+    return {'GITHUB_TOKEN': test_config.GITHUB_TOKEN, 'GITHUB_API_URL': fake_github.url}
+
+
+@pytest.fixture
+def service_token() -> str:
+    return secrets.token_urlsafe()
+
+
+@pytest.fixture
+def service(service_environ, service_token, test_config):
+    service = Service(
+        environ=service_environ,
+        token=service_token,
+        repositories=[test_config.GITHUB_REPOSITORY, 'example/foobar'],
+        workers=2,
+        max_upload_size=1024 * 1024,
+    ).start()
+    server = ServiceServer(('127.0.0.1', 0), service)
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    with httpx.Client(base_url=server.url, headers={'Authorization': f'Bearer {service_token}'}) as client:
+        yield service, client
+    server.shutdown()
+    server.server_close()
+    service.stop()
+
+
+def wait_for(client: httpx.Client, job_id: str) -> dict:
+    for _ in range(200):
+        job = client.get(f'/jobs/{job_id}').json()
+        if job['status'] not in ('queued', 'running'):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f'Job {job_id} did not finish')
+
+
+def test_service_runs_uploaded_jobs(service, fake_github, coverage_json, test_config):
+    service, client = service
+    fake_github.add_pull_request(
+        number=2, head_ref='feature/2', diff=fake_github.pull_requests[test_config.GITHUB_PR_NUMBER].diff
+    )
+    report = json.dumps(coverage_json).encode()
+
+    responses = [
+        client.post('/jobs', content=report, params={'GITHUB_REPOSITORY': test_config.GITHUB_REPOSITORY, **params})
+        for params in ({'GITHUB_PR_NUMBER': test_config.GITHUB_PR_NUMBER}, {'GITHUB_PR_NUMBER': 2})
+    ]
+
+    assert [response.status_code for response in responses] == [202, 202]
+    assert responses[0].headers['Location'] == f'/jobs/{responses[0].json()["id"]}'
+    jobs = [wait_for(client, response.json()['id']) for response in responses]
+    assert [(job['pr_number'], job['status'], job['error']) for job in jobs] == [
+        (test_config.GITHUB_PR_NUMBER, 'done', None),
+        (2, 'done', None),
+    ]
+    for number in (test_config.GITHUB_PR_NUMBER, 2):
+        (comment,) = fake_github.issue_comments(number)
+        assert template.MARKER in comment['body']
+
+    # The same report was parsed once and is deleted once no job needs it
+    assert len(service.batch.coverages) == 1
+    assert service.report_users == {}
+    assert list(service.spool_path.iterdir()) == []
+
+    stats = client.get('/stats').json()
+    assert (stats['queued'], stats['running'], stats['done'], stats['failed']) == (0, 0, 2, 0)
+    assert stats['throughput'] > 0
+    assert stats['elapsed']['max'] >= stats['elapsed']['median'] > 0
+
+
+def test_service_failed_job(service, coverage_json, test_config):
+    _, client = service
+    response = client.post(
+        '/jobs',
+        content=json.dumps(coverage_json).encode(),
+        params={'GITHUB_REPOSITORY': test_config.GITHUB_REPOSITORY, 'GITHUB_PR_NUMBER': 999},
+    )
+
+    assert wait_for(client, response.json()['id'])['status'] == 'failed'
+    assert client.get('/stats').json()['failed'] == 1
+
+
+@pytest.mark.parametrize(
+    'params',
+    [
+        {'GITHUB_PR_NUMBER': '1'},
+        {'GITHUB_REPOSITORY': 'example/foobar', 'GITHUB_PR_NUMBER': 'one'},
+        {'GITHUB_REPOSITORY': 'example/foobar', 'GITHUB_PR_NUMBER': '1', 'GITHUB_TOKEN': 'other'},
+        {'GITHUB_REPOSITORY': 'example/foobar', 'GITHUB_PR_NUMBER': '1', 'TEMPLATE_PATH': '/etc/passwd'},
+    ],
+)
+def test_service_invalid_job(service, coverage_json, params):
+    service, client = service
+    response = client.post('/jobs', content=json.dumps(coverage_json).encode(), params=params)
+
+    assert response.status_code == 400
+    assert service.jobs == {}
+    assert list(service.spool_path.iterdir()) == []
+
+
+@pytest.mark.parametrize('authorization', [None, 'Bearer wrong', 'token {token}', 'Bearer'])
+def test_service_unauthorized(service, service_token, coverage_json, test_config, authorization):
+    service, client = service
+    headers = {'Authorization': authorization.format(token=service_token)} if authorization else {}
+    client.headers.pop('Authorization')
+
+    for response in (
+        client.get('/stats', headers=headers),
+        client.post(
+            '/jobs',
+            content=json.dumps(coverage_json).encode(),
+            params={'GITHUB_REPOSITORY': test_config.GITHUB_REPOSITORY, 'GITHUB_PR_NUMBER': '1'},
+            headers=headers,
+        ),
+    ):
+        assert response.status_code == 401
+        assert response.headers['WWW-Authenticate'] == 'Bearer'
+    assert service.jobs == {}
+
+
+@pytest.mark.parametrize('length, status', [(None, 411), ('abc', 400), ('-1', 400), (str(2 * 1024 * 1024), 413)])
+def test_service_invalid_upload(service, service_token, length, status):
+    service, client = service
+    connection = http.client.HTTPConnection(client.base_url.host, client.base_url.port, timeout=5)
+    connection.putrequest('POST', '/jobs?GITHUB_REPOSITORY=example/foobar&GITHUB_PR_NUMBER=1')
+    connection.putheader('Authorization', f'Bearer {service_token}')
+    if length is not None:
+        connection.putheader('Content-Length', length)
+    connection.endheaders()
+    response = connection.getresponse()
+    connection.close()
+
+    assert response.status == status
+    assert service.jobs == {}
+    assert list(service.spool_path.iterdir()) == []
+
+
+def test_service_repository_not_allowed(service, coverage_json):
+    service, client = service
+    response = client.post(
+        '/jobs',
+        content=json.dumps(coverage_json).encode(),
+        params={'GITHUB_REPOSITORY': 'someone/else', 'GITHUB_PR_NUMBER': '1'},
+    )
+
+    assert response.status_code == 403
+    assert service.jobs == {}
+    assert list(service.spool_path.iterdir()) == []
+
+
+def test_main_requires_token(service_environ):
+    with patch.dict(os.environ, service_environ, clear=True), patch('sys.argv', ['codecov-service']):
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+    assert exc_info.value.code == 1
+
+
+def test_service_not_found(service):
+    _, client = service
+    assert client.get('/jobs/abc123').status_code == 404
+    assert client.get('/other').status_code == 404
+    assert client.post('/other', content=b'{}').status_code == 404
+
+
+def test_service_queue_full(service_environ, service_token, coverage_json):
+    # Not started, the jobs stay queued
+    service = Service(environ=service_environ, token=service_token, repositories=['example/foobar'], queue_size=1)
+    variables = {'GITHUB_REPOSITORY': 'example/foobar', 'GITHUB_PR_NUMBER': '1'}
+    report = json.dumps(coverage_json).encode()
+
+    job = service.submit(report, variables=variables)
+    with pytest.raises(QueueFull):
+        service.submit(report, variables=variables)
+    with pytest.raises(ConfigurationException):
+        service.submit(report, variables={'GITHUB_REPOSITORY': 'example/foobar'} | {'DIFF_PATH': '-'})
+
+    assert service.stats()['queued'] == 1
+    assert service.report_users == {job.report: 1}
+    service.stop()
+
+
+@pytest.mark.parametrize('report', [b'not json', b'[1, 2]', b'{"files": null}'])
+def test_service_malformed_report(service, coverage_json, test_config, report):
+    service, client = service
+    variables = {'GITHUB_REPOSITORY': test_config.GITHUB_REPOSITORY, 'GITHUB_PR_NUMBER': test_config.GITHUB_PR_NUMBER}
+    failed = client.post('/jobs', content=report, params=variables).json()
+    assert wait_for(client, failed['id'])['status'] == 'failed'
+
+    # The workers run the next jobs
+    done = client.post('/jobs', content=json.dumps(coverage_json).encode(), params=variables).json()
+    assert wait_for(client, done['id'])['status'] == 'done'
+    assert all(thread.is_alive() for thread in service._threads)  # pylint: disable=protected-access
+    assert service.report_users == {}
+
+
+def test_service_connection_error(service_environ, service_token, coverage_json):
+    service = Service(
+        environ={**service_environ, 'GITHUB_API_URL': 'http://127.0.0.1:9', 'GITHUB_REPOSITORY': 'example/foobar'},
+        token=service_token,
+        workers=1,
+    ).start()
+    # The repository of the service is allowed
+    variables = {'GITHUB_PR_NUMBER': '1'}
+    jobs = [service.submit(json.dumps(coverage_json).encode(), variables=variables) for _ in range(2)]
+
+    service.stop()
+    assert [job.status for job in jobs] == ['failed', 'failed']
+    assert all(job.error for job in jobs)
+    assert service.report_users == {}
+    assert service.stats()['failed'] == 2
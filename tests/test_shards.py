@@ -0,0 +1,80 @@
+import pytest
+
+from codecov import references, shards
+
+MARKER = '<!-- marker -->'
+
+
+def test_split_comment_short():
+    comment = f'## Report\n{MARKER}'
+    assert shards.split_comment(comment, marker=MARKER) == [comment]
+
+
+def test_split_comment_parts_fit():
+    comment = ''.join(f'line {i}\n' for i in range(1000)) + MARKER
+    parts = shards.split_comment(comment, marker=MARKER, max_length=1000)
+
+    assert len(parts) > 1
+    assert all(len(part) <= 1000 for part in parts)
+    assert [shards.get_comment_part(part, MARKER) for part in parts] == list(range(1, len(parts) + 1))
+    # Nothing is lost or duplicated
+    lines = [line for part in parts for line in part.splitlines() if line.startswith('line')]
+    assert lines == [f'line {i}' for i in range(1000)]
+
+
+def test_split_comment_repeats_details_and_table_header():
+    rows = ''.join(f'| file_{i}.py | 50% |\n' for i in range(200))
+    comment = (
+        f'## Report\n\n<details><summary>Click to see coverage of changed files</summary>\n\n'
+        f'| File | Cover |\n|---|---|\n{rows}\n</details>\n{MARKER}'
+    )
+    parts = shards.split_comment(comment, marker=MARKER, max_length=1000)
+
+    assert len(parts) > 1
+    for part in parts:
+        assert part.count('<details>') == part.count('</details>') == 1
+    for part in parts[1:]:
+        assert (
+            '<details><summary>Click to see coverage of changed files</summary>\n\n| File | Cover |\n|---|---|\n'
+            in part
+        )
+
+
+@pytest.mark.parametrize(
+    'body, part',
+    [
+        ('hello', None),
+        (f'report {MARKER}', 1),
+        (f'report {shards.get_part_marker(MARKER, 3)}', 3),
+    ],
+)
+def test_get_comment_part(body, part):
+    assert shards.get_comment_part(body, MARKER) == part
+
+
+def test_split_comment_reference_links():
+    rows = ''.join(f'| [file_{i}.py][{i}] | [![][1000]][{i}] |\n' for i in range(200))
+    definitions = ''.join(f'[{i}]: https://diff/{i}\n' for i in range(200)) + '[1000]: https://badge\n'
+    comment = f'## Report\n\n| File | Cover |\n|---|---|\n{rows}\n{definitions}\n{MARKER}'
+    parts = shards.split_comment(comment, marker=MARKER, max_length=1000)
+
+    assert len(parts) > 1
+    assert all(len(part) <= 1000 for part in parts)
+    for part in parts:
+        # Every part defines exactly the labels it uses
+        used = set(references.REFERENCE_RE.findall(part))
+        defined = {match['label'] for line in part.splitlines() if (match := references.DEFINITION_RE.match(line))}
+        assert used == defined
+        assert '1000' in defined
+
+
+def test_lease():
+    body = f'## Report\n{MARKER}'
+    assert shards.get_lease(body) is None
+
+    leased = shards.set_lease(body, (12, 1, 345))
+    assert leased == f'<!-- codecov run 12.1.345 -->\n{body}'
+    assert shards.get_lease(leased) == (12, 1, 345)
+    # A new lease replaces the previous one
+    assert shards.set_lease(leased, (12, 2, 0)) == f'<!-- codecov run 12.2.0 -->\n{body}'
+    assert len(shards.set_lease(body, (10**20 - 1,) * 3)) <= len(body) + shards.LEASE_LENGTH
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize('module', ['httpx', 'jinja2', 'codecov.coverage.pytest', 'codecov.coverage.jest'])
+def test_import_main_is_lazy(module):
+    # A fresh interpreter, the test session has already imported everything
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, '-c', f'import sys, codecov.main; print({module!r} in sys.modules)'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == 'False'
+
+
+def test_get_coverage_handler_imports_handler():
+    result = subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            '-c',
+            'import sys\n'
+            'from codecov.config import TestFramework\n'
+            'from codecov.coverage.base import BaseCoverageHandler\n'
+            'handler = BaseCoverageHandler.get_coverage_handler(TestFramework.JEST)\n'
+            'print(type(handler).__name__, "codecov.coverage.pytest" in sys.modules)',
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == 'JestCoverageHandler False'
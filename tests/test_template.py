@@ -1,12 +1,15 @@
+import dataclasses
 import decimal
 import hashlib
 import pathlib
+from unittest.mock import patch
 
+import jinja2
 import pytest
 
-from codecov import template
+from codecov import references, template
 from codecov.coverage.base import DiffCoverage
-from codecov.exceptions import MissingMarker, TemplateException
+from codecov.exceptions import CommentTooLong, MissingMarker, TemplateException
 
 
 @pytest.mark.parametrize(
@@ -96,6 +99,67 @@ def test_template_error(coverage_obj, diff_coverage_obj):
         )
 
 
+def test_get_comment_markdown_max_length(coverage_obj, diff_coverage_obj):
+    def render(**kwargs):
+        return template.get_comment_markdown(
+            template.get_template('comment.md.j2'),
+            coverage_obj,
+            diff_coverage_obj,
+            decimal.Decimal('100'),
+            decimal.Decimal('70'),
+            'org/repo',
+            1,
+            'main',
+            template.MARKER,
+            files=[],
+            count_files=0,
+            coverage_files=[],
+            count_coverage_files=0,
+            max_files=25,
+            **kwargs,
+        )
+
+    comment = render()
+    assert render(max_length=len(comment)) == comment
+    with pytest.raises(CommentTooLong):
+        render(max_length=len(comment) - 1)
+
+
+def test_get_comment_markdown_max_line_groups(make_large_coverage):
+    coverage, diff_coverage = make_large_coverage(2, 20)
+    files, count_files = template.select_changed_files(
+        coverage=coverage, diff_coverage=diff_coverage, max_files=None, skip_covered_files_in_report=False
+    )
+    comments = {
+        max_line_groups: template.get_comment_markdown(
+            template.get_template('comment.md.j2'),
+            coverage,
+            diff_coverage,
+            decimal.Decimal('100'),
+            decimal.Decimal('70'),
+            'org/repo',
+            1,
+            'main',
+            template.MARKER,
+            max_line_groups=max_line_groups,
+            files=files,
+            count_files=count_files,
+            coverage_files=[],
+            count_coverage_files=0,
+            max_files=None,
+        )
+        for max_line_groups in (None, 3, 0, 10)
+    }
+
+    # 10 groups of missing lines per file, each linked to its range of the diff
+    assert [comment.count('-R') for comment in comments.values()] == [20, 6, 0, 20]
+    assert 'R6-R6' in comments[3] and 'R8-R8' not in comments[3]
+    assert '_The groups of missing lines are truncated' not in comments[None]
+    assert '_The groups of missing lines are truncated to 3 per file to fit in the comment._' in comments[3]
+    # Nothing is cut, the comment is the same as without a limit
+    assert comments[10] == comments[None]
+
+
 def test_get_comment_markdown(coverage_obj, diff_coverage_obj):
     chaned_files, total = template.select_changed_files(
         coverage=coverage_obj,
@@ -685,6 +749,229 @@ def test_sort_order_none(make_coverage):
     assert new_covered == 1
 
 
+@pytest.mark.parametrize(
+    'coverage_fixture, diff_coverage_fixture, branch_coverage',
+    [
+        ('coverage_obj', 'diff_coverage_obj', False),
+        ('coverage_obj', 'diff_coverage_obj_branch', True),
+        ('coverage_obj_more_files', 'diff_coverage_obj_more_files', False),
+        ('coverage_obj_more_files', 'diff_coverage_obj_more_files', True),
+    ],
+)
+@pytest.mark.parametrize('skip_covered_files_in_report', [True, False])
+def test_native_tables_identical(
+    request, coverage_fixture, diff_coverage_fixture, branch_coverage, skip_covered_files_in_report
+):
+    coverage = request.getfixturevalue(coverage_fixture)
+    diff_coverage = request.getfixturevalue(diff_coverage_fixture)
+    # Spread the files over several folders, listed out of order
+    moved = {path: pathlib.Path('z_folder', *path.parts[-2:]) for path in list(coverage.files)[1:]}
+    coverage = dataclasses.replace(
+        coverage,
+        files={
+            moved.get(path, path): dataclasses.replace(file, path=moved.get(path, path))
+            for path, file in coverage.files.items()
+        },
+    )
+    diff_coverage = dataclasses.replace(
+        diff_coverage,
+        files={
+            moved.get(path, path): dataclasses.replace(file, path=moved.get(path, path))
+            for path, file in diff_coverage.files.items()
+        },
+    )
+    files, count_files = template.select_changed_files(
+        coverage=coverage,
+        diff_coverage=diff_coverage,
+        max_files=None,
+        skip_covered_files_in_report=skip_covered_files_in_report,
+    )
+    coverage_files, count_coverage_files = template.select_files(
+        coverage=coverage, max_files=None, skip_covered_files_in_report=skip_covered_files_in_report
+    )
+    comments = [
+        template.get_comment_markdown(
+            template.get_template('comment.md.j2'),
+            coverage,
+            diff_coverage,
+            decimal.Decimal('100'),
+            decimal.Decimal('70'),
+            'org/repo',
+            1,
+            'main',
+            template.MARKER,
+            native_tables=native_tables,
+            branch_coverage=branch_coverage,
+            complete_project_report=True,
+            files=files,
+            count_files=count_files,
+            coverage_files=coverage_files,
+            count_coverage_files=count_coverage_files,
+            max_files=None,
+        )
+        for native_tables in (False, True)
+    ]
+
+    assert '| **Project Total** |' in comments[0]
+    assert comments[1] == comments[0]
+
+
+def test_native_tables_used(coverage_obj, diff_coverage_obj):
+    files, count_files = template.select_changed_files(
+        coverage=coverage_obj, diff_coverage=diff_coverage_obj, max_files=None, skip_covered_files_in_report=False
+    )
+    with patch.object(template.CoverageTable, 'render', return_value='native table') as render_mock:
+        for native_tables in (True, False):
+            comment = template.get_comment_markdown(
+                template.get_template('comment.md.j2'),
+                coverage_obj,
+                diff_coverage_obj,
+                decimal.Decimal('100'),
+                decimal.Decimal('70'),
+                'org/repo',
+                1,
+                'main',
+                template.MARKER,
+                native_tables=native_tables,
+                files=files,
+                count_files=count_files,
+                coverage_files=[],
+                count_coverage_files=0,
+                max_files=None,
+            )
+            assert ('native table' in comment) is native_tables
+
+    render_mock.assert_called_once()
+
+
+def test_reference_links(make_large_coverage):
+    coverage, diff_coverage = make_large_coverage(20, 6)
+    files, count_files = template.select_changed_files(
+        coverage=coverage, diff_coverage=diff_coverage, max_files=None, skip_covered_files_in_report=False
+    )
+    comments = [
+        template.get_comment_markdown(
+            template.get_template('comment.md.j2'),
+            coverage,
+            diff_coverage,
+            decimal.Decimal('100'),
+            decimal.Decimal('70'),
+            'org/repo',
+            1,
+            'main',
+            template.MARKER,
+            reference_links=reference_links,
+            files=files,
+            count_files=count_files,
+            coverage_files=[],
+            count_coverage_files=0,
+            max_files=None,
+        )
+        for reference_links in (False, True)
+    ]
+
+    assert '](https://' not in comments[1]
+    assert comments[1].endswith(template.MARKER)
+    assert len(comments[1]) < len(comments[0]) * 2 / 3
+    # Resolving the references gives back the inline links
+    body, _, definitions_block = comments[1].removesuffix(template.MARKER).partition('\n\n[0]: ')
+    definitions = dict(line.split(']: ', 1) for line in ('[0]: ' + definitions_block).strip().splitlines())
+    inlined = references.REFERENCE_RE.sub(lambda match: f']({definitions["[" + match["label"]]})', body)
+    assert inlined.rstrip('\n') == comments[0].removesuffix(template.MARKER).rstrip('\n')
+
+
+def test_links_memoized():
+    path = pathlib.Path('codebase/code.py')
+    all_lines = [None, (1, 2), (3, 3)]
+    expected = [
+        template.get_file_url(path, lines, repo_name='org/repo', pr_number=1, base_ref='main') for lines in all_lines
+    ]
+    with patch.object(template, 'get_diff_anchor', wraps=template.get_diff_anchor) as anchor_mock:
+        links = template.Links(repo_name='org/repo', pr_number=1, base_ref='main', maxsize=2)
+        assert [links.file_url(path, lines) for lines in all_lines] == expected
+    anchor_mock.assert_called_once_with(path)
+
+    assert links.badge_url('', '3', 'red') == links.badge_url('', '3', 'red')
+    assert links._badge_url.cache_info().hits == 1
+
+    # The memo is bounded
+    for name in ['a.py', 'b.py', 'c.py']:
+        links.file_url(pathlib.Path(name))
+    assert links._diff_anchor.cache_info().currsize == 2
+
+
+def test_get_environment_shared():
+    assert template.get_environment() is template.get_environment()
+    assert template.get_template('comment.md.j2') is template.get_template('comment.md.j2')
+
+
+def test_get_environment_sandboxed():
+    assert not template.get_environment().sandboxed
+    assert template.get_environment(sandboxed=True).sandboxed
+    assert template.get_environment(sandboxed=True) is template.get_environment(sandboxed=True)
+
+
+def test_custom_template_sandboxed(coverage_obj, diff_coverage_obj):
+    with pytest.raises(TemplateException):
+        template.get_comment_markdown(
+            '{{ coverage.__class__.__init__.__globals__ }}' + template.MARKER,
+            coverage_obj,
+            diff_coverage_obj,
+            decimal.Decimal('100'),
+            decimal.Decimal('70'),
+            'org/repo',
+            1,
+            'main',
+            template.MARKER,
+        )
+
+
+def test_environment_bytecode_cache(tmp_path):
+    bytecode_cache = jinja2.FileSystemBytecodeCache(str(tmp_path))
+    template.create_environment(bytecode_cache=bytecode_cache, precompiled=False).get_template('comment.md.j2')
+    assert list(tmp_path.iterdir())
+
+    # A new environment, as in a new process, loads the compiled templates instead of compiling them
+    env = template.create_environment(bytecode_cache=bytecode_cache, precompiled=False)
+    with patch.object(env, 'compile') as compile_mock:
+        env.get_template('comment.md.j2')
+    compile_mock.assert_not_called()
+
+
+def test_get_comment_markdown_template_reused(coverage_obj, diff_coverage_obj):
+    files, total = template.select_changed_files(
+        coverage=coverage_obj,
+        diff_coverage=diff_coverage_obj,
+        max_files=25,
+        skip_covered_files_in_report=False,
+    )
+    comments = [
+        template.get_comment_markdown(
+            template.get_template('comment.md.j2'),
+            coverage_obj,
+            diff_coverage_obj,
+            minimum_green,
+            decimal.Decimal('70'),
+            repo_name,
+            1,
+            'main',
+            template.MARKER,
+            files=files,
+            count_files=total,
+            coverage_files=[],
+            count_coverage_files=0,
+            max_files=25,
+        )
+        for repo_name, minimum_green in [('org/repo', decimal.Decimal('100')), ('org/other', decimal.Decimal('0'))]
+    ]
+
+    # Nothing of the first render leaks into the second one
+    assert 'org/repo' in comments[0] and 'org/other' not in comments[0]
+    assert 'org/other' in comments[1] and 'org/repo' not in comments[1]
+    # Coverage rate badges, their message is "(covered/statements)"
+    assert '%29-red.svg' in comments[0] and '%29-red.svg' not in comments[1]
+
+
 def test_read_template_file():
     result = template.read_template_file('comment.md.j2')
     assert result.startswith('{%- block title -%}## Coverage report')
@@ -732,6 +1019,15 @@ def test_get_file_url_pr_base_no_lines():
     )
 
 
+def test_get_file_url_no_pr():
+    filename = pathlib.Path('test_file')
+    lines = (1, 10)
+    assert (
+        template.get_file_url(filename, lines, repo_name='org/repo', pr_number=None, base_ref='feature')
+        == 'https://github.com/org/repo/blob/feature/test_file#L1-L10'
+    )
+
+
 def test_get_file_url_pr():
     filename = pathlib.Path('test_file.py')
     lines = (1, 10)
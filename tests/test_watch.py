@@ -0,0 +1,111 @@
+import copy
+import json
+import pathlib
+import subprocess
+
+import pytest
+
+from codecov import template
+from codecov.api import DEFAULTS, Reporter
+from codecov.config import Config
+from codecov.exceptions import CoreProcessingException
+from codecov.watch import Watcher
+
+
+def git(*args: str) -> None:
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args], check=True)  # noqa: S603, S607
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch, coverage_json) -> pathlib.Path:
+    """A git repository with two files, and their coverage report, not committed."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'codebase').mkdir()
+    for name in ('code.py', 'other.py'):
+        (tmp_path / 'codebase' / name).write_text(''.join(f'line {i}\n' for i in range(1, 16)))
+    git('init', '--quiet')
+    git('add', 'codebase')
+    git('commit', '--quiet', '--message', 'Initial commit')
+
+    coverage_json['files']['codebase/other.py'] = copy.deepcopy(coverage_json['files']['codebase/code.py'])
+    (tmp_path / 'coverage.json').write_text(json.dumps(coverage_json))
+    return tmp_path
+
+
+@pytest.fixture
+def watch_config(repository, test_config) -> Config:
+    return Config.from_environ(
+        environ={
+            'GITHUB_REPOSITORY': test_config.GITHUB_REPOSITORY,
+            'COVERAGE_PATH': str(repository / 'coverage.json'),
+            'BRANCH_COVERAGE': 'true',
+            'SKIP_COVERED_FILES_IN_REPORT': 'false',
+            **DEFAULTS,
+        }
+    )
+
+
+def edit(path: pathlib.Path, lines: list[int]) -> None:
+    path.write_text(''.join(f'line {i}{" changed" if i in lines else ""}\n' for i in range(1, 16)))
+
+
+def assert_same_report(watcher: Watcher) -> None:
+    """The report computed file by file is the one computed in one go."""
+    expected = Reporter().report(watcher.config, diff=watcher.diff or '').report
+    report = watcher.report
+    assert report is not None
+    assert report.diff_coverage == expected.diff_coverage
+    assert report.files == expected.files
+    assert report.coverage_files == expected.coverage_files
+    assert list(report.missing_diff_lines.items()) == list(expected.missing_diff_lines.items())
+    assert list(report.missing_lines_for_whole_project.items()) == list(
+        expected.missing_lines_for_whole_project.items()
+    )
+
+
+def test_watcher_update(repository, watch_config, coverage_json):
+    code, other = pathlib.Path('codebase/code.py'), pathlib.Path('codebase/other.py')
+    edit(repository / code, [5, 6])
+    watcher = Watcher(watch_config)
+
+    assert watcher.update() == {code, other}
+    assert_same_report(watcher)
+    assert list(watcher.report.diff_coverage.files) == [code]
+    assert list(watcher.report.missing_diff_lines) == [code]
+    assert watcher.update() is None
+
+    # Only the file whose added lines changed is computed again
+    edit(repository / other, [10, 11])
+    assert watcher.update() == {other}
+    assert_same_report(watcher)
+
+    # Only the file whose coverage changed is computed again
+    coverage_json['files']['codebase/other.py']['executed_lines'].append(10)
+    coverage_json['files']['codebase/other.py']['missing_lines'].remove(10)
+    (repository / 'coverage.json').write_text(json.dumps(coverage_json, indent=2))
+    assert watcher.update() == {other}
+    assert_same_report(watcher)
+
+    edit(repository / code, [])
+    assert watcher.update() == {code}
+    assert_same_report(watcher)
+    assert list(watcher.report.diff_coverage.files) == [other]
+
+
+def test_watcher_write(repository, watch_config, capsys, tmp_path):
+    edit(repository / 'codebase' / 'code.py', [5, 6])
+    watcher = Watcher(watch_config)
+    watcher.update()
+    watcher.write()
+    assert template.MARKER in capsys.readouterr().out
+
+    output = tmp_path / 'report.md'
+    watcher = Watcher(watch_config, output=output)
+    watcher.update()
+    watcher.write()
+    assert output.read_text().startswith('## Coverage report')
+
+
+def test_watcher_unknown_base(repository, watch_config):
+    with pytest.raises(CoreProcessingException):
+        Watcher(watch_config, base='unknown-revision').update()
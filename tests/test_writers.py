@@ -0,0 +1,105 @@
+import decimal
+import json
+
+import pytest
+
+from codecov import template, writers
+from codecov.report import build_report
+
+
+@pytest.fixture
+def markdown_writer():
+    return writers.MarkdownWriter(
+        template.get_template('comment.md.j2'),
+        repo_name='org/repo',
+        pr_number=1,
+        base_ref='main',
+        minimum_green=decimal.Decimal('100'),
+        minimum_orange=decimal.Decimal('70'),
+        complete_project_report=True,
+    )
+
+
+def test_markdown_writer(markdown_writer, coverage_obj, diff_coverage_obj):
+    report = build_report(coverage_obj, diff_coverage_obj, skip_covered_files_in_report=False)
+    files, count_files = template.select_changed_files(
+        coverage=coverage_obj, diff_coverage=diff_coverage_obj, max_files=25, skip_covered_files_in_report=False
+    )
+    coverage_files, count_coverage_files = template.select_files(
+        coverage=coverage_obj, max_files=25 - count_files, skip_covered_files_in_report=False
+    )
+
+    assert markdown_writer.render(report.truncate(max_files=25)) == template.get_comment_markdown(
+        template.get_template('comment.md.j2'),
+        coverage_obj,
+        diff_coverage_obj,
+        decimal.Decimal('100'),
+        decimal.Decimal('70'),
+        'org/repo',
+        1,
+        'main',
+        template.MARKER,
+        complete_project_report=True,
+        max_files=25,
+        files=files,
+        count_files=count_files,
+        coverage_files=coverage_files,
+        count_coverage_files=count_coverage_files,
+    )
+
+
+def test_step_summary_writer(tmp_path, markdown_writer, make_large_coverage):
+    coverage, diff_coverage = make_large_coverage(5, 4)
+    summary = tmp_path / 'summary.md'
+    summary.write_text('## Tests\n')
+
+    writer = writers.StepSummaryWriter(summary, markdown=markdown_writer, max_files=2)
+    writer.write(build_report(coverage, diff_coverage, skip_covered_files_in_report=False))
+
+    contents = summary.read_text()
+    assert contents.startswith('## Tests\n## Coverage report')
+    assert contents.endswith(template.MARKER + '\n')
+    assert '_The report is truncated to 2 files out of 5._' in contents
+
+
+def test_markdown_file_writer(tmp_path, markdown_writer, coverage_obj, diff_coverage_obj):
+    path = tmp_path / 'report.md'
+    report = build_report(coverage_obj, diff_coverage_obj, skip_covered_files_in_report=False)
+
+    writer = writers.MarkdownFileWriter(path, markdown=markdown_writer)
+    writer.write(report)
+    writer.write(report)
+
+    assert path.read_text() == markdown_writer.render(report) + '\n'
+
+
+def test_json_writer(tmp_path, coverage_obj, diff_coverage_obj):
+    path = tmp_path / 'coverage-report.json'
+
+    writers.JsonWriter(path).write(build_report(coverage_obj, diff_coverage_obj, skip_covered_files_in_report=False))
+
+    document = json.loads(path.read_text())
+    assert document['coverage'] == {
+        'percent_covered': '0.4',
+        'num_statements': 10,
+        'covered_lines': 4,
+        'missing_lines': 3,
+    }
+    assert document['diff_coverage'] == {
+        'percent_covered': '0.3333333333333333333333333333',
+        'num_lines': 3,
+        'num_violations': 2,
+    }
+    assert document['files'] == [
+        {
+            'path': 'codebase/code.py',
+            'num_statements': 10,
+            'missing_lines': 3,
+            'percent_covered': '0.4',
+            'diff_percent_covered': '0.3333333333333333333333333333',
+            'added_statements': 3,
+            'missing_line_groups': [[6, 8]],
+        }
+    ]
+    # The whole project table lists every group of missing lines, not only the added ones
+    assert [file['missing_line_groups'] for file in document['project_files']] == [[[6, 11]]]